@@ -0,0 +1,159 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from backend.src.utils.config import load_config
+from backend.src.utils.models import get_model, register
+from backend.src.nlp_evaluation.embeddings import get_embedder, embedder_id
+from backend.src.nlp_evaluation.vector_index import VectorIndex, item_key
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR) # backend
+CORPUS_DIR = os.path.join(PROJECT_ROOT, "data", "company")
+INDEX_DIR = os.path.join(PROJECT_ROOT, "data", "company_index")
+CHUNK_CHARS = 600
+TOP_K = 4
+MIN_SCORE = 0.3
+ANSWER_CACHE_ENTRIES = 512
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+_DECLINE = re.compile(r"^\W*(no|nope|nah|none|nothing|not really|not at the moment|that'?s (all|it)|i'?m good|i think that'?s it)\b", re.I)
+
+_options = None
+
+def knowledge_options() -> dict:
+    # read once per process; consulted on every interview turn
+    global _options
+    if _options is None:
+        opts = load_config().get("company_knowledge") or {}
+        paths = {}
+        for name, default in (("corpus_dir", CORPUS_DIR), ("index_dir", INDEX_DIR)):
+            path = opts.get(name) or default
+            paths[name] = path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+        _options = {
+            "enabled": bool(opts.get("enabled", True)),
+            **paths,
+            "chunk_chars": int(opts.get("chunk_chars", CHUNK_CHARS)),
+            "top_k": int(opts.get("top_k", TOP_K)),
+            "min_score": float(opts.get("min_score", MIN_SCORE)),
+            "answer_cache_entries": int(opts.get("answer_cache_entries", ANSWER_CACHE_ENTRIES)),
+        }
+    return _options
+
+def chunk_document(text: str, chunk_chars: int = CHUNK_CHARS) -> list:
+    # markdown/text -> [(heading path, passage)]: paragraphs packed up to chunk_chars without crossing a heading,
+    # so every passage can be quoted with the section it came from
+    chunks, headings, current = [], [], []
+
+    def flush():
+        if current:
+            chunks.append((" > ".join(h for _, h in headings), "\n\n".join(current)))
+            current.clear()
+
+    for block in re.split(r"\n\s*\n", text or ""):
+        block = block.strip()
+        if not block:
+            continue
+        m = _HEADING.match(block.splitlines()[0])
+        if m:
+            flush()
+            level = len(m.group(1))
+            headings[:] = [(l, h) for l, h in headings if l < level] + [(level, m.group(2).strip())]
+            block = "\n".join(block.splitlines()[1:]).strip()
+            if not block:
+                continue
+        for piece in _split_long(block, chunk_chars):
+            if current and sum(len(p) for p in current) + len(piece) > chunk_chars:
+                flush()
+            current.append(piece)
+    flush()
+    return chunks
+
+def _split_long(block: str, chunk_chars: int) -> list:
+    if len(block) <= chunk_chars:
+        return [block]
+    pieces, current = [], ""
+    for sentence in re.split(r"(?<=[.!?])\s+", block):
+        if current and len(current) + len(sentence) > chunk_chars:
+            pieces.append(current)
+            current = ""
+        current = f"{current} {sentence}".strip()
+    if current:
+        pieces.append(current)
+    return pieces
+
+def normalize_question(question: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", " ", (question or "").lower())).strip()
+
+def declines(reply: str) -> bool:
+    # "no, that's all" and the like: nothing to look up
+    return len(reply.split()) <= 8 and bool(_DECLINE.match(reply or ""))
+
+class CompanyKnowledge:
+    # company documents chunked into passages behind a memory-mapped embedding index; a candidate question is
+    # one matrix product against every passage, and the best few above min_score go into the llm prompt
+    def __init__(self, corpus_dir: str = CORPUS_DIR, index_dir: str = INDEX_DIR, chunk_chars: int = CHUNK_CHARS,
+                 answer_cache_entries: int = ANSWER_CACHE_ENTRIES):
+        self.corpus_dir = corpus_dir
+        self.chunk_chars = chunk_chars
+        self.index = VectorIndex(index_dir, "company")
+        self.answer_cache_entries = answer_cache_entries
+        self._answers = OrderedDict()  # (index fingerprint, normalized question) -> answer text
+        self._answers_lock = threading.Lock()
+
+    def _documents(self):
+        if not os.path.isdir(self.corpus_dir):
+            return
+        for root, _, files in os.walk(self.corpus_dir):
+            for name in sorted(files):
+                if name.endswith((".md", ".txt")):
+                    path = os.path.join(root, name)
+                    with open(path, encoding="utf-8", errors="replace") as f:
+                        yield os.path.relpath(path, self.corpus_dir), f.read()
+
+    def sync(self) -> int:
+        # chunks every document and embeds only passages the index hasn't seen
+        entries = []
+        for source, text in self._documents():
+            for heading, passage in chunk_document(text, self.chunk_chars):
+                payload = {"source": source, "heading": heading, "text": passage}
+                entries.append((item_key(source, heading, passage), f"{heading}\n{passage}" if heading else passage, payload))
+        return self.index.sync(entries, self._embed, embedder_id())
+
+    @staticmethod
+    def _embed(texts):
+        return get_embedder().encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+
+    def retrieve(self, question: str, k: int = TOP_K, min_score: float = MIN_SCORE) -> list:
+        # -> [(score, {"source", "heading", "text"})], best first
+        if not len(self.index) or not (question or "").strip():
+            return []
+        return self.index.search(self._embed([question]), k=k, min_score=min_score)
+
+    def cached_answer(self, question: str):
+        key = (self.index.fingerprint(), normalize_question(question))
+        with self._answers_lock:
+            answer = self._answers.get(key)
+            if answer is not None:
+                self._answers.move_to_end(key)
+        return answer
+
+    def remember_answer(self, question: str, answer: str):
+        key = (self.index.fingerprint(), normalize_question(question))
+        with self._answers_lock:
+            self._answers[key] = answer
+            self._answers.move_to_end(key)
+            while len(self._answers) > self.answer_cache_entries:
+                self._answers.popitem(last=False)
+
+def _load_company_knowledge():
+    opts = knowledge_options()
+    kb = CompanyKnowledge(opts["corpus_dir"], opts["index_dir"], opts["chunk_chars"], opts["answer_cache_entries"])
+    added = kb.sync()
+    if added:
+        print(f"Company knowledge: embedded {added} new passages ({len(kb.index)} total)")
+    return kb
+
+def get_company_knowledge() -> CompanyKnowledge:
+    return get_model("company_knowledge")
+
+register("company_knowledge", _load_company_knowledge)
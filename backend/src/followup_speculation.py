@@ -0,0 +1,173 @@
+import asyncio
+import threading
+from backend.src.utils.config import load_config
+from backend.src.utils.executors import run_blocking
+from backend.src.utils.metrics import counter
+from backend.src.nlp_evaluation.answer_evaluator import compile_skill_matcher, count_skills
+from backend.src.voice_processing.tts_cache import get_tts_cache, synthesize_cached
+from backend.src.voice_processing.tts_stream import sentences, speech_keys
+from backend.src.voice_processing.audio_encoding import delete_encoded
+from backend.src.voice_processing.audio_artifacts import ARTIFACT_FIELD
+from backend.src.session.session_store import get_session_store
+
+MAX_IN_FLIGHT = 4
+MAX_WORDS = 25
+MIN_SKILL_HITS = 1
+
+# started: llm call begun before the rating; committed: it was needed (hit); cancelled: it wasn't (wasted call);
+# missed: a follow-up was needed but nothing was speculated; skipped: borderline, but the worker was at its cap
+_outcomes = counter("followup_speculation_total", "Speculative follow-up generations by outcome", ("outcome",))
+
+_in_flight = 0
+_adoptions = set() # committed speculations still waiting to hand their renders to the room
+_in_flight_lock = threading.Lock()
+_options = None
+
+def speculation_options() -> dict:
+    global _options
+    if _options is None:
+        opts = load_config().get("followup_speculation") or {}
+        _options = {
+            "enabled": bool(opts.get("enabled", True)),
+            "max_in_flight": int(opts.get("max_in_flight", MAX_IN_FLIGHT)),
+            "max_words": int(opts.get("max_words", MAX_WORDS)),
+            "min_skill_hits": int(opts.get("min_skill_hits", MIN_SKILL_HITS)),
+            "prerender": bool(opts.get("prerender", False)),
+        }
+    return _options
+
+def looks_borderline(response: str, skills: str, max_words: int = MAX_WORDS, min_skill_hits: int = MIN_SKILL_HITS) -> bool:
+    # cheap guess at "likely POOR/SATISFACTORY" from the text alone: short, or naming few of the jd skills
+    if len(response.split()) < max_words:
+        return True
+    matcher = compile_skill_matcher(skills)
+    return matcher is not None and count_skills(matcher, response) < min_skill_hits
+
+def record_miss():
+    _outcomes.inc(("missed",))
+
+class FollowupSpeculation:
+    # runs a follow-up llm stream ahead of the rating and keeps its sentences; commit() replays them (and
+    # whatever is still arriving) for room_speech_stream, cancel() stops the call. with prerender, each
+    # sentence is synthesized into the tts cache as it completes and removed again on cancel
+    def __init__(self, deltas, prerender: bool = False, accent: str = None):
+        self.sentences = []
+        self.error = None
+        self.prerender = prerender
+        self.accent = accent
+        self._rendered = []  # tts cache keys this speculation created
+        self._renders = []
+        self._changed = asyncio.Event()
+        self._resolved = False
+        self._task = asyncio.create_task(self._run(deltas))
+
+    async def _run(self, deltas):
+        try:
+            async for sentence in sentences(deltas):
+                self.sentences.append(sentence)
+                self._changed.set()
+                if self.prerender:
+                    self._renders.append(asyncio.create_task(self._render(sentence)))
+        except Exception as e:
+            self.error = e
+        finally:
+            self._changed.set()
+
+    async def _render(self, sentence: str):
+        try:
+            key = await run_blocking("tts", _prerender, sentence, self.accent)
+            if key is not None:
+                self._rendered.append(key)
+        except Exception as e:
+            print(f"Speculative tts failed: {e}")
+
+    def _release(self, outcome: str):
+        global _in_flight
+        if self._resolved:
+            return
+        self._resolved = True
+        with _in_flight_lock:
+            _in_flight -= 1
+        _outcomes.inc((outcome,))
+
+    async def _replay(self):
+        i = 0
+        while True:
+            if i < len(self.sentences):
+                # re-split by room_speech_stream, so keep the sentence boundary
+                yield self.sentences[i] + " "
+                i += 1
+                continue
+            if self._task.done():
+                if self.error is not None and not self.sentences:
+                    raise self.error
+                return
+            self._changed.clear()
+            await self._changed.wait()
+
+    def commit(self, room_id: str):
+        # the rating asked for a follow-up: hand over the stream, its tts renders now belong to the room
+        # (room_speech_stream finds them cached and leaves them alone, so they are recorded here)
+        self._release("committed")
+        if self.prerender:
+            task = asyncio.create_task(self._adopt(room_id))
+            _adoptions.add(task)
+            task.add_done_callback(_adoptions.discard)
+        return self._replay()
+
+    async def _adopt(self, room_id: str):
+        await asyncio.gather(self._task, return_exceptions=True)
+        await asyncio.gather(*self._renders, return_exceptions=True)
+        if self._rendered:
+            fields = {ARTIFACT_FIELD + k: 1 for k in self._rendered}
+            try:
+                await run_blocking("io", get_session_store().update, room_id, fields)
+            except Exception as e:
+                print(f"Recording speculative tts for {room_id} failed: {e}")
+
+    async def cancel(self):
+        # the answer was good enough: stop the llm call and drop anything rendered for it
+        self._release("cancelled")
+        self._task.cancel()
+        for task in self._renders:
+            task.cancel()
+        await asyncio.gather(self._task, *self._renders, return_exceptions=True)
+        if self._rendered:
+            await run_blocking("io", _drop_rendered, list(self._rendered))
+
+def _prerender(sentence: str, accent: str = None):
+    # key of a clip this call added to the cache; None if it was already there (and may be shared)
+    key = speech_keys([sentence], accent)[0]
+    existed = key in get_tts_cache()
+    synthesize_cached(sentence, accent)
+    return None if existed else key
+
+def _drop_rendered(keys):
+    cache = get_tts_cache()
+    for key in keys:
+        cache.delete(key)
+        delete_encoded(key)
+
+def speculate(response: str, skills: str, deltas_factory, accent: str = None):
+    # a FollowupSpeculation when the answer looks borderline and this worker has room for one, else None.
+    # deltas_factory() starts the llm stream, so nothing is sent unless speculation goes ahead
+    global _in_flight
+    opts = speculation_options()
+    if not opts["enabled"] or not looks_borderline(response, skills, opts["max_words"], opts["min_skill_hits"]):
+        return None
+    with _in_flight_lock:
+        if _in_flight >= opts["max_in_flight"]:
+            full = True
+        else:
+            full = False
+            _in_flight += 1
+    if full:
+        _outcomes.inc(("skipped",))
+        return None
+    _outcomes.inc(("started",))
+    try:
+        return FollowupSpeculation(deltas_factory(), prerender=opts["prerender"], accent=accent)
+    except Exception:
+        with _in_flight_lock:
+            _in_flight -= 1
+        raise
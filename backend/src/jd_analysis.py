@@ -1,6 +1,19 @@
+import asyncio
+import copy
 import json
 import re
-from backend.src.voice_processing.record_transcription import ask_groq
+from backend.src.llm_client import get_llm_client
+from backend.src.jd_cache import get_jd_cache, jd_cache_key
+from backend.src.utils.executors import run_blocking
+from backend.src.question_bank import get_question_bank, bank_options, DIFFICULTIES
+
+PRIMARY_MODEL = "llama-3.3-70b-versatile"
+FALLBACK_MODEL = "mixtral-8x7b-32768"
+PROMPT_VERSION = "jd-v2" # bump when the prompt or output shape changes; old cache entries stop matching
+QUESTION_COUNT = 6
+
+# cache key -> future of the llm call currently running for it
+_inflight = {}
 
 def _parse_json_blob(text: str) -> dict:
     if not text:
@@ -19,7 +32,52 @@ def _parse_json_blob(text: str) -> dict:
         raise
 
 
-def analyze_job_description(jd_text: str) -> dict:
+def _question_rules(gaps, chosen: list) -> str:
+    if gaps is None:
+        # no bank: the original prompt, the model picks the mix
+        return (f"Rules: Generate exactly {QUESTION_COUNT} questions tailored to this JD. ideal_answer should be "
+                f"concrete and evaluable. question_id 1..{QUESTION_COUNT} in order.")
+    needed = sum(gaps.values())
+    if not needed:
+        return 'Rules: The questions are already chosen; return "questions": [].'
+    mix = ", ".join(f"{n} {d}" for d, n in gaps.items())
+    rules = (f"Rules: Generate exactly {needed} questions tailored to this JD ({mix}). "
+             f"ideal_answer should be concrete and evaluable. question_id 1..{needed} in order.")
+    if chosen:
+        rules += " These questions are already asked, do not repeat them or their topics:\n" + "\n".join(
+            f"- {q['question']} ({q['topic']})" for q in chosen
+        )
+    return rules
+
+async def bank_questions(jd_text: str):
+    # vetted questions from the bank that fit this jd, and what's left for the llm: ([question], {difficulty: n}).
+    # ([], None) when the bank is off or unavailable: the llm writes every question, as it did before the bank
+    opts = bank_options()
+    if not opts["enabled"]:
+        return [], None
+    try:
+        bank = await run_blocking("embed", get_question_bank)
+        return await run_blocking(
+            "embed", bank.select, jd_text, QUESTION_COUNT, opts["min_score"], opts["max_per_topic"], opts["difficulty_mix"]
+        )
+    except Exception as e:
+        print(f"Question bank unavailable, generating all questions: {e}")
+        return [], None
+
+async def bank_fingerprint() -> str:
+    # part of the jd cache key: cached analyses stop matching when the bank (or its settings) change
+    opts = bank_options()
+    if not opts["enabled"]:
+        return "nobank"
+    try:
+        bank = await run_blocking("embed", get_question_bank)
+    except Exception:
+        return "nobank"
+    settings = f"{opts['min_score']}/{opts['max_per_topic']}/{sorted(opts['difficulty_mix'].items())}"
+    return f"{bank.fingerprint()}/{settings}"
+
+async def analyze_job_description(jd_text: str) -> dict:
+    chosen, gaps = await bank_questions(jd_text)
     prompt = """You are an expert recruiter. Read the job description and output ONLY valid JSON (no markdown, no commentary) with this exact shape:
 {
   "role": "short job title",
@@ -36,16 +94,22 @@ def analyze_job_description(jd_text: str) -> dict:
     }
   ]
 }
-Rules: Generate exactly 6 questions tailored to this JD. ideal_answer should be concrete and evaluable. question_id 1..6 in order.
+""" + _question_rules(gaps, chosen) + """
 
 Job description:
 """ + jd_text[:12000]
 
-    raw = ask_groq(prompt, max_completion_tokens=4096, model="llama-3.3-70b-versatile")
+    # the profile is always written by the llm; questions only for the gaps the bank left, so the output
+    # (and the call) is much shorter when the bank covers the jd
+    max_tokens = 4096 if gaps is None else 1024 + 512 * sum(gaps.values())
+    # slow or failing primary calls are hedged to the fallback model inside the client;
+    # a second call is only paid for when the model actually returned unparseable json
+    llm = get_llm_client()
+    raw = await llm.complete(prompt, max_completion_tokens=max_tokens, model=PRIMARY_MODEL, fallback_model=FALLBACK_MODEL)
     try:
         data = _parse_json_blob(raw)
     except Exception:
-        raw = ask_groq(prompt, max_completion_tokens=4096, model="mixtral-8x7b-32768")
+        raw = await llm.complete(prompt, max_completion_tokens=max_tokens, model=FALLBACK_MODEL, fallback_model=PRIMARY_MODEL)
         data = _parse_json_blob(raw)
     role = str(data.get("role", "Role")).strip()
     skills = str(data.get("skills", "")).strip()
@@ -61,6 +125,16 @@ Job description:
             "topic": str(q.get("topic", "")).strip(),
             "difficulty": str(q.get("difficulty", "Medium")).strip(),
         })
+    if gaps is not None:
+        # bank picks plus llm gap fillers, easy to hard, then renumbered
+        out_questions = [dict(q, source="bank") for q in chosen] + [
+            dict(q, source="llm") for q in out_questions[:sum(gaps.values())]
+        ]
+        rank = {d: i for i, d in enumerate(DIFFICULTIES)}
+        out_questions.sort(key=lambda q: rank.get(q["difficulty"].capitalize(), 1))
+        out_questions = [
+            {"question_id": i + 1, **{k: v for k, v in q.items() if k != "question_id"}} for i, q in enumerate(out_questions)
+        ]
     if not out_questions:
         raise ValueError("no questions generated")
     jd_profile = {
@@ -70,3 +144,38 @@ Job description:
         "jd_summary": jd_summary,
     }
     return {"jd_profile": jd_profile, "questions": out_questions}
+
+async def analyze_job_description_cached(jd_text: str, refresh: bool = False) -> dict:
+    # persistent cache + single-flight: identical postings submitted together share one llm call
+    version = f"{PROMPT_VERSION}+{await bank_fingerprint()}"
+    key = jd_cache_key(jd_text, version)
+    cache = get_jd_cache()
+    if not refresh:
+        hit = await run_blocking("io", cache.get, key)
+        if hit is not None:
+            return hit
+    while key in _inflight:
+        fut = _inflight[key]
+        try:
+            return copy.deepcopy(await asyncio.shield(fut))
+        except asyncio.CancelledError:
+            if not fut.cancelled():
+                raise  # this request was cancelled, not the leader
+            # the leader's request went away (client disconnect): take over instead of failing with it
+    fut = asyncio.get_running_loop().create_future()
+    _inflight[key] = fut
+    try:
+        result = await analyze_job_description(jd_text)
+        await run_blocking("io", cache.put, key, version, result)
+        fut.set_result(result)
+        return copy.deepcopy(result)
+    except asyncio.CancelledError:
+        fut.cancel()  # waiters retry, one of them becomes the leader
+        raise
+    except Exception as e:
+        fut.set_exception(e)
+        fut.exception()  # waiters re-raise it; don't log it as unretrieved
+        raise
+    finally:
+        if _inflight.get(key) is fut:
+            _inflight.pop(key, None)
@@ -0,0 +1,55 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from contextlib import closing
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(os.path.dirname(BASE_DIR), "data", "jd_cache.sqlite3") # backend/data/jd_cache.sqlite3
+
+def normalize_jd(text: str) -> str:
+    # same posting pasted twice should hash the same: unicode form and whitespace don't matter
+    text = unicodedata.normalize("NFKC", text or "")
+    return re.sub(r"\s+", " ", text).strip()
+
+def jd_cache_key(jd_text: str, prompt_version: str) -> str:
+    return hashlib.sha256(f"{prompt_version}\n{normalize_jd(jd_text)}".encode("utf-8")).hexdigest()
+
+class JDCache:
+    # jd analysis results on disk so repeated postings skip the llm, across restarts
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jd_analysis ("
+                "key TEXT PRIMARY KEY, prompt_version TEXT NOT NULL, result TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def get(self, key: str):
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT result FROM jd_analysis WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, prompt_version: str, result: dict):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO jd_analysis (key, prompt_version, result, created_at) VALUES (?, ?, ?, ?)",
+                (key, prompt_version, json.dumps(result, separators=(",", ":")), time.time()),
+            )
+
+_cache = None
+
+def get_jd_cache() -> JDCache:
+    global _cache
+    if _cache is None:
+        _cache = JDCache()
+    return _cache
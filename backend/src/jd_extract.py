@@ -1,12 +1,35 @@
+import asyncio
+import hashlib
 import io
 import os
+import shutil
+import signal
 import subprocess
 import sys
 import tempfile
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
+from backend.src.utils.config import load_config
+from backend.src.utils.executors import run_blocking
+from backend.src.utils.metrics import span
 
-def extract_text_from_bytes(filename: str, content: bytes) -> str:
+MAX_UPLOAD_BYTES = 10 << 20
+PDF_PAGES_PER_TASK = 20
+DOC_TIMEOUT_SECONDS = 30
+MEMO_ENTRIES = 128
+
+def upload_options() -> dict:
+    opts = load_config().get("jd_upload") or {}
+    return {
+        "max_bytes": int(float(opts.get("max_mb", MAX_UPLOAD_BYTES >> 20)) * (1 << 20)),
+        "pages_per_task": int(opts.get("pdf_pages_per_task", PDF_PAGES_PER_TASK)),
+        "doc_timeout": float(opts.get("doc_timeout_seconds", DOC_TIMEOUT_SECONDS)),
+    }
+
+
+def extract_text_from_bytes(filename: str, content: bytes, doc_timeout: float = DOC_TIMEOUT_SECONDS) -> str:
     if not content:
         return ""
     ext = Path(filename or "").suffix.lower()
@@ -14,13 +37,7 @@ def extract_text_from_bytes(filename: str, content: bytes) -> str:
         return content.decode("utf-8", errors="replace")
 
     if ext == ".pdf":
-        from pypdf import PdfReader
-
-        reader = PdfReader(io.BytesIO(content))
-        parts = []
-        for page in reader.pages:
-            parts.append(page.extract_text() or "")
-        return "\n".join(parts).strip()
+        return extract_pdf_pages(content, 0, None)
 
     if ext == ".docx":
         from docx import Document
@@ -29,29 +46,136 @@ def extract_text_from_bytes(filename: str, content: bytes) -> str:
         return "\n".join(p.text for p in doc.paragraphs if p.text).strip()
 
     if ext == ".doc":
-        if sys.platform == "darwin":
-            path = None
-            try:
-                fd, path = tempfile.mkstemp(suffix=".doc")
-                os.write(fd, content)
-                os.close(fd)
-                out = subprocess.run(
-                    ["textutil", "-convert", "txt", "-stdout", path],
-                    capture_output=True,
-                    text=True,
-                    timeout=120,
-                )
-                if out.returncode != 0:
-                    raise ValueError(out.stderr or "Could not read .doc file")
-                return (out.stdout or "").strip()
-            finally:
-                if path and os.path.isfile(path):
-                    try:
-                        os.unlink(path)
-                    except OSError:
-                        pass
-        raise ValueError(
-            "Legacy .doc is only supported on macOS here. Upload DOCX or PDF instead."
-        )
+        return convert_doc(content, doc_timeout)
 
     raise ValueError(f"Unsupported file type: {ext or 'unknown'}")
+
+
+def pdf_page_count(content: bytes) -> int:
+    from pypdf import PdfReader
+
+    return len(PdfReader(io.BytesIO(content)).pages)
+
+
+def extract_pdf_pages(content: bytes, start: int, stop) -> str:
+    # pages [start, stop); each range is parsed by its own worker process for long pdfs
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(content))
+    parts = []
+    for page in reader.pages[start:stop]:
+        parts.append(page.extract_text() or "")
+    return "\n".join(parts).strip()
+
+
+# legacy .doc converters, tried in order; {path} is the input file, {dir} the private work dir
+DOC_CONVERTERS = (
+    ("antiword", ["antiword", "-w", "0", "{path}"], None),
+    ("soffice", ["soffice", "--headless", "--norestore", "--nolockcheck", "--convert-to", "txt:Text", "--outdir", "{dir}", "{path}"], "input.txt"),
+    ("libreoffice", ["libreoffice", "--headless", "--norestore", "--nolockcheck", "--convert-to", "txt:Text", "--outdir", "{dir}", "{path}"], "input.txt"),
+)
+
+
+def _sandbox_limits(cpu_seconds: int):
+    # runs in the child before exec: cpu, memory, output size and open files are capped
+    def apply():
+        import resource
+
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+        resource.setrlimit(resource.RLIMIT_AS, (2 << 30, 2 << 30))
+        resource.setrlimit(resource.RLIMIT_FSIZE, (64 << 20, 64 << 20))
+        resource.setrlimit(resource.RLIMIT_NOFILE, (256, 256))
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    return apply
+
+
+def _run_sandboxed(cmd, workdir: str, timeout: float):
+    # no inherited env or stdin, home and cwd inside the throwaway dir, own process group so a timeout kills everything
+    env = {"PATH": os.environ.get("PATH", "/usr/bin:/bin"), "HOME": workdir, "TMPDIR": workdir, "LANG": "C.UTF-8"}
+    proc = subprocess.Popen(
+        cmd, cwd=workdir, env=env, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        preexec_fn=_sandbox_limits(max(1, int(timeout))), start_new_session=True,
+    )
+    try:
+        out, err = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.communicate()
+        raise ValueError("Timed out reading .doc file")
+    return proc.returncode, out, err
+
+
+def convert_doc(content: bytes, timeout: float = DOC_TIMEOUT_SECONDS) -> str:
+    with tempfile.TemporaryDirectory(prefix="jd-doc-") as workdir:
+        path = os.path.join(workdir, "input.doc")
+        with open(path, "wb") as f:
+            f.write(content)
+        if sys.platform == "darwin":
+            out = subprocess.run(
+                ["textutil", "-convert", "txt", "-stdout", path],
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )
+            if out.returncode != 0:
+                raise ValueError(out.stderr or "Could not read .doc file")
+            return (out.stdout or "").strip()
+
+        tried = False
+        for name, template, output in DOC_CONVERTERS:
+            if shutil.which(name) is None:
+                continue
+            tried = True
+            cmd = [part.format(path=path, dir=workdir) for part in template]
+            code, out, err = _run_sandboxed(cmd, workdir, timeout)
+            if code != 0:
+                print(f"{name} failed on .doc: {err.decode(errors='replace')[-300:]}")
+                continue
+            if output is None:
+                return out.decode("utf-8", errors="replace").strip()
+            result = os.path.join(workdir, output)
+            if os.path.isfile(result):
+                with open(result, encoding="utf-8", errors="replace") as f:
+                    return f.read().strip()
+        if tried:
+            raise ValueError("Could not read .doc file")
+    raise ValueError(
+        "Legacy .doc needs antiword or LibreOffice on this server. Upload DOCX or PDF instead."
+    )
+
+
+# sha256 of the upload -> extracted text, so re-uploading the same file skips parsing
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+async def extract_text(filename: str, content: bytes, digest: str = None) -> str:
+    # parsing runs on the "extract" process pool; long pdfs are split into page ranges parsed in parallel
+    ext = Path(filename or "").suffix.lower()
+    key = f"{digest or hashlib.sha256(content).hexdigest()}{ext}"
+    with _memo_lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            return _memo[key]
+    # timed here rather than in extract_text_from_bytes: spans recorded in worker processes would be lost
+    with span("extract_text_from_bytes", ext=ext, bytes=len(content)):
+        text = await _extract(filename, ext, content)
+    with _memo_lock:
+        _memo[key] = text
+        while len(_memo) > MEMO_ENTRIES:
+            _memo.popitem(last=False)
+    return text
+
+
+async def _extract(filename: str, ext: str, content: bytes) -> str:
+    opts = upload_options()
+    if ext == ".pdf":
+        pages = await run_blocking("extract", pdf_page_count, content)
+        step = max(1, opts["pages_per_task"])
+        if pages > step:
+            parts = await asyncio.gather(*(
+                run_blocking("extract", extract_pdf_pages, content, start, start + step) for start in range(0, pages, step)
+            ))
+            return "\n".join(parts).strip()
+        return await run_blocking("extract", extract_pdf_pages, content, 0, None)
+    return await run_blocking("extract", extract_text_from_bytes, filename, content, opts["doc_timeout"])
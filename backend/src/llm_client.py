@@ -0,0 +1,187 @@
+import asyncio
+import os
+import random
+import time
+import httpx
+from groq import AsyncGroq, APIConnectionError, APITimeoutError, RateLimitError, InternalServerError
+from dotenv import load_dotenv
+from backend.src.utils.config import load_config
+from backend.src.utils.metrics import observe, timed
+load_dotenv()
+
+DEFAULT_MODEL = "openai/gpt-oss-120b"
+RETRYABLE = (APIConnectionError, APITimeoutError, RateLimitError, InternalServerError, asyncio.TimeoutError)
+
+class LLMError(Exception):
+    pass
+
+class LLMClient:
+    # one pooled keep-alive connection set per process, shared by every room
+    def __init__(self, api_key: str, base_url: str = None, timeout: float = 20.0, max_retries: int = 2,
+                 backoff_base: float = 0.25, backoff_max: float = 4.0, hedge_after: float = None,
+                 fallback_model: str = None, max_connections: int = 20):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_after = hedge_after
+        self.fallback_model = fallback_model
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=timeout,
+        )
+        # retries are handled here so they respect the per-call deadline
+        self._client = AsyncGroq(api_key=api_key, base_url=base_url, max_retries=0, timeout=timeout, http_client=self._http)
+
+    async def aclose(self):
+        await self._http.aclose()
+
+    async def _attempt(self, model, messages, max_completion_tokens, temperature, deadline):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise asyncio.TimeoutError()
+        completion = await asyncio.wait_for(
+            self._client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_completion_tokens=max_completion_tokens,
+                top_p=1,
+                stream=False,
+            ),
+            timeout=remaining,
+        )
+        return completion.choices[0].message.content or ""
+
+    async def _with_retries(self, model, messages, max_completion_tokens, temperature, deadline):
+        attempt = 0
+        while True:
+            try:
+                return await self._attempt(model, messages, max_completion_tokens, temperature, deadline)
+            except RETRYABLE as e:
+                attempt += 1
+                # full jitter: sleep somewhere in [0, base * 2^attempt], capped, and never past the deadline
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+                if attempt > self.max_retries or time.monotonic() + delay >= deadline:
+                    raise LLMError(f"{model}: {type(e).__name__}: {str(e)[:200]}") from e
+                await asyncio.sleep(delay)
+            except Exception as e:
+                raise LLMError(f"{model}: {type(e).__name__}: {str(e)[:200]}") from e
+
+    @timed("ask_groq")
+    async def complete(self, prompt: str, model: str = DEFAULT_MODEL, max_completion_tokens: int = 200,
+                       temperature: float = 0.6, timeout: float = None, fallback_model: str = None,
+                       hedge_after: float = None) -> str:
+        # raises LLMError instead of returning an apology string
+        messages = [{"role": "user", "content": prompt}]
+        deadline = time.monotonic() + (timeout or self.timeout)
+        fallback_model = fallback_model or self.fallback_model
+        hedge_after = self.hedge_after if hedge_after is None else hedge_after
+        args = (messages, max_completion_tokens, temperature, deadline)
+        primary = asyncio.create_task(self._with_retries(model, *args))
+        tasks = [primary]
+        try:
+            if not fallback_model or fallback_model == model:
+                return await primary
+            # hedge: if the primary is slow, race the fallback model against it; if it fails, use the fallback
+            done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+            if done and not primary.exception():
+                return primary.result()
+            hedge = asyncio.create_task(self._with_retries(fallback_model, *args))
+            tasks.append(hedge)
+            pending = {hedge} if done else {primary, hedge}
+            errors = [primary.exception()] if done else []
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    errors.append(task.exception())
+            raise LLMError("; ".join(str(e) for e in errors))
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _open_stream(self, model, messages, max_completion_tokens, temperature, deadline):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise asyncio.TimeoutError()
+        return await asyncio.wait_for(
+            self._client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_completion_tokens=max_completion_tokens,
+                top_p=1,
+                stream=True,
+            ),
+            timeout=remaining,
+        )
+
+    async def stream(self, prompt: str, model: str = DEFAULT_MODEL, max_completion_tokens: int = 200,
+                     temperature: float = 0.6, timeout: float = None):
+        # async generator of content deltas. retries only until the response starts: once text has been
+        # handed out (and possibly spoken) it can't be taken back, so a mid-stream failure raises LLMError.
+        # no hedging either, two streams would have to be merged
+        messages = [{"role": "user", "content": prompt}]
+        started = time.perf_counter()
+        deadline = time.monotonic() + (timeout or self.timeout)
+        attempt = 0
+        while True:
+            try:
+                response = await self._open_stream(model, messages, max_completion_tokens, temperature, deadline)
+                break
+            except RETRYABLE as e:
+                attempt += 1
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+                if attempt > self.max_retries or time.monotonic() + delay >= deadline:
+                    observe("ask_groq", time.perf_counter() - started, streamed=True, failed=True)
+                    raise LLMError(f"{model}: {type(e).__name__}: {str(e)[:200]}") from e
+                await asyncio.sleep(delay)
+            except Exception as e:
+                observe("ask_groq", time.perf_counter() - started, streamed=True, failed=True)
+                raise LLMError(f"{model}: {type(e).__name__}: {str(e)[:200]}") from e
+        first = True
+        chunks = response.__aiter__()
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=remaining)
+                except StopAsyncIteration:
+                    break
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                if first:
+                    first = False
+                    observe("ask_groq_first_token", time.perf_counter() - started)
+                yield delta
+        except Exception as e:
+            raise LLMError(f"{model}: stream interrupted: {type(e).__name__}: {str(e)[:200]}") from e
+        finally:
+            observe("ask_groq", time.perf_counter() - started, streamed=True)
+            await response.close()
+
+_client = None
+
+def get_llm_client() -> LLMClient:
+    global _client
+    if _client is None:
+        api_key = os.getenv("GROQ_API_KEY")
+        if not api_key:
+            raise ValueError("GROQ_API_KEY environment variable not set")
+        opts = load_config().get("llm") or {}
+        _client = LLMClient(
+            api_key=api_key,
+            base_url=os.getenv("GROQ_BASE_URL") or opts.get("base_url"),
+            timeout=float(opts.get("timeout_seconds", 20)),
+            max_retries=int(opts.get("max_retries", 2)),
+            hedge_after=opts.get("hedge_after_seconds"),
+            fallback_model=opts.get("fallback_model"),
+            max_connections=int(opts.get("max_connections", 20)),
+        )
+    return _client
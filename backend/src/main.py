@@ -1,24 +1,57 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Request
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Optional
 import uuid
+import asyncio
 import os
 import base64
+import hashlib
 import json
 from datetime import datetime
 from backend.src.utils.config import load_config
-from backend.src.session.session_manager import personalize_intro
-from backend.src.jd_analysis import analyze_job_description
-from backend.src.jd_extract import extract_text_from_bytes
-from backend.src.voice_processing.record_transcription import transcribe_audio, generate_speech, ask_groq
-from backend.src.nlp_evaluation.answer_evaluator import evaluate_answer
+from backend.src.utils.executors import run_blocking, get_pool, shutdown_pools
+from backend.src.utils.models import warm_up, status as model_status
+from backend.src.session.session_manager import personalize_intro_segments, intro_segments, stream_candidate_answer
+from backend.src.company_knowledge import knowledge_options, declines
+from backend.src.session.session_store import get_session_store
+from backend.src.jd_analysis import analyze_job_description_cached
+from backend.src.jd_extract import extract_text, upload_options
+from backend.src.utils.upload_limit import UploadLimit
+from backend.src.utils.metrics import TraceMiddleware, render_prometheus, span, tag, trace, timed, tracing_options
+from backend.src.report_store import get_report_store
+from backend.src.followup_speculation import speculate, record_miss
+from backend.src.voice_processing.record_transcription import transcribe_audio_async, decode_audio_bytes, get_transcription_service
+from backend.src.llm_client import get_llm_client
+from backend.src.voice_processing.live_transcription import LiveTranscriber
+from backend.src.voice_processing.tts_cache import get_tts_cache, TTS_PREFIX
+from backend.src.voice_processing.tts_stream import stream_speech, iter_stream
+from backend.src.voice_processing.prefetch import prefetch_audio, ready_audio
+from backend.src.voice_processing.audio_artifacts import room_speech, room_speech_stream, collect_room_audio, audio_response, etag_for, not_modified
+from backend.src.voice_processing.audio_encoding import negotiate, get_ogg, ogg_enabled, MEDIA_TYPES
+from backend.src.nlp_evaluation.scoring_profile import build_profile, drop_profile, evaluate_room_answer
+from backend.src.nlp_evaluation.answer_evaluator import RATING_SCORES, final_decision
 
 app = FastAPI()
 
+config = load_config()
+JD_UPLOAD = upload_options()
+OGG_ENABLED = ogg_enabled()
+
+AUDIO_UPLOAD_MAX_BYTES = int(float((config.get("audio_upload") or {}).get("max_mb", 4)) * (1 << 20))
+
+# jd files are capped while they stream in, before multipart parsing spools them
+app.add_middleware(UploadLimit, max_bytes=JD_UPLOAD["max_bytes"], paths=("/agent/analyze-jd-file",))
+# so are raw answer recordings, before request.body() buffers them for ffmpeg
+app.add_middleware(UploadLimit, max_bytes=AUDIO_UPLOAD_MAX_BYTES, paths=("/agent/process-audio/",))
+
+# per-request span log (config "tracing"); not installed at all when disabled
+if tracing_options()["enabled"]:
+    app.add_middleware(TraceMiddleware)
+
 # allow requests from Node.js server
 app.add_middleware(
     CORSMiddleware,
@@ -28,22 +61,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-config = load_config()
-
-# store interview sessions: # key: session_id, value: session->dict(cnm, ivnm, ques[dict{'question_id', 'question', 'ideal_answer', 'topic', 'difficulty'}], curr_idx, aw_idx, response[], report)
-sessions: Dict[str, Dict[str, Any]] = {}
-
-# store active room sessions
-room_sessions: Dict[str, Dict[str, Any]] = {}
+# room sessions live in the session store (memory or sqlite, see config "session_store"):
+# room_id -> {jd_profile, questions, pending, candidate_name, current_question_idx, responses[], state, audio.<name>}
+PENDING_TTL_SECONDS = float((config.get("session_store") or {}).get("pending_ttl_seconds", 3600))
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__)) 
 PROJECT_ROOT = os.path.dirname(BASE_DIR) # backend
 DATA_DIR = os.path.join(PROJECT_ROOT, "data") # backend/data
-REPORT_DIR = os.path.join(DATA_DIR, "reports") # backend/data/reports
 MAIN_PROJECT_ROOT = os.path.dirname(PROJECT_ROOT) # prj
 
+FOLLOWUP_LEAD_IN = "Can you elaborate?"
+DEFAULT_FOLLOWUP = "Could you walk me through a concrete example from your experience?"
+FOLLOWUP_TIMEOUT_SECONDS = 8
+DEFAULT_CANDIDATE_ANSWER = "That's a great question. I'll pass it on to the recruiter, who will get back to you."
+CANDIDATE_ANSWER_TIMEOUT_SECONDS = 10
+
 os.makedirs(DATA_DIR, exist_ok=True)
-os.makedirs(REPORT_DIR, exist_ok=True)
+
+def releaseRoom(room_id, session):
+    # expired/evicted rooms no longer need their scoring profile or their own audio
+    drop_profile(room_id)
+    collect_room_audio(room_id, session)
+
+@app.on_event("startup")
+def watch_sessions():
+    get_session_store().on_expire(releaseRoom)
+
+@app.on_event("startup")
+async def import_reports():
+    # legacy backend/data/reports/*.json go into the report store once; known rooms are skipped
+    imported = await run_blocking("io", get_report_store().import_dir)
+    if imported:
+        print(f"Imported {imported} reports into the report store")
+
+@app.on_event("startup")
+async def warm_up_models():
+    # optional: load configured models in the background so the first turn is fast without delaying readiness
+    names = config.get("warm_up_models") or []
+    if config.get("warm_up_blocking"):
+        await run_blocking("io", warm_up, names)
+    elif names:
+        get_pool("io").submit(warm_up, names)
+
+@app.on_event("shutdown")
+def stop_pools():
+    shutdown_pools()
 
 class ProcessAudioRequest(BaseModel):
     roomId: str
@@ -58,6 +120,7 @@ class NextQuestionRequest(BaseModel):
 
 class AnalyzeJDRequest(BaseModel):
     jobDescription: str
+    refresh: bool = False  # skip the jd cache and regenerate questions
 
 FRONTEND_DIR = os.path.join(MAIN_PROJECT_ROOT, "frontend")
 app.mount("/public", StaticFiles(directory=os.path.join(FRONTEND_DIR, "public")), name="public")
@@ -72,85 +135,106 @@ def home(request: Request):
 async def analyze_jd(req: AnalyzeJDRequest):
     if not req.jobDescription or not req.jobDescription.strip():
         raise HTTPException(status_code=400, detail="Job description is empty")
-    room_id = str(uuid.uuid4())
-    try:
-        result = analyze_job_description(req.jobDescription.strip())
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    room_sessions[room_id] = {
-        "jd_profile": result["jd_profile"],
-        "questions": result["questions"],
-        "pending": True,
-    }
-    return {
-        "roomId": room_id,
-        "jd_profile": result["jd_profile"],
-        "questions": result["questions"],
-    }
+    return await createRoom(req.jobDescription.strip(), req.refresh)
 
 @app.post("/agent/analyze-jd-file")
-async def analyze_jd_file(file: UploadFile = File(...)):
-    raw = await file.read()
+async def analyze_jd_file(file: UploadFile = File(...), refresh: bool = False):
+    # read in chunks, hashing as we go; the hash keys the extracted-text memo
+    digest = hashlib.sha256()
+    chunks, size = [], 0
+    while chunk := await file.read(1 << 16):
+        size += len(chunk)
+        if size > JD_UPLOAD["max_bytes"]:
+            raise HTTPException(status_code=413, detail=f"Upload larger than {JD_UPLOAD['max_bytes'] >> 20} MB")
+        digest.update(chunk)
+        chunks.append(chunk)
+    raw = b"".join(chunks)
     if not raw:
         raise HTTPException(status_code=400, detail="Empty file")
     name = file.filename or "upload"
     try:
-        text = extract_text_from_bytes(name, raw)
+        text = await extract_text(name, raw, digest.hexdigest())
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Could not read file: {e}")
     if not text or not str(text).strip():
         raise HTTPException(status_code=400, detail="Could not extract text from file")
+    return await createRoom(str(text).strip(), refresh)
+
+async def createRoom(jd_text, refresh=False):
+    # shared by both analyze endpoints once they have the posting's text
     room_id = str(uuid.uuid4())
     try:
-        result = analyze_job_description(str(text).strip())
+        result = await analyze_job_description_cached(jd_text, refresh=refresh)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    room_sessions[room_id] = {
+    await run_blocking("io", get_session_store().create, room_id, {
         "jd_profile": result["jd_profile"],
         "questions": result["questions"],
         "pending": True,
-    }
+    }, PENDING_TTL_SECONDS)
+    prefetchRoomAudio(room_id, result)
+    # ideal-answer embeddings and the skill matcher are compiled once per room
+    await run_blocking("embed", build_profile, room_id, result["questions"], result["jd_profile"])
     return {
         "roomId": room_id,
         "jd_profile": result["jd_profile"],
         "questions": result["questions"],
     }
 
+def prefetchRoomAudio(room_id, analysis):
+    # render intro template and every question in the background right after jd analysis
+    role = analysis["jd_profile"].get("role") or "this"
+    items = [("intro", [seg for seg in intro_segments(role) if "{candidate_name}" not in seg])]
+    items += [(f"question_{i}", [q["question"]]) for i, q in enumerate(analysis["questions"])]
+    items += [("conclusion", [config["conclusion_prompt"]]), ("followup_lead_in", [FOLLOWUP_LEAD_IN])]
+    if candidateQuestionsEnabled():
+        items.append(("candidate_questions", [config["candidate_questions_prompt"]]))
+    prefetch_audio(room_id, items)
+
+async def loadSession(room_id):
+    # a fresh copy of the room; None if it never existed or has expired
+    return await run_blocking("io", get_session_store().get, room_id)
+
+async def saveSession(room_id, fields):
+    # writes back only the fields a handler changed and slides the room's ttl
+    store = get_session_store()
+    return await run_blocking("io", store.update, room_id, fields, store.ttl_seconds)
+
 @app.post("/agent/start-interview")
 async def start_interview(req: StartInterviewRequest):
-    if req.roomId not in room_sessions:
+    prev = await loadSession(req.roomId)
+    if prev is None:
         raise HTTPException(status_code=404, detail="Session not found. Analyze a job description first.")
-    prev = room_sessions[req.roomId]
     if not prev.get("pending"):
         raise HTTPException(status_code=400, detail="Interview already started for this session.")
 
     jd_profile = prev["jd_profile"]
-    questions = prev["questions"]
 
-    room_sessions[req.roomId] = {
+    # jd_profile, questions and the prefetched audio.* fields are kept as they are
+    await saveSession(req.roomId, {
         "candidate_name": req.candidateName,
         "room_id": req.roomId,
-        "jd_profile": jd_profile,
-        "questions": questions,
         "current_question_idx": 0,
         "responses": [],
-        "state": "intro",  # intro, question, answer, done
+        "state": "intro",  # intro, question, followup, candidate_questions, done
         "pending": False,
-    }
+    })
     
     # generate intro speech
     try:
         role = jd_profile.get("role") or "this"
-        intro_text = personalize_intro(req.candidateName, role=role)
-        intro_audio_path = generate_speech(intro_text, os.path.join(DATA_DIR, f"{req.roomId}_intro.wav"))
-        if not intro_audio_path:
+        # only the greeting with the candidate's name is new; the rest was prefetched and is shared by every room
+        intro_audio_url, stream_id = await run_blocking("tts", room_speech, req.roomId, *personalize_intro_segments(req.candidateName, role=role),
+                                                        shared=intro_segments(role))
+        if not intro_audio_url:
             raise HTTPException(status_code=500, detail="Failed to generate intro audio")
         else:
             return {
                 "status": "started",
-                "audioUrl": f"/agent/get-audio/{req.roomId}_intro.wav",
+                "audioUrl": intro_audio_url,
+                "streamId": stream_id,
                 "nextState": "question"
             }
     except Exception as e:
@@ -158,75 +242,208 @@ async def start_interview(req: StartInterviewRequest):
 
 @app.post("/agent/process-audio")
 async def process_audio(req: ProcessAudioRequest):
+    # legacy json/base64 upload; decoded in memory like the binary variant
+    return await handleCandidateAudio(req.roomId, base64.b64decode(req.audioData))
+
+@app.post("/agent/process-audio/{room_id}")
+async def process_audio_binary(room_id: str, request: Request):
+    # raw audio body (e.g. audio/webm;codecs=opus straight from MediaRecorder)
+    return await handleCandidateAudio(room_id, await request.body())
+
+async def handleCandidateAudio(room_id, audio_data):
     # receive audio chunk from bot, transcribe, process, return TTS
-    room_id = req.roomId
-    
-    if room_id not in room_sessions:
+    session = await loadSession(room_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Room session not found")
+    tag(room=room_id, turn=session.get("current_question_idx"))
     
-    session = room_sessions[room_id]
+    if not audio_data:
+        return await noSpeech(room_id, session)
     
-    audio_data = base64.b64decode(req.audioData)
-    temp_audio_path = os.path.join(DATA_DIR, f"{room_id}_temp_audio.webm")
-    
-    with open(temp_audio_path, 'wb') as f:
-        f.write(audio_data)
+    try:
+        samples = await run_blocking("stt", decode_audio_bytes, audio_data)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # transcribe audio
-    candidate_text = transcribe_audio(temp_audio_path)
+    candidate_text = await transcribe_audio_async(samples)
     
     if not candidate_text or len(candidate_text.strip()) == 0:
-        return {
-            "status": "no_speech",
-            "audioUrl": None
-        }
+        return await noSpeech(room_id, session)
     
+    return await handleTranscript(room_id, session, candidate_text)
+
+async def noSpeech(room_id, session):
+    # silence is a retry everywhere except "any questions for us?", where it means no and the interview concludes
+    if session.get("state") == "candidate_questions":
+        return await handleTranscript(room_id, session, "")
+    return {
+        "status": "no_speech",
+        "audioUrl": None
+    }
+
+async def handleTranscript(room_id, session, candidate_text):
     # process based on interview state
     state = session["state"]
-    
+    tag(room=room_id, turn=session.get("current_question_idx"), state=state)
+    with span("turn", state=state):
+        return await dispatchTurn(room_id, session, candidate_text, state)
+
+async def dispatchTurn(room_id, session, candidate_text, state):
     if state == "intro":
         # after intro, ask first question
-        return askNextQuestion(room_id, session)
+        return await askNextQuestion(room_id, session)
     
     elif state == "question":
         # process answer
-        return processAnswer(room_id, session, candidate_text)
+        return await processAnswer(room_id, session, candidate_text)
     
     elif state == "followup":
         # process followup response
-        return processFollowupAnswer(room_id, session, candidate_text)
+        return await processFollowupAnswer(room_id, session, candidate_text)
+    
+    elif state == "candidate_questions":
+        # answer the candidate's question (if any), then conclude
+        return await answerCandidateQuestion(room_id, session, candidate_text)
     
     elif state == "done":
         return {"status": "done", "audioUrl": None}
     
     return {"status": "processed", "audioUrl": None}
 
+@app.websocket("/agent/live-audio/{room_id}")
+async def live_audio(websocket: WebSocket, room_id: str):
+    # binary messages: 16 kHz mono int16 pcm as it is captured; text message {"type": "end"} forces the endpoint
+    # replies: {"type": "partial"|"final", "text"}, {"type": "turn", ...same body as process-audio} and
+    # {"type": "error", "detail"} when a turn fails
+    await websocket.accept()
+    if await loadSession(room_id) is None:
+        await websocket.close(code=4404, reason="Room session not found")
+        return
+    vad = config.get("live_vad") or {}
+    live = LiveTranscriber(
+        endpoint_ms=int(vad.get("endpoint_ms", 600)),
+        partial_interval_ms=int(vad.get("partial_interval_ms", 700)),
+        energy_threshold=float(vad.get("energy_threshold", 0.01)),
+    )
+    stt = get_transcription_service()
+    partial_task = None
+
+    async def run_partial():
+        window, covered = live.begin_partial()
+        try:
+            text = await asyncio.wrap_future(stt.submit(window))
+        except Exception as e:
+            print(f"Partial transcription failed: {e}")
+            return
+        live.finish_partial(covered, text)
+        if text:
+            await websocket.send_json({"type": "partial", "text": text})
+
+    try:
+        while True:
+            msg = await websocket.receive()
+            if msg["type"] == "websocket.disconnect":
+                break
+            events = []
+            if msg.get("bytes"):
+                events = live.feed(msg["bytes"])
+            elif msg.get("text"):
+                try:
+                    control = json.loads(msg["text"])
+                except ValueError:
+                    control = {}
+                if control.get("type") == "end" and not live.ended:
+                    live.end()
+                    events = ["endpoint"]
+            if "partial" in events and (partial_task is None or partial_task.done()):
+                partial_task = asyncio.create_task(run_partial())
+            if "endpoint" not in events:
+                continue
+            # final transcript: reuse the last partial when it already covered all speech
+            if partial_task is not None and not partial_task.done():
+                await partial_task
+            try:
+                if live.partial_covers_speech():
+                    text = live.last_partial_text
+                else:
+                    text = await asyncio.wrap_future(stt.submit(live.audio())) if live.samples else ""
+                await websocket.send_json({"type": "final", "text": text})
+                with trace("live-turn", room=room_id):
+                    session = await loadSession(room_id)
+                    if session is None:
+                        result = {"status": "expired", "audioUrl": None}
+                    elif text.strip():
+                        result = await handleTranscript(room_id, session, text)
+                    else:
+                        result = await noSpeech(room_id, session)
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                # one failed turn (stt, llm, tts) is reported and the socket stays open for the retry
+                print(f"Live turn for {room_id} failed: {e}")
+                await websocket.send_json({"type": "error", "detail": getattr(e, "detail", None) or str(e)})
+            else:
+                await websocket.send_json({"type": "turn", **result})
+            live.reset()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if partial_task is not None:
+            partial_task.cancel()
+
 @app.post('/agent/next-question')
 async def next_question(req: NextQuestionRequest):
     roomId = req.roomId
-    if roomId not in room_sessions:
+    session = await loadSession(roomId)
+    if session is None:
         raise HTTPException(status_code=404, detail="Room session not found")
-    session = room_sessions[roomId]
     session["state"] = "question"
-    return askNextQuestion(roomId, session)
+    await saveSession(roomId, {"state": "question"})
+    return await askNextQuestion(roomId, session)
+
+async def speechFor(session, name, text):
+    # prefetched audio is returned as a plain url, anything else is streamed while it renders
+    url = ready_audio(session, name)
+    if url:
+        return url, None
+    return await run_blocking("tts", stream_speech, text)
 
-def askNextQuestion(room_id, session):
+async def askNextQuestion(room_id, session):
     # ask next question
     idx = session["current_question_idx"]
     questions = session["questions"]
     
+    if idx >= len(questions) and candidateQuestionsEnabled():
+        # scoring is over: write the report now, then give the candidate a turn to ask about the company
+        await run_blocking("io", generateFinalReport, room_id, session)
+        drop_profile(room_id)
+        audio_url, stream_id = await speechFor(session, "candidate_questions", config["candidate_questions_prompt"])
+        session["state"] = "candidate_questions"
+        await saveSession(room_id, {"state": "candidate_questions"})
+        return {
+            "status": "candidate_questions",
+            "audioUrl": audio_url,
+            "streamId": stream_id
+        }
+
     if idx >= len(questions):
         # interview done -> generate conclusion and final report
-        conclusion = config["conclusion_prompt"]
-        audio_path = generate_speech(conclusion, os.path.join(DATA_DIR, f"{room_id}_conclusion.wav"))
+        # same text for every room -> served from the tts cache after the first render
+        audio_url, stream_id = await speechFor(session, "conclusion", config["conclusion_prompt"])
         session["state"] = "done"
+        await saveSession(room_id, {"state": "done"})
         
         # generate final report
-        generateFinalReport(room_id, session)
+        await run_blocking("io", generateFinalReport, room_id, session)
+        drop_profile(room_id)
+        # personalized greeting and follow-up clips; the shared conclusion clip stays cached
+        await run_blocking("io", collect_room_audio, room_id)
         
         return {
             "status": "conclusion",
-            "audioUrl": f"/agent/get-audio/{room_id}_conclusion.wav",
+            "audioUrl": audio_url,
+            "streamId": stream_id,
             "reportReady": True
         }
     
@@ -234,21 +451,42 @@ def askNextQuestion(room_id, session):
     question_text = question["question"]
     
     # generate question speech
-    audio_path = generate_speech(question_text, os.path.join(DATA_DIR, f"{room_id}_question_{idx}.wav"))
-    session["state"] = "question"
+    audio_url, stream_id = await speechFor(session, f"question_{idx}", question_text)
+    if session["state"] != "question":
+        session["state"] = "question"
+        await saveSession(room_id, {"state": "question"})
     
     return {
         "status": "question",
-        "audioUrl": f"/agent/get-audio/{room_id}_question_{idx}.wav",
+        "audioUrl": audio_url,
+        "streamId": stream_id,
         "questionId": idx
     }
 
-def processAnswer(room_id, session, candidate_text):
+def followupDeltas(session, candidate_text):
+    jp = session.get("jd_profile") or {}
+    role = jp.get("role", "")
+    skills = jp.get("skills", "")
+    return get_llm_client().stream(
+        f"Role: {role}. Skills: {skills}. Candidate answer: {candidate_text}. "
+        "Ask one short follow-up question only, under 25 words. Plain text, no quotes.",
+        timeout=FOLLOWUP_TIMEOUT_SECONDS,
+    )
+
+async def processAnswer(room_id, session, candidate_text):
     # evaluate answer
     idx = session["current_question_idx"]
     question = session["questions"][idx]
     
-    rating = evaluate_answer(candidate_text, question["ideal_answer"], jd_profile=session.get("jd_profile"))
+    # the follow-up prompt doesn't need the rating: for borderline answers start it while scoring runs
+    speculation = speculate(candidate_text, (session.get("jd_profile") or {}).get("skills", ""),
+                            lambda: followupDeltas(session, candidate_text))
+    try:
+        rating = await run_blocking("embed", evaluate_room_answer, room_id, session, idx, candidate_text)
+    except BaseException:
+        if speculation is not None:
+            await speculation.cancel()
+        raise
     
     # save response
     session["responses"].append({
@@ -256,79 +494,136 @@ def processAnswer(room_id, session, candidate_text):
         "question": question["question"],
         "answer": candidate_text,
         "rating": rating,
-        "ideal_answer": question.get("ideal_answer", "")
+        "ideal_answer": question.get("ideal_answer", ""),
+        "topic": question.get("topic", ""),
+        "difficulty": question.get("difficulty", "")
     })
     
     # check if followup needed
     if rating in ["POOR", "SATISFACTORY"]:
-        # generate followup
-        jp = session.get("jd_profile") or {}
-        role = jp.get("role", "")
-        skills = jp.get("skills", "")
-        fu = ask_groq(
-            f"Role: {role}. Skills: {skills}. Candidate answer: {candidate_text}. "
-            "Ask one short follow-up question only, under 25 words. Plain text, no quotes."
+        # generate followup: tokens are streamed and spoken sentence by sentence behind the fixed lead-in,
+        # so "Can you elaborate?" plays while the model is still writing the question
+        if speculation is not None:
+            deltas = speculation.commit(room_id)
+        else:
+            record_miss()
+            deltas = followupDeltas(session, candidate_text)
+
+        async def rememberFollowup(fu):
+            # kept in its own field until the followup answer arrives, the turn itself has already been saved
+            await saveSession(room_id, {"followup_text": f"{FOLLOWUP_LEAD_IN} {fu}"})
+
+        audio_url, stream_id = await room_speech_stream(
+            room_id, deltas, FOLLOWUP_LEAD_IN, fallback=DEFAULT_FOLLOWUP, on_text=rememberFollowup,
         )
-        followup_text = f"Can you elaborate? {fu}"
-        followup_path = os.path.join(DATA_DIR, f"{room_id}_followup_{idx}.wav")
-        audio_path = generate_speech(followup_text, followup_path)
-        
-        # update last response with followup question
-        if session["responses"]:
-            session["responses"][-1]["followup_text"] = followup_text
         
         # set state to followup -> wait for followup response
         session["state"] = "followup"
+        await saveSession(room_id, {"responses": session["responses"], "state": "followup"})
         return {
             "status": "followup",
-            "audioUrl": f"/agent/get-audio/{room_id}_followup_{idx}.wav",
+            "audioUrl": audio_url,
+            "streamId": stream_id,
             "rating": rating
         }
     else:
+        if speculation is not None:
+            await speculation.cancel()
         # move to next question
         session["current_question_idx"] += 1
         session["state"] = "question"
-        return askNextQuestion(room_id, session)
+        await saveSession(room_id, {"responses": session["responses"], "current_question_idx": session["current_question_idx"], "state": "question"})
+        return await askNextQuestion(room_id, session)
 
-def processFollowupAnswer(room_id, session, candidate_text):
+async def processFollowupAnswer(room_id, session, candidate_text):
     # evaluate followup answer
     idx = session["current_question_idx"]
     question = session["questions"][idx]
     
-    # update last response with followup answer
+    # update last response with followup question and answer
     if session["responses"]:
+        session["responses"][-1]["followup_text"] = session.get("followup_text") or FOLLOWUP_LEAD_IN
         session["responses"][-1]["followup_answer"] = candidate_text
     
     # re-evaluate with followup answer
-    rating = evaluate_answer(candidate_text, question["ideal_answer"], jd_profile=session.get("jd_profile"))
+    rating = await run_blocking("embed", evaluate_room_answer, room_id, session, idx, candidate_text)
     
     # update rating if improved
     if session["responses"]:
         old_rating = session["responses"][-1]["rating"]
-        score_map = {"POOR": 1, "SATISFACTORY": 2, "GOOD": 3, "EXCELLENT": 4}
-        if score_map.get(rating, 2) > score_map.get(old_rating, 1):
+        if RATING_SCORES.get(rating, 2) > RATING_SCORES.get(old_rating, 1):
             session["responses"][-1]["rating"] = rating
     
     # move to next question
     session["current_question_idx"] += 1
     session["state"] = "question"
-    return askNextQuestion(room_id, session)
+    await saveSession(room_id, {"responses": session["responses"], "current_question_idx": session["current_question_idx"],
+                                "state": "question", "followup_text": None})
+    return await askNextQuestion(room_id, session)
+
+def candidateQuestionsEnabled():
+    return knowledge_options()["enabled"] and bool(config.get("candidate_questions_prompt"))
+
+async def answerCandidateQuestion(room_id, session, candidate_text):
+    # the report was written before this turn; the answer is streamed from retrieved handbook passages and the
+    # conclusion is spoken right after it in the same clip
+    session["state"] = "done"
+    await saveSession(room_id, {"state": "done"})
+    if not candidate_text.strip() or declines(candidate_text):
+        audio_url, stream_id = await speechFor(session, "conclusion", config["conclusion_prompt"])
+        await run_blocking("io", collect_room_audio, room_id)
+        return {"status": "conclusion", "audioUrl": audio_url, "streamId": stream_id, "reportReady": True}
+
+    async def concluded(answer):
+        # clips of the answer still rendering when this runs are collected when the session expires
+        await run_blocking("io", collect_room_audio, room_id)
+
+    audio_url, stream_id = await room_speech_stream(
+        room_id, stream_candidate_answer(candidate_text, timeout=CANDIDATE_ANSWER_TIMEOUT_SECONDS),
+        fallback=DEFAULT_CANDIDATE_ANSWER, tail=[config["conclusion_prompt"]], on_text=concluded,
+        own_reply=False,  # answers go into the answer cache and are replayed to other rooms
+    )
+    return {"status": "conclusion", "audioUrl": audio_url, "streamId": stream_id, "reportReady": True}
+
+@app.get("/agent/stream-audio/{stream_id}")
+async def stream_audio(stream_id: str):
+    frames = iter_stream(stream_id)
+    if frames is None:
+        raise HTTPException(status_code=404, detail="Audio stream not found")
+    return StreamingResponse(frames, media_type="audio/wav")
 
 @app.get("/agent/get-audio/{filename}")
-async def get_audio(filename: str):
-    file_path = os.path.join(DATA_DIR, filename)
-    if os.path.exists(file_path):
-        return FileResponse(file_path, media_type="audio/wav")
-    raise HTTPException(status_code=404, detail="Audio file not found")
+async def get_audio(filename: str, request: Request, format: Optional[str] = None):
+    # all agent audio lives in the tts cache; etag is the content key, so revalidation never reads the clip.
+    # opus/ogg when the client asks for it (Accept or ?format=ogg), encoded once per clip; wav otherwise
+    if not (filename.startswith(TTS_PREFIX) and filename.endswith(".wav")):
+        raise HTTPException(status_code=404, detail="Audio file not found")
+    key = filename[len(TTS_PREFIX):-4]
+    fmt = negotiate(request.headers.get("accept"), format, OGG_ENABLED)
+    etag = etag_for(key, fmt)
+    if not_modified(request.headers, etag) and key in get_tts_cache():
+        return audio_response(request.headers, b"", etag, MEDIA_TYPES[fmt])
+    data = None
+    if fmt == "ogg":
+        try:
+            data = await run_blocking("tts", get_ogg, key)
+        except Exception as e:
+            print(f"Opus encode failed for {key}, serving wav: {e}")
+            fmt = "wav"
+            etag = etag_for(key)
+    if fmt == "wav":
+        data = await run_blocking("io", get_tts_cache().get, key)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Audio file not found")
+    return audio_response(request.headers, data, etag, MEDIA_TYPES[fmt])
 
+@timed("generateFinalReport")
 def generateFinalReport(room_id, session):
     if not session["responses"]:
         return
     
     ratings = [r["rating"] for r in session["responses"]]
-    score_map = {"POOR": 1, "SATISFACTORY": 2, "GOOD": 3, "EXCELLENT": 4}
-    avg_score = sum(score_map.get(r, 2) for r in ratings) / len(ratings)
-    decision = "HIRE" if avg_score > 2.5 else "REJECT"
+    avg_score, decision = final_decision(ratings)
     
     report = {
         "room_id": room_id,
@@ -342,35 +637,52 @@ def generateFinalReport(room_id, session):
         "jd_profile": session.get("jd_profile") or {},
     }
     
-    os.makedirs(REPORT_DIR, exist_ok=True)
-    report_file = os.path.join(REPORT_DIR, f"{room_id}_report.json")
-    import json
-    with open(report_file, 'w') as f:
-        json.dump(report, f, indent=2)
+    get_report_store().put(report)
     
     return report
 
 @app.get("/agent/get-report/{roomId}")
 async def get_report(roomId: str):
-    report_path = os.path.join(REPORT_DIR, f"{roomId}_report.json")
-
-    if os.path.exists(report_path):
-        with open(report_path, "r") as f:
-            return json.load(f)
+    # stored as compact json, returned without parsing
+    stored = await run_blocking("io", get_report_store().get_json, roomId)
+    if stored is not None:
+        return Response(stored, media_type="application/json")
 
-    if roomId in room_sessions:
-        session = room_sessions[roomId]
+    session = await loadSession(roomId)
+    if session is not None:
         if session.get("responses"):
-            return generateFinalReport(roomId, session)
+            return await run_blocking("io", generateFinalReport, roomId, session)
         else:
             return {"status": "in_progress", "message": "Interview is still in progress."}
 
     raise HTTPException(status_code=404, detail="Report not found")
 
+@app.get("/agent/reports")
+async def list_reports(role: Optional[str] = None, decision: Optional[str] = None, date_from: Optional[str] = None,
+                       date_to: Optional[str] = None, limit: int = 20, offset: int = 0):
+    # newest first; dates as YYYY-MM-DD
+    return await run_blocking("io", get_report_store().list, role, decision, date_from, date_to, limit, offset)
+
+@app.get("/agent/reports/stats")
+async def report_stats(role: Optional[str] = None, decision: Optional[str] = None, date_from: Optional[str] = None,
+                       date_to: Optional[str] = None):
+    # decision counts and rating distributions per question topic and difficulty
+    return await run_blocking("io", get_report_store().stats, role, decision, date_from, date_to)
+
 @app.get("/report/{room_id}", response_class=HTMLResponse)
 def report_page(request: Request, room_id: str):
     return templates.TemplateResponse("report.html", {"request": request, "room_id": room_id})
 
+@app.get("/agent/stt-stats")
+def stt_stats():
+    # queue depth and batch sizes of the shared whisper worker
+    return get_transcription_service().stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # prometheus text format: per-stage latency histograms (transcribe_audio, evaluate_answer, ask_groq, ...)
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @app.get("/check")
 def root():
-    return {"message": "Voice agent API running", "status": "ready"}
\ No newline at end of file
+    return {"message": "Voice agent API running", "status": "ready", "models": model_status()}
\ No newline at end of file
@@ -1,21 +1,74 @@
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
-model = SentenceTransformer("all-MiniLM-L6-v2")
+import re
+import numpy as np
+from backend.src.nlp_evaluation.embeddings import get_embedder
+from backend.src.utils.metrics import timed
 
+RATING_SCORES = {"POOR": 1, "SATISFACTORY": 2, "GOOD": 3, "EXCELLENT": 4}
+
+def get_sentence_model():
+    # torch or onnx per config "embedding.backend"; shared with the company-info matcher, loaded on first use
+    return get_embedder()
+
+def compile_skill_matcher(skills: str):
+    # one alternation over all jd skills; lookarounds instead of \b so "c++" / ".net" still match whole tokens
+    terms = sorted({s.strip().lower() for s in (skills or "").split(",") if s.strip()}, key=len, reverse=True)
+    if not terms:
+        return None
+    return re.compile(r"(?<!\w)(?:" + "|".join(re.escape(t) for t in terms) + r")(?!\w)", re.IGNORECASE)
+
+def count_skills(matcher, response: str) -> int:
+    if matcher is None:
+        return 0
+    return len({m.group(0).lower() for m in matcher.finditer(response)})
+
+def skill_bonus(mentioned: int) -> float:
+    return min(mentioned * 0.02, 0.1)  # up to +0.1
+
+def rate(score: float) -> str:
+    if score > 0.8: return "EXCELLENT"
+    elif score > 0.6: return "GOOD"
+    elif score > 0.4: return "SATISFACTORY"
+    else: return "POOR"
+
+@timed("evaluate_answer")
 def evaluate_answer(response: str, ideal_answer: str, jd_profile=None):
     # Compare response vs ideal_answer 
-    embeddings = model.encode([response, ideal_answer])
-    score = float(cosine_similarity([embeddings[0]], [embeddings[1]])[0][0])
+    embeddings = get_sentence_model().encode([response, ideal_answer], normalize_embeddings=True, convert_to_numpy=True)
+    score = float(embeddings[0] @ embeddings[1])
 
     # bonus weight if response mentions relevant skills
     if jd_profile:
-        skills = (jd_profile.get("skills") or "").lower().split(",")
-        resp_lower = response.lower()
-        mentioned = sum(1 for s in skills if s.strip() and s.strip() in resp_lower)
-        relevance_bonus = min(mentioned * 0.02, 0.1)  # up to +0.1
-        score = min(score + relevance_bonus, 1.0)
+        mentioned = count_skills(compile_skill_matcher(jd_profile.get("skills")), response)
+        score = min(score + skill_bonus(mentioned), 1.0)
 
-    if score > 0.8: return "EXCELLENT"
-    elif score > 0.6: return "GOOD"
-    elif score > 0.4: return "SATISFACTORY"
-    else: return "POOR"
\ No newline at end of file
+    return rate(score)
+
+def score_answers_batch(responses, ideal_answers, jd_profiles=None, batch_size: int = 256, model=None) -> np.ndarray:
+    # encode everything in large batches; each ideal answer once, then one row-wise product of unit vectors
+    if not responses:
+        return np.zeros(0, dtype=np.float32)
+    unique_ideals = list(dict.fromkeys(ideal_answers))
+    lookup = {a: i for i, a in enumerate(unique_ideals)}
+    ideal_idx = np.array([lookup[a] for a in ideal_answers], dtype=np.int64)
+    model = model or get_sentence_model()
+    resp_emb = model.encode(list(responses), batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True)
+    ideal_emb = model.encode(unique_ideals, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True)
+    scores = np.einsum("ij,ij->i", resp_emb, ideal_emb[ideal_idx]).astype(np.float32)
+    if jd_profiles is not None:
+        matchers = {}
+        for i, (response, jd_profile) in enumerate(zip(responses, jd_profiles)):
+            skills = (jd_profile or {}).get("skills") or ""
+            if not skills:
+                continue
+            if skills not in matchers:
+                matchers[skills] = compile_skill_matcher(skills)
+            scores[i] = min(scores[i] + skill_bonus(count_skills(matchers[skills], response)), 1.0)
+    return scores
+
+def evaluate_answers_batch(responses, ideal_answers, jd_profiles=None, batch_size: int = 256, model=None) -> list:
+    return [rate(float(s)) for s in score_answers_batch(responses, ideal_answers, jd_profiles, batch_size, model)]
+
+def final_decision(ratings):
+    # (average score on the 1-4 scale, HIRE/REJECT)
+    avg_score = sum(RATING_SCORES.get(r, 2) for r in ratings) / len(ratings)
+    return avg_score, ("HIRE" if avg_score > 2.5 else "REJECT")
@@ -0,0 +1,99 @@
+import os
+import numpy as np
+from backend.src.utils.config import load_config
+from backend.src.utils.models import get_model, register
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(BASE_DIR)) # backend
+MODEL_NAME = "all-MiniLM-L6-v2"
+ONNX_DIR = os.path.join(PROJECT_ROOT, "data", "models", "minilm-onnx") # written by backend.tools.onnx_embeddings export
+MAX_SEQ_LENGTH = 256
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+class TorchEmbedder:
+    # sentence-transformers in fp32 (the original scoring path)
+    name = "torch"
+
+    def __init__(self, model=None):
+        self.model = model if model is not None else get_model("sentence")
+
+    def encode(self, sentences, batch_size: int = 64, normalize_embeddings: bool = False, convert_to_numpy: bool = True):
+        single = isinstance(sentences, str)
+        out = self.model.encode([sentences] if single else list(sentences), batch_size=batch_size,
+                                normalize_embeddings=normalize_embeddings, convert_to_numpy=True)
+        out = np.asarray(out, dtype=np.float32)
+        return out[0] if single else out
+
+class OnnxEmbedder:
+    # exported minilm on onnxruntime (int8 dynamic quantization by default), mean pooling like sentence-transformers
+    name = "onnx"
+
+    def __init__(self, model_dir: str = ONNX_DIR, quantized: bool = True, intra_op_threads: int = 0):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+        path = os.path.join(model_dir, "model.int8.onnx" if quantized else "model.onnx")
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        opts.intra_op_num_threads = intra_op_threads  # 0 = onnxruntime default (all cores)
+        opts.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(path, sess_options=opts, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        self.tokenizer.enable_padding()
+
+    def _run(self, texts):
+        enc = self.tokenizer.encode_batch(texts)
+        ids = np.array([e.ids for e in enc], dtype=np.int64)
+        mask = np.array([e.attention_mask for e in enc], dtype=np.int64)
+        feeds = {"input_ids": ids, "attention_mask": mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(ids)
+        hidden = self.session.run(None, feeds)[0]
+        m = mask[..., None].astype(np.float32)
+        return (hidden * m).sum(axis=1) / np.maximum(m.sum(axis=1), 1e-9)
+
+    def encode(self, sentences, batch_size: int = 64, normalize_embeddings: bool = False, convert_to_numpy: bool = True):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        # sort by length so each batch pads to similar lengths
+        order = np.argsort([len(t) for t in texts])
+        out = np.zeros((len(texts), 0), dtype=np.float32)
+        parts = []
+        for i in range(0, len(texts), batch_size):
+            idx = order[i:i + batch_size]
+            parts.append((idx, self._run([texts[j] for j in idx])))
+        if parts:
+            out = np.zeros((len(texts), parts[0][1].shape[1]), dtype=np.float32)
+            for idx, emb in parts:
+                out[idx] = emb
+        if normalize_embeddings:
+            out = _normalize(out)
+        return out[0] if single else out
+
+def make_embedder(backend: str = None):
+    opts = load_config().get("embedding") or {}
+    backend = backend or opts.get("backend", "torch")
+    if backend == "onnx":
+        model_dir = opts.get("onnx_dir") or ONNX_DIR
+        if not os.path.isabs(model_dir):
+            model_dir = os.path.join(PROJECT_ROOT, model_dir)
+        return OnnxEmbedder(model_dir, quantized=opts.get("quantized", True), intra_op_threads=int(opts.get("intra_op_threads", 0)))
+    return TorchEmbedder()
+
+def embedder_id(backend: str = None) -> str:
+    # vectors from different backends / quantization aren't interchangeable; persisted indexes record this
+    opts = load_config().get("embedding") or {}
+    backend = backend or opts.get("backend", "torch")
+    if backend == "onnx":
+        return f"{MODEL_NAME}/onnx{'-int8' if opts.get('quantized', True) else ''}"
+    return f"{MODEL_NAME}/torch"
+
+def get_embedder():
+    # answer scoring and the company-info matcher share this one instance
+    return get_model("embedder")
+
+register("embedder", make_embedder)
@@ -0,0 +1,55 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+from backend.src.nlp_evaluation.answer_evaluator import get_sentence_model, compile_skill_matcher, count_skills, skill_bonus, rate
+from backend.src.utils.metrics import timed
+
+class ScoringProfile:
+    # everything about a room's scoring that doesn't depend on the candidate, computed once
+    def __init__(self, questions: list, jd_profile: dict = None):
+        ideal = [q.get("ideal_answer", "") for q in questions]
+        self.ideal_embeddings = np.asarray(
+            get_sentence_model().encode(ideal, normalize_embeddings=True, convert_to_numpy=True), dtype=np.float32
+        ) if ideal else np.zeros((0, 0), dtype=np.float32)
+        self.skill_matcher = compile_skill_matcher((jd_profile or {}).get("skills"))
+
+    def score(self, idx: int, response: str) -> float:
+        # only the candidate text is encoded per turn; cosine is a dot product of unit vectors
+        emb = get_sentence_model().encode([response], normalize_embeddings=True, convert_to_numpy=True)[0]
+        score = float(self.ideal_embeddings[idx] @ emb)
+        if self.skill_matcher is not None:
+            score = min(score + skill_bonus(count_skills(self.skill_matcher, response)), 1.0)
+        return score
+
+    @timed("evaluate_answer")
+    def evaluate(self, idx: int, response: str) -> str:
+        return rate(self.score(idx, response))
+
+# room_id -> ScoringProfile (per process, lru; rebuilt from the session on a miss, so any worker can score any room)
+MAX_PROFILES = 256
+_profiles = OrderedDict()
+_lock = threading.Lock()
+
+def build_profile(room_id: str, questions: list, jd_profile: dict = None) -> ScoringProfile:
+    profile = ScoringProfile(questions, jd_profile)
+    with _lock:
+        _profiles[room_id] = profile
+        while len(_profiles) > MAX_PROFILES:
+            _profiles.popitem(last=False)
+    return profile
+
+def get_profile(room_id: str, questions: list, jd_profile: dict = None) -> ScoringProfile:
+    with _lock:
+        profile = _profiles.get(room_id)
+        if profile is not None:
+            _profiles.move_to_end(room_id)
+    if profile is None:
+        profile = build_profile(room_id, questions, jd_profile)
+    return profile
+
+def drop_profile(room_id: str):
+    with _lock:
+        _profiles.pop(room_id, None)
+
+def evaluate_room_answer(room_id: str, session: dict, idx: int, response: str) -> str:
+    return get_profile(room_id, session["questions"], session.get("jd_profile")).evaluate(idx, response)
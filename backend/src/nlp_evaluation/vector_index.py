@@ -0,0 +1,128 @@
+import contextlib
+import hashlib
+import json
+import os
+import numpy as np
+
+class VectorIndex:
+    # append-only matrix of unit vectors on disk ({name}.f32, memory-mapped for search) plus {name}.json with
+    # one entry per row: {"key", "active", "payload"}. sync() embeds only keys it hasn't seen, so adding items
+    # never re-embeds the rest; rows of removed items stay in the file but are marked inactive
+    def __init__(self, index_dir: str, name: str):
+        self.index_dir = index_dir
+        self.data_path = os.path.join(index_dir, f"{name}.f32")
+        self.meta_path = os.path.join(index_dir, f"{name}.json")
+        self.lock_path = os.path.join(index_dir, f"{name}.lock")
+        self.meta = {"embedder": None, "dim": 0, "items": []}
+        self._matrix = None
+        self._active = np.zeros(0, dtype=bool)
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.meta_path) as f:
+                self.meta = json.load(f)
+        except (OSError, ValueError):
+            self.meta = {"embedder": None, "dim": 0, "items": []}
+        rows, dim = len(self.meta["items"]), int(self.meta.get("dim") or 0)
+        if rows and dim and os.path.isfile(self.data_path) and os.path.getsize(self.data_path) >= rows * dim * 4:
+            self._matrix = np.memmap(self.data_path, dtype=np.float32, mode="r", shape=(rows, dim))
+        else:
+            self._matrix = np.zeros((0, dim), dtype=np.float32)
+            self.meta["items"] = []
+        self._active = np.array([bool(it.get("active", True)) for it in self.meta["items"]], dtype=bool)
+        self._fingerprint = None
+
+    @contextlib.contextmanager
+    def _locked(self):
+        # several uvicorn workers may sync the same index at startup
+        os.makedirs(self.index_dir, exist_ok=True)
+        with open(self.lock_path, "a") as f:
+            try:
+                import fcntl
+                fcntl.flock(f, fcntl.LOCK_EX)
+            except ImportError:
+                pass
+            yield
+
+    def __len__(self) -> int:
+        return int(self._active.sum())
+
+    def items(self) -> list:
+        return [it for it in self.meta["items"] if it.get("active", True)]
+
+    def sync(self, entries, embed, embedder: str) -> int:
+        # entries: [(key, text, payload)]; embed(texts) -> normalized float32 rows. returns how many were embedded
+        with self._locked():
+            self._load()
+            if self.meta.get("embedder") != embedder:
+                # vectors from another model/backend aren't comparable: start over
+                self.meta = {"embedder": embedder, "dim": 0, "items": []}
+                with open(self.data_path, "wb"):
+                    pass
+                changed = True
+            else:
+                changed = False
+            wanted = {key: (text, payload) for key, text, payload in entries}
+            known = {it["key"]: it for it in self.meta["items"]}
+            for key, it in known.items():
+                active = key in wanted
+                if it.get("active", True) != active:
+                    it["active"] = active
+                    changed = True
+                if active and it.get("payload") != wanted[key][1]:
+                    it["payload"] = wanted[key][1]
+                    changed = True
+            new = [(key, text, payload) for key, (text, payload) in wanted.items() if key not in known]
+            if new:
+                vectors = np.ascontiguousarray(embed([text for _, text, _ in new]), dtype=np.float32)
+                dim = int(self.meta.get("dim") or vectors.shape[1])
+                if vectors.shape[1] != dim:
+                    raise ValueError(f"embedding size {vectors.shape[1]} != index size {dim}")
+                with open(self.data_path, "ab") as f:
+                    # drop rows a crashed append wrote past what the metadata knows about
+                    f.truncate(len(self.meta["items"]) * dim * 4)
+                    f.write(vectors.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                self.meta["dim"] = dim
+                self.meta["items"].extend({"key": key, "active": True, "payload": payload} for key, _, payload in new)
+                changed = True
+            if changed:
+                tmp = f"{self.meta_path}.tmp"
+                with open(tmp, "w") as f:
+                    json.dump(self.meta, f, separators=(",", ":"))
+                os.replace(tmp, self.meta_path)
+            self._load()
+            return len(new)
+
+    def search(self, queries: np.ndarray, k: int = None, min_score: float = None) -> list:
+        # queries: one or more normalized rows; a row's score is its best cosine against any query.
+        # -> [(score, payload)] for active rows, best first
+        if not len(self._matrix) or not len(queries):
+            return []
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        scores = (self._matrix @ queries.T).max(axis=1)
+        scores[~self._active] = -np.inf
+        if min_score is not None:
+            scores[scores < min_score] = -np.inf
+        if k is not None and k < len(scores):
+            # only the top k are sorted; matters once the corpus has thousands of rows
+            top = np.argpartition(-scores, k)[:k]
+            order = top[np.argsort(-scores[top], kind="stable")]
+        else:
+            order = np.argsort(-scores, kind="stable")
+        items = self.meta["items"]
+        return [(float(scores[i]), items[i]["payload"]) for i in order if np.isfinite(scores[i])]
+
+    def fingerprint(self) -> str:
+        # changes whenever the searchable content or the embedding model does
+        if self._fingerprint is None:
+            h = hashlib.sha256(str(self.meta.get("embedder")).encode())
+            for key in sorted(it["key"] for it in self.items()):
+                h.update(key.encode())
+            self._fingerprint = h.hexdigest()[:16]
+        return self._fingerprint
+
+def item_key(*parts) -> str:
+    return hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:24]
@@ -0,0 +1,156 @@
+import json
+import os
+import re
+import threading
+from collections import Counter
+from backend.src.utils.config import load_config
+from backend.src.utils.models import get_model, register
+from backend.src.nlp_evaluation.embeddings import get_embedder, embedder_id
+from backend.src.nlp_evaluation.vector_index import VectorIndex, item_key
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR) # backend
+SOURCE = os.path.join(PROJECT_ROOT, "data", "questions.json")
+INDEX_DIR = os.path.join(PROJECT_ROOT, "data", "question_bank")
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+FIELDS = ("question", "ideal_answer", "topic", "difficulty")
+MIN_SCORE = 0.35
+MAX_PER_TOPIC = 2
+DIFFICULTY_MIX = {"Easy": 2, "Medium": 2, "Hard": 2}
+MAX_QUERY_CHUNKS = 32
+QUERY_CHUNK_CHARS = 300
+
+_options = None
+
+def bank_options() -> dict:
+    # read once per process; consulted on every jd analysis
+    global _options
+    if _options is None:
+        opts = load_config().get("question_bank") or {}
+        paths = {}
+        for name, default in (("source", SOURCE), ("index_dir", INDEX_DIR)):
+            path = opts.get(name) or default
+            paths[name] = path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+        _options = {
+            "enabled": bool(opts.get("enabled", True)),
+            **paths,
+            "min_score": float(opts.get("min_score", MIN_SCORE)),
+            "max_per_topic": int(opts.get("max_per_topic", MAX_PER_TOPIC)),
+            "difficulty_mix": dict(opts.get("difficulty_mix") or DIFFICULTY_MIX),
+        }
+    return _options
+
+def _clean(q: dict) -> dict:
+    out = {f: str(q.get(f, "")).strip() for f in FIELDS}
+    out["difficulty"] = out["difficulty"].capitalize() if out["difficulty"].capitalize() in DIFFICULTIES else "Medium"
+    return out
+
+def _entry(q: dict):
+    # the key covers every field, so editing a question in the json re-embeds just that one
+    return item_key(*(q[f] for f in FIELDS)), f"{q['topic']}: {q['question']} {q['ideal_answer']}", q
+
+def difficulty_quotas(mix: dict, count: int) -> dict:
+    # scale the configured difficulty mix to count questions (largest remainder)
+    total = sum(mix.values()) or 1
+    exact = {d: mix.get(d, 0) * count / total for d in DIFFICULTIES}
+    quotas = {d: int(v) for d, v in exact.items()}
+    for d in sorted(DIFFICULTIES, key=lambda d: exact[d] - quotas[d], reverse=True)[:count - sum(quotas.values())]:
+        quotas[d] += 1
+    return quotas
+
+def query_chunks(jd_text: str) -> list:
+    # a posting is longer than the encoder's window: score each question against its best-matching passage
+    sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+|\n+", jd_text or "") if s.strip()]
+    chunks, current = [], ""
+    for s in sentences:
+        if current and len(current) + len(s) > QUERY_CHUNK_CHARS:
+            chunks.append(current)
+            current = ""
+        current = f"{current} {s}".strip()
+    if current:
+        chunks.append(current)
+    return chunks[:MAX_QUERY_CHUNKS]
+
+class QuestionBank:
+    # vetted questions (data/questions.json) behind a memory-mapped embedding index. questions that fit a jd are
+    # served locally; the llm only writes the ones the bank can't cover
+    def __init__(self, source: str = SOURCE, index_dir: str = INDEX_DIR):
+        self.source = source
+        self.index = VectorIndex(index_dir, "questions")
+        self._lock = threading.Lock()
+
+    def _read_source(self) -> list:
+        if not os.path.isfile(self.source):
+            return []
+        with open(self.source) as f:
+            return json.load(f)
+
+    def sync(self) -> int:
+        # embeds whatever is new in the source file; returns how many questions that was
+        entries = [_entry(_clean(q)) for q in self._read_source() if q.get("question")]
+        return self.index.sync(entries, self._embed, embedder_id())
+
+    def add(self, questions) -> int:
+        # append vetted questions to the source file and the index; only the new ones are embedded
+        with self._lock:
+            raw = self._read_source()
+            seen = {_entry(_clean(q))[0] for q in raw if q.get("question")}
+            fresh = []
+            for q in map(_clean, questions):
+                key = _entry(q)[0]
+                if q["question"] and key not in seen:
+                    seen.add(key)
+                    fresh.append(q)
+            if not fresh:
+                return 0
+            next_id = max((int(q.get("question_id") or 0) for q in raw), default=0) + 1
+            raw += [{"question_id": next_id + i, **q} for i, q in enumerate(fresh)]
+            tmp = f"{self.source}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(raw, f, indent=2)
+            os.replace(tmp, self.source)
+            return self.sync()
+
+    @staticmethod
+    def _embed(texts):
+        return get_embedder().encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+
+    def fingerprint(self) -> str:
+        return self.index.fingerprint()
+
+    def search(self, jd_text: str, k: int = None, min_score: float = None) -> list:
+        chunks = query_chunks(jd_text)
+        if not chunks or not len(self.index):
+            return []
+        return self.index.search(self._embed(chunks), k=k, min_score=min_score)
+
+    def select(self, jd_text: str, count: int, min_score: float = MIN_SCORE, max_per_topic: int = MAX_PER_TOPIC,
+               difficulty_mix: dict = None):
+        # best matches first, filling each difficulty's quota with at most max_per_topic per topic.
+        # -> (questions, gaps) where gaps is {difficulty: how many the llm still has to write}
+        quotas = difficulty_quotas(difficulty_mix or DIFFICULTY_MIX, count)
+        picked, topics = [], Counter()
+        for score, q in self.search(jd_text, min_score=min_score):
+            topic = q["topic"].lower()
+            if quotas.get(q["difficulty"], 0) <= 0 or topics[topic] >= max_per_topic:
+                continue
+            picked.append(dict(q, match=round(score, 3)))
+            quotas[q["difficulty"]] -= 1
+            topics[topic] += 1
+            if len(picked) == count:
+                break
+        return picked, {d: n for d, n in quotas.items() if n > 0}
+
+def _load_question_bank():
+    opts = bank_options()
+    bank = QuestionBank(opts["source"], opts["index_dir"])
+    added = bank.sync()
+    if added:
+        print(f"Question bank: embedded {added} new questions ({len(bank.index)} total)")
+    return bank
+
+def get_question_bank() -> QuestionBank:
+    # loaded (and synced with the source file) once per process, like the models; listed in warm_up_models
+    return get_model("question_bank")
+
+register("question_bank", _load_question_bank)
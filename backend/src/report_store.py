@@ -0,0 +1,170 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from backend.src.nlp_evaluation.answer_evaluator import RATING_SCORES
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(os.path.dirname(BASE_DIR), "data") # backend/data
+DB_PATH = os.path.join(DATA_DIR, "reports.sqlite3")
+REPORT_DIR = os.path.join(DATA_DIR, "reports") # legacy one-json-per-room reports, imported on startup
+MAX_PAGE = 200
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS reports ("
+    "room_id TEXT PRIMARY KEY, candidate_name TEXT, role TEXT COLLATE NOCASE, decision TEXT, "
+    "average_score REAL, date TEXT, answered_questions INTEGER, total_questions INTEGER, report TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS reports_date ON reports (date)",
+    "CREATE INDEX IF NOT EXISTS reports_role_date ON reports (role, date)",
+    "CREATE INDEX IF NOT EXISTS reports_decision_date ON reports (decision, date)",
+    "CREATE TABLE IF NOT EXISTS report_answers ("
+    "room_id TEXT NOT NULL, idx INTEGER NOT NULL, topic TEXT, difficulty TEXT, rating TEXT, score INTEGER, "
+    "PRIMARY KEY (room_id, idx))",
+    "CREATE INDEX IF NOT EXISTS answers_topic ON report_answers (topic, rating)",
+    "CREATE INDEX IF NOT EXISTS answers_difficulty ON report_answers (difficulty, rating)",
+)
+
+def _filters(role=None, decision=None, date_from=None, date_to=None):
+    # dates are "YYYY-MM-DD[ HH:MM:SS]" strings, so they compare lexicographically; date_to covers the whole day
+    where, args = [], []
+    if role:
+        where.append("r.role = ?")
+        args.append(role)
+    if decision:
+        where.append("r.decision = ?")
+        args.append(decision.upper())
+    if date_from:
+        where.append("r.date >= ?")
+        args.append(date_from)
+    if date_to:
+        where.append("r.date <= ?")
+        args.append(date_to if len(date_to) > 10 else f"{date_to} 23:59:59")
+    return (" WHERE " + " AND ".join(where)) if where else "", args
+
+class ReportStore:
+    # final reports in sqlite: summary columns are indexed for listing/filtering, answers for per-topic stats,
+    # and the full report is kept as compact json so a poll returns it without re-serializing
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            for stmt in SCHEMA:
+                conn.execute(stmt)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def put(self, report: dict):
+        room_id = report["room_id"]
+        answers = [
+            (room_id, i, r.get("topic") or None, r.get("difficulty") or None, r.get("rating"), RATING_SCORES.get(r.get("rating")))
+            for i, r in enumerate(report.get("responses") or [])
+        ]
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO reports (room_id, candidate_name, role, decision, average_score, date, "
+                "answered_questions, total_questions, report) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (room_id, report.get("candidate_name"), (report.get("jd_profile") or {}).get("role") or None,
+                 report.get("decision"), report.get("average_score"), report.get("date"),
+                 report.get("answered_questions"), report.get("total_questions"),
+                 json.dumps(report, separators=(",", ":"))),
+            )
+            conn.execute("DELETE FROM report_answers WHERE room_id = ?", (room_id,))
+            conn.executemany(
+                "INSERT INTO report_answers (room_id, idx, topic, difficulty, rating, score) VALUES (?, ?, ?, ?, ?, ?)", answers
+            )
+
+    def get_json(self, room_id: str):
+        # the stored json text as is, or None
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT report FROM reports WHERE room_id = ?", (room_id,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, room_id: str):
+        text = self.get_json(room_id)
+        return json.loads(text) if text is not None else None
+
+    def room_ids(self) -> list:
+        with closing(self._connect()) as conn:
+            return [r for (r,) in conn.execute("SELECT room_id FROM reports ORDER BY room_id")]
+
+    def list(self, role=None, decision=None, date_from=None, date_to=None, limit: int = 20, offset: int = 0) -> dict:
+        where, args = _filters(role, decision, date_from, date_to)
+        limit = max(1, min(int(limit), MAX_PAGE))
+        with closing(self._connect()) as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM reports r{where}", args).fetchone()[0]
+            rows = conn.execute(
+                "SELECT r.room_id, r.candidate_name, r.role, r.decision, r.average_score, r.date, "
+                f"r.answered_questions, r.total_questions FROM reports r{where} "
+                "ORDER BY r.date DESC, r.room_id LIMIT ? OFFSET ?", args + [limit, max(0, int(offset))],
+            ).fetchall()
+        keys = ("room_id", "candidate_name", "role", "decision", "average_score", "date", "answered_questions", "total_questions")
+        return {"total": total, "limit": limit, "offset": max(0, int(offset)), "items": [dict(zip(keys, row)) for row in rows]}
+
+    def stats(self, role=None, decision=None, date_from=None, date_to=None) -> dict:
+        where, args = _filters(role, decision, date_from, date_to)
+        with closing(self._connect()) as conn:
+            decisions = conn.execute(
+                f"SELECT r.decision, COUNT(*), AVG(r.average_score) FROM reports r{where} GROUP BY r.decision", args
+            ).fetchall()
+            by = {}
+            for column in ("topic", "difficulty"):
+                rows = conn.execute(
+                    f"SELECT a.{column}, a.rating, COUNT(*) FROM report_answers a JOIN reports r ON r.room_id = a.room_id"
+                    f"{where} GROUP BY a.{column}, a.rating", args,
+                ).fetchall()
+                by[column] = _distribution(rows)
+        return {
+            "reports": sum(n for _, n, _ in decisions),
+            "decisions": {d or "UNKNOWN": {"count": n, "average_score": round(avg or 0, 2)} for d, n, avg in decisions},
+            "by_topic": by["topic"],
+            "by_difficulty": by["difficulty"],
+        }
+
+    def import_dir(self, report_dir: str = REPORT_DIR) -> int:
+        # one-off migration of legacy json reports; rooms already in the store are skipped without reading the file
+        if not os.path.isdir(report_dir):
+            return 0
+        known = set(self.room_ids())
+        imported = 0
+        for name in sorted(os.listdir(report_dir)):
+            if not name.endswith("_report.json") or name[:-len("_report.json")] in known:
+                continue
+            try:
+                with open(os.path.join(report_dir, name)) as f:
+                    report = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Skipping report {name}: {e}")
+                continue
+            report.setdefault("room_id", name[:-len("_report.json")])
+            self.put(report)
+            imported += 1
+        return imported
+
+def _distribution(rows) -> list:
+    # [(label, rating, count)] -> per label: count, average on the 1-4 scale and the rating histogram
+    groups = {}
+    for label, rating, count in rows:
+        g = groups.setdefault(label or "Unspecified", {"count": 0, "total": 0, "ratings": {r: 0 for r in RATING_SCORES}})
+        g["count"] += count
+        g["total"] += RATING_SCORES.get(rating, 0) * count
+        if rating in g["ratings"]:
+            g["ratings"][rating] += count
+    return [
+        {"label": label, "count": g["count"], "average_score": round(g["total"] / g["count"], 2), "ratings": g["ratings"]}
+        for label, g in sorted(groups.items())
+    ]
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_report_store() -> ReportStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ReportStore()
+    return _store
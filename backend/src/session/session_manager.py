@@ -1,38 +1,59 @@
 from backend.src.utils.config import load_config
 from backend.src.voice_processing.record_transcription import transcribe_audio as stt_transcribe_audio, ask_groq
-from sentence_transformers import SentenceTransformer
+from backend.src.utils.executors import run_blocking
+from backend.src.utils.metrics import counter
+from backend.src.llm_client import get_llm_client
+from backend.src.company_knowledge import get_company_knowledge, knowledge_options
 import os
-os.environ["TOKENIZERS_PARALLELISM"] = "false"
-lang_model = SentenceTransformer("all-MiniLM-L6-v2")
+import re
 
-company_info = {
-  "culture": "We value innovation and collaboration.",
-  "mission": "To build cutting-edge AI products.",
-  "benefits": "We offer health insurance, flexible hours, and remote work options.",
-  "projects": "We are currently working on AI for healthcare and fintech."
-}
-comp_info_desc = list(company_info.values())
-embeddings_company = lang_model.encode(comp_info_desc)
-def answer_candidate_question(question: str) -> str:
-    embeddings_cand_ques = lang_model.encode(question)
-    # compute cosine similarities
-    similarities = lang_model.similarity(embeddings_company, embeddings_cand_ques)
-    closest_score = max(similarities).item()
-    closest_score_idx = similarities.argmax().item()
-    if closest_score >= 0.25:
-        confidence_note = "This is a strong match with company information."
+_answer_cache = counter("candidate_answer_cache_total", "Candidate questions answered from the answer cache", ("result",))
+
+def candidate_question_prompt(question: str) -> str:
+    # the best few handbook passages above the score threshold, instead of a single closest snippet
+    opts = knowledge_options()
+    passages = get_company_knowledge().retrieve(question, opts["top_k"], opts["min_score"])
+    if passages:
+        context = "\n    ".join(f"- ({p['heading'] or p['source']}) {p['text']}" for _, p in passages)
+        confidence_note = "Answer from the company information above."
     else:
-        confidence_note = "This may not directly match company info, but please still give a natural response based on general company culture and values."
+        context = "- nothing relevant found"
+        confidence_note = "This may not directly match company info, but please still give a natural response based on general company culture and values, and offer to pass the question on to the recruiter."
         
     groq_query = f"""
     Candidate response to "Do you have any questions for us?": {question}
-    Closest company info: {comp_info_desc[closest_score_idx]}
+    Company information:
+    {context}
     Note: {confidence_note}
     Answer in a conversational tone.
     Be concise and keep the response under 3 sentences.
     Give a **plain conversational answer**, no markdown, no formatting, no bullet points.
     """
-    return ask_groq(groq_query)
+    return groq_query
+
+def answer_candidate_question(question: str) -> str:
+    cached = get_company_knowledge().cached_answer(question)
+    if cached is not None:
+        return cached
+    return ask_groq(candidate_question_prompt(question))
+
+async def stream_candidate_answer(question: str, timeout: float = None):
+    # token deltas of the answer, for room_speech_stream to speak sentence by sentence while it is generated;
+    # a repeated question (same wording, same handbook) is answered from the cache without the llm
+    kb = await run_blocking("embed", get_company_knowledge)
+    cached = kb.cached_answer(question)
+    if cached is not None:
+        _answer_cache.inc(("hit",))
+        yield cached
+        return
+    _answer_cache.inc(("miss",))
+    prompt = await run_blocking("embed", candidate_question_prompt, question)
+    parts = []
+    async for delta in get_llm_client().stream(prompt, timeout=timeout):
+        parts.append(delta)
+        yield delta
+    if "".join(parts).strip():
+        kb.remember_answer(question, "".join(parts).strip())
     
 def personalize_intro(candidate_name: str, role: str = "") -> str:
     config = load_config()
@@ -40,6 +61,15 @@ def personalize_intro(candidate_name: str, role: str = "") -> str:
         return config["introduction_prompt"].format(candidate_name=candidate_name, role=role)
     return config["introduction_prompt"].format(candidate_name=candidate_name, role="this")
 
+def intro_segments(role: str = "") -> list:
+    # split the intro template so everything that doesn't mention the candidate can be rendered ahead of time
+    template = load_config()["introduction_prompt"].replace("{role}", role or "this")
+    template = template.replace("{candidate_name}, ", "{candidate_name},\n")
+    return [seg for seg in re.split(r"(?<=[.!?])\s+|\n", template) if seg.strip()]
+
+def personalize_intro_segments(candidate_name: str, role: str = "") -> list:
+    return [seg.replace("{candidate_name}", candidate_name) for seg in intro_segments(role)]
+
 ''' no need of generate followup
 generator = pipeline("text-generation", model="distilgpt2")
 def generate_followup(response: str):
@@ -0,0 +1,204 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from backend.src.utils.config import load_config
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(os.path.dirname(os.path.dirname(BASE_DIR)), "data", "sessions.sqlite3") # backend/data/sessions.sqlite3
+
+def _dump(value) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+class SessionStore:
+    # room_id -> {field: value}; each field is stored (and updated) on its own as compact json,
+    # so callers always read a fresh copy and write back exactly the fields they changed
+    def __init__(self, ttl_seconds: float = 4 * 3600):
+        self.ttl_seconds = ttl_seconds
+        self._expiry_listeners = []
+
+    def on_expire(self, listener):
+        # listener(room_id, session) runs for every room evicted by ttl or capacity, with its last fields
+        self._expiry_listeners.append(listener)
+
+    def _expired(self, rooms):
+        for room_id, raw in rooms:
+            session = {k: json.loads(v) for k, v in raw.items()}
+            for listener in self._expiry_listeners:
+                try:
+                    listener(room_id, session)
+                except Exception as e:
+                    print(f"Session expiry listener failed for {room_id}: {e}")
+
+    def create(self, room_id: str, fields: dict, ttl: float = None):
+        raise NotImplementedError
+
+    def get(self, room_id: str):
+        raise NotImplementedError
+
+    def update(self, room_id: str, fields: dict, ttl: float = None) -> bool:
+        # only touches rooms that still exist; False if the room is gone
+        raise NotImplementedError
+
+    def delete(self, room_id: str):
+        raise NotImplementedError
+
+    def __contains__(self, room_id: str) -> bool:
+        return self.get(room_id) is not None
+
+class MemorySessionStore(SessionStore):
+    # single-process store: lru over rooms, bounded by max_rooms, expired by ttl
+    def __init__(self, max_rooms: int = 1000, ttl_seconds: float = 4 * 3600):
+        super().__init__(ttl_seconds)
+        self.max_rooms = max_rooms
+        self._rooms = OrderedDict()  # room_id -> [expires_at, {field: json}]
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float):
+        gone = [(r, fields) for r, (expires, fields) in self._rooms.items() if expires <= now]
+        for room_id, _ in gone:
+            del self._rooms[room_id]
+        while len(self._rooms) > self.max_rooms:
+            room_id, (_, fields) = self._rooms.popitem(last=False)
+            gone.append((room_id, fields))
+        return gone
+
+    def create(self, room_id: str, fields: dict, ttl: float = None):
+        now = time.time()
+        with self._lock:
+            self._rooms[room_id] = [now + (ttl or self.ttl_seconds), {k: _dump(v) for k, v in fields.items()}]
+            self._rooms.move_to_end(room_id)
+            gone = self._evict(now)
+        self._expired(gone)
+
+    def get(self, room_id: str):
+        with self._lock:
+            entry = self._rooms.get(room_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._rooms[room_id]
+                gone = [(room_id, entry[1])]
+            else:
+                self._rooms.move_to_end(room_id)
+                raw = dict(entry[1])
+                gone = []
+        if gone:
+            self._expired(gone)
+            return None
+        return {k: json.loads(v) for k, v in raw.items()}
+
+    def update(self, room_id: str, fields: dict, ttl: float = None) -> bool:
+        with self._lock:
+            entry = self._rooms.get(room_id)
+            if entry is None or entry[0] <= time.time():
+                return False
+            entry[1].update({k: _dump(v) for k, v in fields.items()})
+            if ttl:
+                entry[0] = time.time() + ttl
+            self._rooms.move_to_end(room_id)
+        return True
+
+    def delete(self, room_id: str):
+        with self._lock:
+            self._rooms.pop(room_id, None)
+
+    def __len__(self):
+        return len(self._rooms)
+
+class SQLiteSessionStore(SessionStore):
+    # shared by every uvicorn worker on the host; one row per (room, field). only the room's fields are shared:
+    # stream handles stay in the worker that opened them, so multiple workers still need sticky routing
+    def __init__(self, path: str = DB_PATH, ttl_seconds: float = 4 * 3600, sweep_interval: float = 60):
+        super().__init__(ttl_seconds)
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self._last_sweep = 0.0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS rooms (room_id TEXT PRIMARY KEY, expires_at REAL NOT NULL)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS room_fields ("
+                "room_id TEXT NOT NULL, field TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (room_id, field))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS rooms_expires ON rooms (expires_at)")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def sweep(self):
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            ids = [r for (r,) in conn.execute("SELECT room_id FROM rooms WHERE expires_at <= ?", (now,))]
+            gone = []
+            for room_id in ids:
+                rows = conn.execute("SELECT field, value FROM room_fields WHERE room_id = ?", (room_id,)).fetchall()
+                gone.append((room_id, dict(rows)))
+            if ids:
+                conn.executemany("DELETE FROM room_fields WHERE room_id = ?", [(r,) for r in ids])
+                conn.executemany("DELETE FROM rooms WHERE room_id = ?", [(r,) for r in ids])
+        self._last_sweep = now
+        self._expired(gone)
+        return gone
+
+    def create(self, room_id: str, fields: dict, ttl: float = None):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM room_fields WHERE room_id = ?", (room_id,))
+            conn.execute("INSERT OR REPLACE INTO rooms (room_id, expires_at) VALUES (?, ?)",
+                         (room_id, time.time() + (ttl or self.ttl_seconds)))
+            conn.executemany("INSERT INTO room_fields (room_id, field, value) VALUES (?, ?, ?)",
+                             [(room_id, k, _dump(v)) for k, v in fields.items()])
+        if time.time() - self._last_sweep >= self.sweep_interval:
+            self.sweep()
+
+    def get(self, room_id: str):
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT expires_at FROM rooms WHERE room_id = ?", (room_id,)).fetchone()
+            if row is None or row[0] <= time.time():
+                return None
+            rows = conn.execute("SELECT field, value FROM room_fields WHERE room_id = ?", (room_id,)).fetchall()
+        return {k: json.loads(v) for k, v in rows}
+
+    def update(self, room_id: str, fields: dict, ttl: float = None) -> bool:
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            if ttl:
+                found = conn.execute("UPDATE rooms SET expires_at = ? WHERE room_id = ? AND expires_at > ?",
+                                     (now + ttl, room_id, now)).rowcount > 0
+            else:
+                found = conn.execute("SELECT 1 FROM rooms WHERE room_id = ? AND expires_at > ?", (room_id, now)).fetchone() is not None
+            if not found:
+                return False
+            conn.executemany("INSERT OR REPLACE INTO room_fields (room_id, field, value) VALUES (?, ?, ?)",
+                             [(room_id, k, _dump(v)) for k, v in fields.items()])
+        return True
+
+    def delete(self, room_id: str):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM room_fields WHERE room_id = ?", (room_id,))
+            conn.execute("DELETE FROM rooms WHERE room_id = ?", (room_id,))
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_session_store() -> SessionStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                opts = load_config().get("session_store") or {}
+                ttl = float(opts.get("ttl_seconds", 4 * 3600))
+                if opts.get("backend", "memory") == "sqlite":
+                    path = opts.get("path") or DB_PATH
+                    if not os.path.isabs(path):
+                        path = os.path.join(os.path.dirname(os.path.dirname(BASE_DIR)), path)
+                    _store = SQLiteSessionStore(path, ttl_seconds=ttl)
+                else:
+                    _store = MemorySessionStore(int(opts.get("max_rooms", 1000)), ttl_seconds=ttl)
+    return _store
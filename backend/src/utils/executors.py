@@ -0,0 +1,62 @@
+import asyncio
+import contextvars
+import functools
+import multiprocessing as mp
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from backend.src.utils.config import load_config
+
+# max concurrent jobs per pool; override under `executors:` in config.yaml
+POOL_DEFAULTS = {
+    "stt": 2,      # audio decoding
+    "tts": 2,      # piper synthesis / cache reads
+    "embed": 2,    # sentence-transformer scoring
+    "extract": 2,  # jd document parsing
+    "io": 4,       # report and file writes
+}
+# pure-python work that holds the gil (pypdf, python-docx) gets worker processes instead of threads;
+# functions and arguments sent to these pools must be picklable
+PROCESS_POOLS = ("extract",)
+
+_pools = {}
+_lock = threading.Lock()
+
+def get_pool(name: str):
+    # model work runs in threads: torch/onnxruntime release the gil and each model stays loaded once per process
+    pool = _pools.get(name)
+    if pool is None:
+        with _lock:
+            pool = _pools.get(name)
+            if pool is None:
+                limits = load_config().get("executors") or {}
+                workers = int(limits.get(name, POOL_DEFAULTS.get(name, 2)))
+                if name in PROCESS_POOLS:
+                    pool = ProcessPoolExecutor(max_workers=max(1, workers), mp_context=mp.get_context("spawn"))
+                else:
+                    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix=f"{name}-pool")
+                _pools[name] = pool
+    return pool
+
+async def run_blocking(pool: str, fn, *args, **kwargs):
+    # run a blocking call on a bounded pool so the event loop keeps serving other rooms
+    loop = asyncio.get_running_loop()
+    executor = get_pool(pool)
+    call = functools.partial(fn, *args, **kwargs)
+    if pool not in PROCESS_POOLS:
+        # threads see the caller's context (room/turn trace tags); process workers can't
+        call = functools.partial(contextvars.copy_context().run, call)
+    try:
+        return await loop.run_in_executor(executor, call)
+    except BrokenProcessPool:
+        # a worker process died (e.g. oom-killed on a hostile file); start a fresh pool for the next call
+        with _lock:
+            if _pools.get(pool) is executor:
+                del _pools[pool]
+        raise
+
+def shutdown_pools():
+    with _lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
@@ -0,0 +1,212 @@
+import asyncio
+import bisect
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from backend.src.utils.config import load_config
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(BASE_DIR)) # backend
+STAGE_METRIC = "interview_stage_seconds"
+# latency buckets in seconds, from cache hits to slow llm calls
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets=BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}  # label tuple -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: tuple = ()):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[i] += 1
+            series[-1] += value
+
+    def render(self, label_names) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in sorted(items):
+            base = ",".join(f'{k}="{v}"' for k, v in zip(label_names, labels))
+            sep = "," if base else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{base}}} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative}")
+        return lines
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple = (), value: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + value
+
+    def render(self, label_names) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            base = ",".join(f'{k}="{v}"' for k, v in zip(label_names, labels))
+            lines.append(f"{self.name}{{{base}}} {value:g}" if base else f"{self.name} {value:g}")
+        return lines
+
+# name -> (metric, label names); stage timings are labelled by stage only, room/turn go to the trace log
+_metrics = {}
+_metrics_lock = threading.Lock()
+
+def histogram(name: str, help_text: str, label_names=("stage",)) -> Histogram:
+    with _metrics_lock:
+        if name not in _metrics:
+            _metrics[name] = (Histogram(name, help_text), tuple(label_names))
+        return _metrics[name][0]
+
+def counter(name: str, help_text: str, label_names=()) -> Counter:
+    with _metrics_lock:
+        if name not in _metrics:
+            _metrics[name] = (Counter(name, help_text), tuple(label_names))
+        return _metrics[name][0]
+
+def render_prometheus() -> str:
+    with _metrics_lock:
+        metrics = list(_metrics.values())
+    lines = []
+    for metric, label_names in metrics:
+        lines.extend(metric.render(label_names))
+    return "\n".join(lines) + "\n"
+
+_stages = histogram(STAGE_METRIC, "Time spent per interview pipeline stage")
+
+# ---- per-request traces (opt-in) ----
+
+# the active trace of this request/turn: {"name", "tags", "spans", "started"}; None when tracing is off
+_trace = contextvars.ContextVar("trace", default=None)
+_trace_log_lock = threading.Lock()
+_tracing = None
+
+def tracing_options() -> dict:
+    global _tracing
+    if _tracing is None:
+        opts = load_config().get("tracing") or {}
+        path = opts.get("path") or os.path.join("data", "traces.jsonl")
+        _tracing = {
+            "enabled": bool(opts.get("enabled", False)) or os.getenv("INTERVIEW_TRACE") == "1",
+            "path": path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path),
+        }
+    return _tracing
+
+def tag(**tags):
+    # attach room / turn / ... to the current trace; no-op when tracing is off
+    trace = _trace.get()
+    if trace is not None:
+        trace["tags"].update({k: v for k, v in tags.items() if v is not None})
+
+def _write_trace(trace: dict):
+    record = {
+        "trace": trace["name"],
+        "at": round(trace["wall"], 3),
+        "total_ms": round((time.perf_counter() - trace["started"]) * 1000, 2),
+        **trace["tags"],
+        "spans": trace["spans"],
+    }
+    path = tracing_options()["path"]
+    line = json.dumps(record, separators=(",", ":")) + "\n"
+    with _trace_log_lock:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a") as f:
+            f.write(line)
+
+@contextmanager
+def trace(name: str, **tags):
+    # one trace log line per request / live turn with every span recorded inside it
+    if not tracing_options()["enabled"]:
+        yield None
+        return
+    record = {"name": name, "tags": {k: v for k, v in tags.items() if v is not None}, "spans": [],
+              "started": time.perf_counter(), "wall": time.time()}
+    token = _trace.set(record)
+    try:
+        yield record
+    finally:
+        _trace.reset(token)
+        try:
+            _write_trace(record)
+        except OSError as e:
+            print(f"Trace log write failed: {e}")
+
+# ---- spans ----
+
+def observe(stage: str, seconds: float, **tags):
+    _stages.observe(seconds, (stage,))
+    trace = _trace.get()
+    if trace is not None:
+        span = {"stage": stage, "ms": round(seconds * 1000, 2)}
+        span.update({k: v for k, v in tags.items() if v is not None})
+        trace["spans"].append(span)
+
+@contextmanager
+def span(stage: str, **tags):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - started, **tags)
+
+def timed(stage: str):
+    # decorator form of span for sync and async functions
+    def wrap(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    observe(stage, time.perf_counter() - started)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(stage, time.perf_counter() - started)
+        return wrapper
+    return wrap
+
+class TraceMiddleware:
+    # pure asgi: wraps each http request in a trace when tracing is enabled
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracing_options()["enabled"]:
+            return await self.app(scope, receive, send)
+        status = {}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        with trace(f'{scope["method"]} {scope["path"]}') as record:
+            await self.app(scope, receive, send_wrapper)
+            record["tags"]["status"] = status.get("code")
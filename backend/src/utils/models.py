@@ -0,0 +1,64 @@
+import os
+import threading
+import time
+
+# name -> zero-arg loader; heavy imports happen inside the loader, not at import time
+_loaders = {}
+_models = {}
+_load_seconds = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+def register(name: str, loader):
+    with _registry_lock:
+        _loaders[name] = loader
+        _locks.setdefault(name, threading.Lock())
+
+def get_model(name: str):
+    # loads each model exactly once per process, even when several threads ask at the same time
+    model = _models.get(name)
+    if model is not None:
+        return model
+    lock = _locks.get(name)
+    if lock is None:
+        raise KeyError(f"Unknown model: {name}")
+    with lock:
+        model = _models.get(name)
+        if model is None:
+            started = time.perf_counter()
+            model = _loaders[name]()
+            _load_seconds[name] = time.perf_counter() - started
+            _models[name] = model
+    return model
+
+def is_loaded(name: str) -> bool:
+    return name in _models
+
+def status() -> dict:
+    return {name: round(_load_seconds[name], 3) if name in _models else None for name in _loaders}
+
+def warm_up(names=None):
+    for name in names if names is not None else list(_loaders):
+        try:
+            get_model(name)
+        except Exception as e:
+            print(f"Warm-up failed for {name}: {e}")
+
+def _load_sentence_model():
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer("all-MiniLM-L6-v2")
+
+def _load_whisper():
+    import whisper
+    return whisper.load_model("tiny")
+
+def _load_piper():
+    from backend.src.voice_processing.tts_engine import get_tts_engine
+    engine = get_tts_engine()
+    engine.warm_up()
+    return engine
+
+register("sentence", _load_sentence_model)
+register("whisper", _load_whisper)
+register("piper", _load_piper)
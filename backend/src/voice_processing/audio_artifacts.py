@@ -0,0 +1,140 @@
+import asyncio
+import re
+from fastapi.responses import Response
+from backend.src.session.session_store import get_session_store
+from backend.src.utils.executors import run_blocking
+from backend.src.voice_processing.tts_cache import get_tts_cache
+from backend.src.voice_processing.tts_stream import (
+    stream_speech, speech_keys, open_stream, sentences, LiveSegments, STREAM_PREFIX,
+)
+from backend.src.voice_processing.audio_encoding import delete_encoded
+
+ARTIFACT_FIELD = "artifact." # session field per tts cache key that only this room uses
+CACHE_CONTROL = "public, max-age=86400, immutable" # keys are content hashes, so a url never changes meaning
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+def room_speech(room_id: str, *segments, shared=(), accent: str = None):
+    # stream_speech for text unique to this room (the personalized greeting). segments listed in shared are
+    # template text every room speaks (prefetched, maybe still rendering) and are never recorded; of the rest,
+    # whatever isn't cached yet is recorded on the room and removed when the room ends
+    cache = get_tts_cache()
+    segments = [s for s in segments if s and s.strip()]
+    keys = speech_keys(segments, accent)
+    owned = [k for s, k in zip(segments, keys) if s not in shared]
+    if owned and len(keys) > len(segments):
+        owned.append(keys[-1])  # the joined clip includes the personal text
+    new_keys = [k for k in owned if k not in cache]
+    if new_keys:
+        get_session_store().update(room_id, {ARTIFACT_FIELD + k: 1 for k in new_keys})
+    return stream_speech(*segments, accent=accent)
+
+_pumps = set() # running room_speech_stream producers, referenced so they aren't garbage collected
+
+async def room_speech_stream(room_id: str, deltas, *lead_in, fallback: str = None, tail=(), accent: str = None,
+                             on_text=None, own_reply: bool = True):
+    # speak an llm reply while it is generated: the stream opens with the fixed lead-in (usually already cached)
+    # and each sentence is appended as soon as it is complete, then the fixed tail segments. returns (url, stream
+    # handle) right away; on_text(reply) is awaited once the reply is finished. if nothing arrives, the fallback
+    # is spoken instead. only reply sentences this room renders first are recorded as its artifacts: lead-in,
+    # tail and fallback are shared, and so is the whole reply when own_reply is False (e.g. text that other
+    # rooms get from an answer cache)
+    cache = get_tts_cache()
+    live = LiveSegments(lead_in)
+    tail = [s for s in tail if s and s.strip()]
+    shared = set(live.items) | set(tail) | {fallback}
+    handle = open_stream(live, accent)
+
+    async def pump():
+        spoken, keys = [], []
+        try:
+            async for sentence in sentences(deltas):
+                if own_reply and sentence not in shared:
+                    # ownership is decided before the reader can render it: a clip already cached belongs to
+                    # whoever made it (another room, or a shared prompt)
+                    key = speech_keys([sentence], accent)[0]
+                    if key not in cache:
+                        keys.append(key)
+                live.put(sentence)
+                spoken.append(sentence)
+        except Exception as e:
+            print(f"Streamed reply for {room_id} failed after {len(spoken)} sentences: {e}")
+        except asyncio.CancelledError:
+            live.close()
+            raise
+        if not spoken and fallback:
+            live.put(fallback)
+            spoken.append(fallback)
+        for segment in tail:
+            live.put(segment)
+        if keys and len(live.items) > 1:
+            # the joined clip is only written once the reader has rendered every segment, after close()
+            joined = speech_keys(live.items, accent)[-1]
+            if joined not in cache:
+                keys.append(joined)
+        live.close()
+        try:
+            if keys:
+                await run_blocking("io", get_session_store().update, room_id, {ARTIFACT_FIELD + k: 1 for k in keys})
+            if on_text is not None:
+                await on_text(" ".join(spoken))
+        except Exception as e:
+            print(f"Saving streamed reply for {room_id} failed: {e}")
+
+    task = asyncio.create_task(pump())
+    _pumps.add(task)
+    task.add_done_callback(_pumps.discard)
+    return f"{STREAM_PREFIX}{handle}", handle
+
+def collect_room_audio(room_id: str, session: dict = None) -> int:
+    # called when the interview finishes and again when the session expires; deleting twice is harmless
+    if session is None:
+        session = get_session_store().get(room_id)
+    cache = get_tts_cache()
+    keys = [f[len(ARTIFACT_FIELD):] for f in (session or {}) if f.startswith(ARTIFACT_FIELD)]
+    for key in keys:
+        cache.delete(key)
+        delete_encoded(key)
+    return len(keys)
+
+def etag_for(key: str, fmt: str = "wav") -> str:
+    return f'"{key}"' if fmt == "wav" else f'"{key}.{fmt}"'
+
+def not_modified(headers, etag: str) -> bool:
+    tags = [t.strip() for t in (headers.get("if-none-match") or "").split(",")]
+    return etag in tags or "*" in tags
+
+MALFORMED = "malformed"
+
+def _byte_range(header: str, size: int):
+    # single "bytes=a-b" / "bytes=a-" / "bytes=-n" range -> (start, end inclusive); None if it can't be satisfied,
+    # MALFORMED if the header isn't a range we understand (then it is ignored and the whole clip is sent)
+    m = _RANGE.match(header.strip())
+    if not m or not (m.group(1) or m.group(2)):
+        return MALFORMED
+    if not m.group(1):
+        start, end = max(size - int(m.group(2)), 0), size - 1
+    else:
+        start = int(m.group(1))
+        end = min(int(m.group(2)), size - 1) if m.group(2) else size - 1
+        if m.group(2) and int(m.group(2)) < start:
+            return MALFORMED  # last-byte-pos before first-byte-pos is invalid, not unsatisfiable
+    if start > end or start >= size:
+        return None
+    return start, end
+
+def audio_response(headers, data: bytes, etag: str, media_type: str = "audio/wav") -> Response:
+    base = {"ETag": etag, "Accept-Ranges": "bytes", "Cache-Control": CACHE_CONTROL, "Vary": "Accept"}
+    if not_modified(headers, etag):
+        return Response(status_code=304, headers=base)
+    range_header = headers.get("range")
+    if_range = headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        span = _byte_range(range_header, len(data))
+        if span == MALFORMED:
+            return Response(data, media_type=media_type, headers=base)
+        if span is None:
+            return Response(status_code=416, headers={**base, "Content-Range": f"bytes */{len(data)}"})
+        start, end = span
+        return Response(data[start:end + 1], status_code=206, media_type=media_type,
+                        headers={**base, "Content-Range": f"bytes {start}-{end}/{len(data)}"})
+    return Response(data, media_type=media_type, headers=base)
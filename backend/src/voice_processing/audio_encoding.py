@@ -0,0 +1,99 @@
+import os
+import subprocess
+import threading
+from backend.src.utils.config import load_config
+from backend.src.voice_processing.tts_cache import TTSCache, CACHE_DIR, get_tts_cache
+
+OGG_DIR = os.path.join(CACHE_DIR, "ogg") # backend/data/tts_cache/ogg
+MEDIA_TYPES = {"wav": "audio/wav", "ogg": "audio/ogg"}
+
+_opts = None
+
+def _options() -> dict:
+    # read once per process: negotiate and the ogg keys sit on every get-audio request
+    global _opts
+    if _opts is None:
+        opts = load_config().get("audio_encoding") or {}
+        _opts = {
+            "format": opts.get("format", "ogg"),  # "wav" turns compression off
+            "bitrate_kbps": int(opts.get("opus_bitrate_kbps", 32)),
+            "memory_mb": int(opts.get("memory_mb", 16)),
+            "disk_mb": int(opts.get("disk_mb", 256)),
+        }
+    return _opts
+
+def ogg_enabled() -> bool:
+    return _options()["format"] == "ogg"
+
+def encode_opus(wav: bytes, bitrate_kbps: int = 32) -> bytes:
+    # speech-tuned opus in an ogg container through an ffmpeg pipe
+    cmd = [
+        "ffmpeg", "-nostdin", "-loglevel", "error", "-f", "wav", "-i", "pipe:0",
+        "-c:a", "libopus", "-b:a", f"{bitrate_kbps}k", "-application", "voip", "-f", "ogg", "pipe:1",
+    ]
+    out = subprocess.run(cmd, input=wav, capture_output=True)
+    if out.returncode != 0 or not out.stdout:
+        raise RuntimeError(f"Failed to encode audio: {out.stderr.decode(errors='replace')[-300:]}")
+    return out.stdout
+
+def negotiate(accept: str, requested: str = None, ogg: bool = True) -> str:
+    # explicit ?format= wins; otherwise ogg only if the client names it, since "*/*" says nothing about opus support.
+    # ogg=False (compression turned off) always answers wav
+    if not ogg:
+        return "wav"
+    if requested in MEDIA_TYPES:
+        return requested
+    for part in (accept or "").split(","):
+        media, _, params = part.strip().partition(";")
+        if media.strip() in ("audio/ogg", "application/ogg") and _quality(params) > 0:
+            return "ogg"
+    return "wav"
+
+def _quality(params: str) -> float:
+    # the q= of one accept entry; "q=0", "q=0.0" and "q=0.000" all refuse it, a malformed q counts as refused
+    for param in params.split(";"):
+        name, _, value = param.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value.strip())
+            except ValueError:
+                return 0.0
+    return 1.0
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_ogg_cache() -> TTSCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                opts = _options()
+                _cache = TTSCache(OGG_DIR, max_memory_bytes=opts["memory_mb"] << 20, max_disk_bytes=opts["disk_mb"] << 20, ext=".ogg")
+    return _cache
+
+def ogg_key(key: str) -> str:
+    return f"{key}_{_options()['bitrate_kbps']}k"
+
+def get_ogg(key: str):
+    # encoded once per clip and bitrate, then served from the ogg cache; None if the wav is gone
+    bitrate = _options()["bitrate_kbps"]
+    cache = get_ogg_cache()
+    data = cache.get(ogg_key(key))
+    if data is not None:
+        return data
+    wav = get_tts_cache().get(key)
+    if wav is None:
+        return None
+    return cache.get_or_create(ogg_key(key), lambda: encode_opus(wav, bitrate))
+
+def pre_encode(key: str):
+    # called after a background render so the first request doesn't pay for ffmpeg
+    if ogg_enabled():
+        try:
+            get_ogg(key)
+        except Exception as e:
+            print(f"Opus encode failed for {key}: {e}")
+
+def delete_encoded(key: str):
+    get_ogg_cache().delete(ogg_key(key))
@@ -0,0 +1,95 @@
+import numpy as np
+
+SAMPLE_RATE = 16000
+MAX_WINDOW_SAMPLES = 30 * SAMPLE_RATE # partials decode at most the last 30s (one whisper window)
+
+class LiveTranscriber:
+    # endpointing state for one live answer; the caller runs the actual whisper passes
+    # input: 16 kHz mono little-endian int16 pcm, in any chunk size
+    def __init__(self, frame_ms: int = 30, endpoint_ms: int = 600, partial_interval_ms: int = 700,
+                 energy_threshold: float = 0.01, min_speech_ms: int = 150):
+        self.frame = SAMPLE_RATE * frame_ms // 1000
+        self.endpoint_frames = max(1, endpoint_ms // frame_ms)
+        self.partial_interval = SAMPLE_RATE * partial_interval_ms // 1000
+        self.energy_threshold = energy_threshold
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.reset()
+
+    def reset(self):
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._chunks = []
+        self.samples = 0
+        self.speech_frames = 0
+        self.silent_frames = 0
+        self.speech_end = 0  # sample offset where the last voiced frame ended
+        self.last_partial_at = 0
+        self.last_partial_text = ""
+        self._partial_text_at = 0
+        # starts where the floor alone gives energy_threshold and only learns from frames below it, so a
+        # candidate already talking when the socket opens can't raise the floor to speech level
+        self.noise_floor = self.energy_threshold / 3.0
+        self.ended = False
+
+    @property
+    def started(self) -> bool:
+        return self.speech_frames >= self.min_speech_frames
+
+    def audio(self) -> np.ndarray:
+        return np.concatenate(self._chunks) if self._chunks else np.zeros(0, dtype=np.float32)
+
+    def window(self) -> np.ndarray:
+        return self.audio()[-MAX_WINDOW_SAMPLES:]
+
+    def _is_speech(self, frame: np.ndarray) -> bool:
+        # energy vad with an adaptive noise floor (webrtcvad isn't a dependency here)
+        rms = float(np.sqrt(np.mean(frame * frame)))
+        speech = rms > max(self.energy_threshold, self.noise_floor * 3.0)
+        if not speech:
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * rms
+        return speech
+
+    def feed(self, pcm: bytes) -> list:
+        # returns events: "partial" when a new rolling-window decode is due, "endpoint" when the answer is over
+        if self.ended:
+            return []
+        samples = np.frombuffer(pcm[: len(pcm) - len(pcm) % 2], np.int16).astype(np.float32) / 32768.0
+        self._pending = np.concatenate([self._pending, samples])
+        events = []
+        while self._pending.shape[0] >= self.frame:
+            frame, self._pending = self._pending[: self.frame], self._pending[self.frame:]
+            if self._is_speech(frame):
+                self.speech_frames += 1
+                self.silent_frames = 0
+                self._chunks.append(frame)
+                self.samples += frame.shape[0]
+                self.speech_end = self.samples
+            elif self.speech_frames:
+                # keep short pauses inside the answer, drop leading silence
+                self.silent_frames += 1
+                self._chunks.append(frame)
+                self.samples += frame.shape[0]
+                if self.started and self.silent_frames >= self.endpoint_frames:
+                    self.ended = True
+                    events.append("endpoint")
+                    break
+            if self.started and self.speech_end - self.last_partial_at >= self.partial_interval and "partial" not in events:
+                events.append("partial")
+        return events
+
+    def end(self):
+        # client says the answer is over (e.g. "Done speaking")
+        self.ended = True
+
+    def begin_partial(self):
+        # returns (window, covered samples) for a rolling-window decode
+        self.last_partial_at = self.samples
+        return self.window(), self.samples
+
+    def finish_partial(self, covered: int, text: str):
+        if covered >= self._partial_text_at:
+            self._partial_text_at = covered
+            self.last_partial_text = text
+
+    def partial_covers_speech(self) -> bool:
+        # the last partial already saw every voiced frame, so it can be used as the final transcript
+        return bool(self.last_partial_text) and self._partial_text_at >= self.speech_end and self.samples <= MAX_WINDOW_SAMPLES
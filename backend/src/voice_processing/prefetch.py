@@ -0,0 +1,43 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from backend.src.utils.config import load_config
+from backend.src.voice_processing.tts_cache import get_tts_cache, speak_key, audio_url, TTS_PREFIX
+from backend.src.voice_processing.audio_encoding import pre_encode
+from backend.src.session.session_store import get_session_store
+
+AUDIO_FIELD = "audio."
+
+_executor = None
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        workers = int(load_config().get("tts_prefetch_workers", 1))
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-prefetch")
+    return _executor
+
+def _render(room_id: str, name: str, segments):
+    try:
+        key = speak_key(*segments)
+    except Exception as e:
+        print(f"Prefetch failed for {name}: {e}")
+        return
+    if key:
+        pre_encode(key)
+        # one field per clip so concurrent renders never overwrite each other
+        get_session_store().update(room_id, {AUDIO_FIELD + name: audio_url(key)})
+
+def prefetch_audio(room_id: str, items):
+    # items: [(name, [segments...])]; the room's "audio.<name>" field gets the url once it is ready
+    executor = _get_executor()
+    for name, segments in items:
+        if not segments:
+            continue
+        executor.submit(_render, room_id, name, segments)
+
+def ready_audio(session: dict, name: str):
+    # the prefetched clip's url, unless the clip has since left the tts cache (evicted or deleted)
+    url = session.get(AUDIO_FIELD + name)
+    if url and os.path.basename(url)[len(TTS_PREFIX):-len(".wav")] in get_tts_cache():
+        return url
+    return None
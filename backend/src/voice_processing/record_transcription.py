@@ -1,11 +1,17 @@
 # import webrtcvad
 # import pyaudio
-import whisper
+import asyncio
 import os
+import subprocess
 import wave 
 import time
-from piper import PiperVoice, SynthesisConfig
+import numpy as np
+from backend.src.utils.config import load_config
+from backend.src.voice_processing.tts_engine import get_tts_engine
+from backend.src.utils.models import get_model
+from backend.src.utils.metrics import timed
 from groq import Groq
+from backend.src.llm_client import get_llm_client, LLMError
 from dotenv import load_dotenv # for groq api
 load_dotenv() # reads .env and sets values into os.environ
 
@@ -68,32 +74,87 @@ def record_audio(output_file, max_silence=10):
         print("No audio recorded.")
 '''
 
-_whisper_model = None
+SAMPLE_RATE = 16000 # whisper input rate
+
+_stt_service = None
 
 def _get_whisper():
-    global _whisper_model
-    if _whisper_model is None:
-        _whisper_model = whisper.load_model("tiny")
-    return _whisper_model
+    return get_model("whisper")
 
-def transcribe_audio(audio_file: str) -> str:
-    if not os.path.exists(audio_file):
-        raise FileNotFoundError(f"Audio file not found: {audio_file}")
+def decode_audio_bytes(data: bytes, sr: int = SAMPLE_RATE) -> np.ndarray:
+    # decode any container/codec (webm/opus from the browser) to mono float32 pcm through an ffmpeg pipe, no temp file
+    cmd = [
+        "ffmpeg", "-nostdin", "-threads", "0", "-i", "pipe:0",
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sr), "pipe:1",
+    ]
+    out = subprocess.run(cmd, input=data, capture_output=True)
+    if out.returncode != 0:
+        raise RuntimeError(f"Failed to decode audio: {out.stderr.decode(errors='replace')[-300:]}")
+    return np.frombuffer(out.stdout, np.int16).astype(np.float32) / 32768.0
+
+def get_transcription_service():
+    # shared by every room so concurrent answers are micro-batched
+    global _stt_service
+    if _stt_service is None:
+        from backend.src.voice_processing.transcription_service import TranscriptionService
+        config = load_config()
+        _stt_service = TranscriptionService(
+            _get_whisper,
+            batch_window_ms=int(config.get("stt_batch_window_ms", 25)),
+            max_batch=int(config.get("stt_max_batch", 8)),
+            language=(config.get("language_code") or "en").split("-")[0],
+        )
+    return _stt_service
+
+@timed("transcribe_audio")
+def transcribe_audio(audio) -> str:
+    # audio: file path or float32 pcm array at 16 kHz
+    if isinstance(audio, str):
+        if not os.path.exists(audio):
+            raise FileNotFoundError(f"Audio file not found: {audio}")
+        import whisper
+        audio = whisper.load_audio(audio)
+    if audio.size == 0:
+        return ""
+
+    try:
+        return get_transcription_service().transcribe(audio)
+    except Exception as e:
+        print(f"Transcription failed: {e}")
+        return ""
 
+@timed("transcribe_audio")
+async def transcribe_audio_async(audio: np.ndarray) -> str:
+    # same as transcribe_audio but awaits the whisper worker instead of blocking the event loop
+    if audio.size == 0:
+        return ""
     try:
-        model = _get_whisper()
-        result = model.transcribe(audio_file)
-        return result.get("text", "").strip()
+        return await asyncio.wrap_future(get_transcription_service().submit(audio))
     except Exception as e:
         print(f"Transcription failed: {e}")
         return ""
 
 # ai reasoning
+_groq_client = None
+
+def _get_groq():
+    global _groq_client
+    if _groq_client is None:
+        api_key = os.getenv("GROQ_API_KEY")
+        if not api_key:
+            raise ValueError("GROQ_API_KEY environment variable not set")
+        opts = load_config().get("llm") or {}
+        _groq_client = Groq(
+            api_key=api_key,
+            base_url=os.getenv("GROQ_BASE_URL") or opts.get("base_url"),
+            timeout=float(opts.get("timeout_seconds", 20)),
+            max_retries=int(opts.get("max_retries", 2)),
+        )
+    return _groq_client
+
+@timed("ask_groq")
 def ask_groq(prompt, max_completion_tokens=200, model="openai/gpt-oss-120b"):
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise ValueError("GROQ_API_KEY environment variable not set")
-    client = Groq(api_key=api_key)
+    client = _get_groq()
     try:
         completion = client.chat.completions.create(
             model=model, 
@@ -108,23 +169,18 @@ def ask_groq(prompt, max_completion_tokens=200, model="openai/gpt-oss-120b"):
     except Exception as e:
         return f"I apologize, but I'm unable to process your request right now. Please try again later. (Error: {str(e)[:100]})"
 
-# text -> speech
-def generate_speech(text: str, output_file: str, model_path: str = None):
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))  
-    PROJECT_ROOT = os.path.dirname(os.path.dirname(BASE_DIR))  
-    if model_path is None:
-        model_path = os.path.join(PROJECT_ROOT, "en_US-lessac-low.onnx")
+async def ask_groq_async(prompt, max_completion_tokens=200, model="openai/gpt-oss-120b"):
+    try:
+        return await get_llm_client().complete(prompt, model=model, max_completion_tokens=max_completion_tokens)
+    except LLMError as e:
+        return f"I apologize, but I'm unable to process your request right now. Please try again later. (Error: {str(e)[:100]})"
 
+# text -> speech
+def generate_speech(text: str, output_file: str, model_path: str = None, accent: str = None):
     try:
-        voice = PiperVoice.load(model_path)  # loads only when needed
-        syn_config = SynthesisConfig(
-            volume=1.0,
-            length_scale=1.3,
-            noise_scale=0.667,
-            noise_w_scale=0.8
-        )
+        # voices are loaded once and pooled by the shared engine
         with wave.open(output_file, "wb") as wav_file:
-            voice.synthesize_wav(text, wav_file, syn_config=syn_config)
+            get_tts_engine().synthesize_to_wav(text, wav_file, accent=accent, model_path=model_path)
         return output_file
     except Exception as e:
         print(f"TTS failed: {e}")
@@ -0,0 +1,103 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+import torch
+import whisper
+from whisper.audio import N_FFT, HOP_LENGTH, N_SAMPLES, mel_filters
+
+def _batch_log_mel(audio: torch.Tensor, n_mels: int) -> torch.Tensor:
+    # whisper.log_mel_spectrogram for a (batch, samples) tensor, clamped per clip instead of over the whole batch
+    window = torch.hann_window(N_FFT).to(audio.device)
+    stft = torch.stft(audio, N_FFT, HOP_LENGTH, window=window, return_complex=True)
+    magnitudes = stft[..., :-1].abs() ** 2
+    mel_spec = mel_filters(audio.device, n_mels) @ magnitudes
+    log_spec = torch.clamp(mel_spec, min=1e-10).log10()
+    log_spec = torch.maximum(log_spec, log_spec.amax(dim=(-2, -1), keepdim=True) - 8.0)
+    return (log_spec + 4.0) / 4.0
+
+class TranscriptionService:
+    # one worker thread owns the whisper model; clips that arrive within batch_window_ms
+    # of each other (from any room) share one log-mel + encoder/decoder pass
+    def __init__(self, model_loader, batch_window_ms: int = 25, max_batch: int = 8, language: str = None):
+        self._load_model = model_loader
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.language = language
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._max_batch_seen = 0
+        self._last_batch_seconds = 0.0
+
+    def submit(self, audio: np.ndarray) -> Future:
+        fut = Future()
+        self._ensure_worker()
+        self._queue.put((np.asarray(audio, dtype=np.float32), fut))
+        return fut
+
+    def transcribe(self, audio: np.ndarray, timeout: float = None) -> str:
+        return self.submit(audio).result(timeout=timeout)
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "batches": self._batches,
+            "clips": self._items,
+            "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+            "max_batch_size": self._max_batch_seen,
+            "last_batch_seconds": round(self._last_batch_seconds, 4),
+        }
+
+    def _ensure_worker(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="whisper-worker", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            started = time.perf_counter()
+            try:
+                self._process(batch)
+            except Exception as e:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+            self._batches += 1
+            self._items += len(batch)
+            self._max_batch_seen = max(self._max_batch_seen, len(batch))
+            self._last_batch_seconds = time.perf_counter() - started
+
+    def _process(self, batch):
+        model = self._load_model()
+        # clips that fit in one 30s window are batched; longer answers need whisper's sliding-window transcribe
+        short = [(a, f) for a, f in batch if a.shape[0] <= N_SAMPLES]
+        for audio, fut in batch:
+            if audio.shape[0] > N_SAMPLES:
+                try:
+                    fut.set_result(model.transcribe(audio, language=self.language).get("text", "").strip())
+                except Exception as e:
+                    fut.set_exception(e)
+        if not short:
+            return
+        audio = torch.stack([whisper.pad_or_trim(torch.from_numpy(a)) for a, _ in short]).to(model.device)
+        mel = _batch_log_mel(audio, model.dims.n_mels)
+        options = whisper.DecodingOptions(language=self.language, fp16=model.device.type == "cuda")
+        results = whisper.decode(model, mel, options)
+        for (_, fut), result in zip(short, results):
+            fut.set_result(result.text.strip())
@@ -0,0 +1,207 @@
+import dataclasses
+import hashlib
+import io
+import json
+import os
+import threading
+import wave
+from collections import OrderedDict
+from backend.src.utils.config import load_config
+from backend.src.voice_processing.tts_engine import get_tts_engine, default_syn_config, PROJECT_ROOT
+
+CACHE_DIR = os.path.join(PROJECT_ROOT, "data", "tts_cache") # backend/data/tts_cache
+SEGMENT_GAP_SECONDS = 0.25
+TTS_PREFIX = "tts_" # cached audio is served as /agent/get-audio/tts_{key}.wav
+
+def cache_key(text: str, voice: str, syn_config) -> str:
+    params = dataclasses.asdict(syn_config) if dataclasses.is_dataclass(syn_config) else vars(syn_config)
+    blob = json.dumps([text.strip(), os.path.basename(voice), params], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+class TTSCache:
+    # content-addressed wav cache: LRU memory tier with a byte budget in front of a disk tier
+    def __init__(self, cache_dir: str = CACHE_DIR, max_memory_bytes: int = 64 << 20, max_disk_bytes: int = 1 << 30, ext: str = ".wav"):
+        self.cache_dir = cache_dir
+        self.ext = ext
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._mem = OrderedDict()  # key -> wav bytes
+        self._mem_bytes = 0
+        self._disk = OrderedDict()  # key -> size, oldest first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> lock, so identical texts synthesize once
+        os.makedirs(cache_dir, exist_ok=True)
+        self._scan_disk()
+
+    def _scan_disk(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(self.ext):
+                st = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((st.st_mtime, name[:-len(self.ext)], st.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}{self.ext}")
+
+    def _remember(self, key: str, data: bytes):
+        if len(data) > self.max_memory_bytes:
+            return
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._mem_bytes -= len(old)
+        self._mem[key] = data
+        self._mem_bytes += len(data)
+        while self._mem_bytes > self.max_memory_bytes:
+            _, evicted = self._mem.popitem(last=False)
+            self._mem_bytes -= len(evicted)
+
+    def get(self, key: str):
+        with self._lock:
+            data = self._mem.get(key)
+            if data is not None:
+                self._mem.move_to_end(key)
+                return data
+            if key not in self._disk:
+                return None
+        try:
+            with open(self.path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            with self._lock:
+                self._disk_bytes -= self._disk.pop(key, 0)
+            return None
+        with self._lock:
+            self._remember(key, data)
+            if key in self._disk:
+                self._disk.move_to_end(key)
+        return data
+
+    def __contains__(self, key: str) -> bool:
+        # index lookup only, no read
+        with self._lock:
+            return key in self._mem or key in self._disk
+
+    def delete(self, key: str):
+        with self._lock:
+            data = self._mem.pop(key, None)
+            if data is not None:
+                self._mem_bytes -= len(data)
+            self._disk_bytes -= self._disk.pop(key, 0)
+        try:
+            os.unlink(self.path(key))
+        except OSError:
+            pass
+
+    def put(self, key: str, data: bytes):
+        tmp = f"{self.path(key)}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self.path(key))
+        with self._lock:
+            self._remember(key, data)
+            self._disk_bytes -= self._disk.pop(key, 0)
+            self._disk[key] = len(data)
+            self._disk_bytes += len(data)
+            while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+                old_key, size = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                try:
+                    os.unlink(self.path(old_key))
+                except OSError:
+                    pass
+
+    def get_or_create(self, key: str, create):
+        data = self.get(key)
+        if data is not None:
+            return data
+        with self._lock:
+            lock = self._inflight.setdefault(key, threading.Lock())
+        try:
+            with lock:
+                data = self.get(key)
+                if data is None:
+                    data = create()
+                    self.put(key, data)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return data
+
+def wav_bytes(pcm: bytes, sample_rate: int, sample_width: int = 2, channels: int = 1) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as out:
+        out.setnchannels(channels)
+        out.setsampwidth(sample_width)
+        out.setframerate(sample_rate)
+        out.writeframes(pcm)
+    return buf.getvalue()
+
+def _join_wavs(parts, gap_seconds: float = SEGMENT_GAP_SECONDS) -> bytes:
+    frames = []
+    params = None
+    for part in parts:
+        with wave.open(io.BytesIO(part), "rb") as w:
+            if params is None:
+                params = w.getparams()
+            frames.append(w.readframes(w.getnframes()))
+    silence = b"\x00" * (int(params.framerate * gap_seconds) * params.sampwidth * params.nchannels)
+    return wav_bytes(silence.join(frames), params.framerate, params.sampwidth, params.nchannels)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_tts_cache() -> TTSCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                opts = load_config().get("tts_cache") or {}
+                _cache = TTSCache(
+                    max_memory_bytes=int(opts.get("memory_mb", 64)) << 20,
+                    max_disk_bytes=int(opts.get("disk_mb", 1024)) << 20,
+                )
+    return _cache
+
+def _render(text: str, accent: str = None, syn_config=None):
+    engine = get_tts_engine()
+    syn_config = syn_config or default_syn_config()
+    key = cache_key(text, engine.resolve_model(accent), syn_config)
+    data = get_tts_cache().get_or_create(key, lambda: engine.synthesize(text, accent=accent, syn_config=syn_config))
+    return key, data
+
+def synthesize_cached(text: str, accent: str = None, syn_config=None) -> str:
+    # returns the cache key of the rendered wav, synthesizing only on a miss
+    return _render(text, accent, syn_config)[0]
+
+def segments_key(segments, accent: str = None, syn_config=None) -> str:
+    segments = [s for s in segments if s and s.strip()]
+    return cache_key("\x1e".join(segments), get_tts_engine().resolve_model(accent), syn_config or default_syn_config())
+
+def synthesize_segments(segments, accent: str = None, syn_config=None) -> str:
+    # each segment is cached on its own (e.g. the fixed "Can you elaborate?" lead-in), then joined
+    segments = [s for s in segments if s and s.strip()]
+    if len(segments) == 1:
+        return synthesize_cached(segments[0], accent, syn_config)
+    key = segments_key(segments, accent, syn_config)
+    get_tts_cache().get_or_create(key, lambda: _join_wavs([_render(s, accent, syn_config)[1] for s in segments]))
+    return key
+
+def audio_url(key: str) -> str:
+    return f"/agent/get-audio/{TTS_PREFIX}{key}.wav"
+
+def speak_key(*segments):
+    # render through the cache; returns the cache key or None
+    try:
+        return synthesize_segments(segments) if len(segments) > 1 else synthesize_cached(segments[0])
+    except Exception as e:
+        print(f"TTS failed: {e}")
+        return None
+
+def speak(*segments):
+    # render through the cache; returns the audio url or None
+    key = speak_key(*segments)
+    return audio_url(key) if key else None
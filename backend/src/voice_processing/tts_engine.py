@@ -0,0 +1,142 @@
+import io
+import os
+import queue
+import threading
+import time
+import wave
+from contextlib import contextmanager
+from backend.src.utils.config import load_config
+from backend.src.utils.metrics import observe, span
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(BASE_DIR)) # backend
+DEFAULT_MODEL = "en_US-lessac-low.onnx"
+
+def default_syn_config():
+    from piper import SynthesisConfig
+    return SynthesisConfig(
+        volume=1.0,
+        length_scale=1.3,
+        noise_scale=0.667,
+        noise_w_scale=0.8
+    )
+
+class VoicePool:
+    # bounded pool of loaded piper voices (one onnx session each) for a single model
+    def __init__(self, model_path: str, size: int = 2):
+        self.model_path = model_path
+        self.size = max(1, size)
+        self._idle = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        from piper import PiperVoice
+        return PiperVoice.load(self.model_path)
+
+    def warm_up(self):
+        # load the first session and run it once so the first real turn is fast
+        with self.acquire() as voice:
+            for _ in voice.synthesize("Hello.", syn_config=default_syn_config()):
+                pass
+
+    @contextmanager
+    def acquire(self):
+        try:
+            voice = self._idle.get_nowait()
+        except queue.Empty:
+            voice = None
+            with self._lock:
+                if self._created < self.size:
+                    self._created += 1
+                    grow = True
+                else:
+                    grow = False
+            if grow:
+                try:
+                    voice = self._load()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                voice = self._idle.get()  # wait for a free session
+        try:
+            yield voice
+        finally:
+            self._idle.put(voice)
+
+class TTSEngine:
+    # long-lived registry of piper voices keyed by accent / model path
+    def __init__(self, voices: dict = None, default_accent: str = None, sessions_per_voice: int = 2):
+        self.voices = dict(voices or {})
+        self.default_accent = default_accent
+        self.sessions_per_voice = sessions_per_voice
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def resolve_model(self, accent: str = None, model_path: str = None) -> str:
+        if model_path:
+            return model_path
+        name = self.voices.get(accent or self.default_accent) or DEFAULT_MODEL
+        if not os.path.isabs(name):
+            name = os.path.join(PROJECT_ROOT, name)
+        return name
+
+    def pool(self, accent: str = None, model_path: str = None) -> VoicePool:
+        path = self.resolve_model(accent, model_path)
+        with self._lock:
+            p = self._pools.get(path)
+            if p is None:
+                p = VoicePool(path, self.sessions_per_voice)
+                self._pools[path] = p
+        return p
+
+    def warm_up(self):
+        # preload every configured voice
+        for accent in self.voices or {self.default_accent: DEFAULT_MODEL}:
+            try:
+                self.pool(accent).warm_up()
+            except Exception as e:
+                print(f"TTS warm-up failed for {accent}: {e}")
+
+    def synthesize_to_wav(self, text: str, wav_file, accent: str = None, model_path: str = None, syn_config=None):
+        with span("generate_speech", chars=len(text)), self.pool(accent, model_path).acquire() as voice:
+            voice.synthesize_wav(text, wav_file, syn_config=syn_config or default_syn_config())
+
+    def stream(self, text: str, accent: str = None, model_path: str = None, syn_config=None):
+        # yields piper AudioChunks sentence by sentence as they are produced;
+        # only time spent inside piper is measured, not time the consumer holds the generator
+        busy = 0.0
+        with self.pool(accent, model_path).acquire() as voice:
+            chunks = voice.synthesize(text, syn_config=syn_config or default_syn_config())
+            while True:
+                started = time.perf_counter()
+                chunk = next(chunks, None)
+                busy += time.perf_counter() - started
+                if chunk is None:
+                    break
+                yield chunk
+        observe("generate_speech", busy, chars=len(text), streamed=True)
+
+    def synthesize(self, text: str, accent: str = None, model_path: str = None, syn_config=None) -> bytes:
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as wav_file:
+            self.synthesize_to_wav(text, wav_file, accent, model_path, syn_config)
+        return buf.getvalue()
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_tts_engine() -> TTSEngine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                config = load_config()
+                _engine = TTSEngine(
+                    voices=config.get("voices"),
+                    default_accent=config.get("accent"),
+                    sessions_per_voice=int(config.get("tts_sessions_per_voice", 2)),
+                )
+    return _engine
@@ -0,0 +1,172 @@
+import io
+import re
+import struct
+import threading
+import time
+import uuid
+import wave
+from backend.src.voice_processing.tts_engine import get_tts_engine, default_syn_config
+from backend.src.voice_processing.tts_cache import (
+    get_tts_cache, cache_key, segments_key, wav_bytes, SEGMENT_GAP_SECONDS, TTS_PREFIX,
+)
+
+STREAM_TTL_SECONDS = 300
+STREAM_PREFIX = "/agent/stream-audio/"
+LIVE_WAIT_SECONDS = 30 # longest a reader waits for the next sentence of a live stream
+MIN_SENTENCE_CHARS = 20 # shorter pieces ("Sure.", "e.g.") are joined to the next sentence
+_SENTENCE_END = re.compile(r"(?<=[.!?])([\"')\]]*)\s+|\n+")
+_ABBREVIATION = re.compile(r"(?:\b[A-Za-z]\.[A-Za-z]\.|\b(?:Mr|Mrs|Ms|Dr|vs|etc|approx)\.)$")
+
+# handle -> (created_at, segments or LiveSegments, accent); per process, so with several workers the stream url
+# has to reach the worker that returned it (sticky routing, see session_store in config.yaml)
+_streams = {}
+_lock = threading.Lock()
+
+class LiveSegments:
+    # segments that are still being produced (sentences of an llm reply); readers block until the next one
+    # arrives or the producer closes. everything is kept, so a second reader replays from the start
+    def __init__(self, segments=(), wait_seconds: float = LIVE_WAIT_SECONDS):
+        self.items = [s for s in segments if s and s.strip()]
+        self.closed = False
+        self.wait_seconds = wait_seconds
+        self._cond = threading.Condition()
+
+    def put(self, text: str):
+        if text and text.strip():
+            with self._cond:
+                self.items.append(text)
+                self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def __iter__(self):
+        i = 0
+        while True:
+            with self._cond:
+                if i >= len(self.items) and not self.closed:
+                    self._cond.wait_for(lambda: i < len(self.items) or self.closed, timeout=self.wait_seconds)
+                if i >= len(self.items):
+                    return
+                text = self.items[i]
+            i += 1
+            yield text
+
+async def sentences(deltas, min_chars: int = MIN_SENTENCE_CHARS):
+    # token deltas -> whole sentences, each yielded as soon as its terminating punctuation and a space arrive
+    buf = ""
+    async for delta in deltas:
+        buf += delta
+        cut = 0
+        for m in _SENTENCE_END.finditer(buf):
+            sentence = buf[cut:m.end(1) if m.group(1) else m.start()].strip()  # keeps a closing quote
+            if len(sentence) >= min_chars and not _ABBREVIATION.search(sentence):
+                yield sentence
+                cut = m.end()
+        buf = buf[cut:]
+    if buf.strip():
+        yield buf.strip()
+
+def _wav_stream_header(sample_rate: int, sample_width: int = 2, channels: int = 1) -> bytes:
+    # riff/data sizes are unknown up front, so use the 0xFFFFFFFF streaming convention
+    block_align = channels * sample_width
+    return (
+        b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, sample_rate * block_align, block_align, sample_width * 8)
+        + b"data" + struct.pack("<I", 0xFFFFFFFF)
+    )
+
+def _pcm_from_wav(data: bytes):
+    with wave.open(io.BytesIO(data), "rb") as w:
+        return w.getframerate(), w.readframes(w.getnframes())
+
+def open_stream(segments, accent: str = None) -> str:
+    # segments is a list, or a LiveSegments the caller keeps feeding
+    handle = uuid.uuid4().hex
+    now = time.time()
+    if not isinstance(segments, LiveSegments):
+        segments = [s for s in segments if s and s.strip()]
+    with _lock:
+        for h in [h for h, (t, _, _) in _streams.items() if now - t > STREAM_TTL_SECONDS]:
+            _streams.pop(h, None)
+        _streams[handle] = (now, segments, accent)
+    return handle
+
+def speech_keys(segments, accent: str = None) -> list:
+    # every cache entry rendering these segments can create: each segment, plus the joined clip
+    segments = [s for s in segments if s and s.strip()]
+    syn_config = default_syn_config()
+    voice = get_tts_engine().resolve_model(accent)
+    keys = [cache_key(s, voice, syn_config) for s in segments]
+    if len(segments) > 1:
+        keys.append(segments_key(segments, accent, syn_config))
+    return keys
+
+def stream_speech(*segments, accent: str = None):
+    # returns (url, stream handle); already rendered audio is served from the cache without a stream
+    key = segments_key(segments, accent)
+    if get_tts_cache().get(key) is not None:
+        return f"/agent/get-audio/{TTS_PREFIX}{key}.wav", None
+    handle = open_stream(segments, accent)
+    return f"{STREAM_PREFIX}{handle}", handle
+
+def iter_stream(handle: str):
+    with _lock:
+        entry = _streams.get(handle)
+    if entry is None:
+        return None
+    _, segments, accent = entry
+    if isinstance(segments, LiveSegments) and segments.closed:
+        segments = list(segments.items)
+    return _generate(segments, accent)
+
+def _generate(segments, accent=None):
+    # push wav frames sentence by sentence while piper is still working on the rest;
+    # with LiveSegments the later sentences may not exist yet when the first ones play
+    engine = get_tts_engine()
+    cache = get_tts_cache()
+    syn_config = default_syn_config()
+    voice = engine.resolve_model(accent)
+    if isinstance(segments, list):
+        cached = cache.get(segments_key(segments, accent, syn_config))
+        if cached is not None:
+            yield cached
+            return
+    sample_rate = None
+    rendered = []
+    texts = []
+    for i, text in enumerate(segments):
+        texts.append(text)
+        seg_key = cache_key(text, voice, syn_config)
+        seg_wav = cache.get(seg_key)
+        if seg_wav is not None:
+            rate, pcm = _pcm_from_wav(seg_wav)
+            if sample_rate is None:
+                sample_rate = rate
+                yield _wav_stream_header(rate)
+            if i:
+                yield _silence(sample_rate)
+            yield pcm
+            rendered.append(pcm)
+            continue
+        parts = []
+        for chunk in engine.stream(text, accent=accent, syn_config=syn_config):
+            if sample_rate is None:
+                sample_rate = chunk.sample_rate
+                yield _wav_stream_header(sample_rate)
+            if i and not parts:
+                yield _silence(sample_rate)
+            pcm = chunk.audio_int16_bytes
+            parts.append(pcm)
+            yield pcm
+        pcm = b"".join(parts)
+        rendered.append(pcm)
+        if sample_rate is not None:
+            cache.put(seg_key, wav_bytes(pcm, sample_rate))
+    if sample_rate is not None and len(texts) > 1:
+        cache.put(segments_key(texts, accent, syn_config), wav_bytes(_silence(sample_rate).join(rendered), sample_rate))
+
+def _silence(sample_rate: int) -> bytes:
+    return b"\x00" * (int(sample_rate * SEGMENT_GAP_SECONDS) * 2)
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# the app imports itself as backend.src.* and reads backend/config/config.yaml relative to the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+os.chdir(ROOT)
@@ -0,0 +1,35 @@
+import pytest
+import backend.src.voice_processing.audio_encoding as audio_encoding
+from backend.src.voice_processing.audio_encoding import negotiate
+
+@pytest.mark.parametrize("accept, fmt", [
+    ("audio/ogg", "ogg"),
+    ("application/ogg;q=0.5", "ogg"),
+    ("audio/wav, audio/ogg;Q=0.001", "ogg"),
+    ("audio/ogg;q=0", "wav"),
+    ("audio/ogg;q=0.0", "wav"),
+    ("audio/ogg; q=0.00", "wav"),
+    ("audio/ogg;q=abc", "wav"),
+    ("*/*", "wav"),
+    (None, "wav"),
+])
+def test_negotiate_accept(accept, fmt):
+    assert negotiate(accept) == fmt
+
+def test_explicit_format_wins_unless_ogg_is_off():
+    assert negotiate("audio/wav", "ogg") == "ogg"
+    assert negotiate("audio/ogg", "wav") == "wav"
+    assert negotiate("audio/ogg", "ogg", ogg=False) == "wav"
+
+def test_negotiate_does_not_read_the_config(monkeypatch):
+    monkeypatch.setattr(audio_encoding, "load_config", lambda: pytest.fail("config read per request"))
+    assert negotiate("audio/ogg") == "ogg"
+
+def test_options_are_read_once(monkeypatch):
+    reads = []
+    monkeypatch.setattr(audio_encoding, "_opts", None)
+    monkeypatch.setattr(audio_encoding, "load_config", lambda: reads.append(1) or {"audio_encoding": {"opus_bitrate_kbps": 24}})
+    assert audio_encoding.ogg_key("k") == "k_24k"
+    assert audio_encoding.ogg_key("k") == "k_24k"
+    assert audio_encoding.ogg_enabled()
+    assert len(reads) == 1
@@ -0,0 +1,70 @@
+import pytest
+from backend.src.voice_processing.audio_artifacts import _byte_range, not_modified, audio_response, etag_for, MALFORMED
+
+DATA = bytes(range(100))
+
+@pytest.mark.parametrize("header, span", [
+    ("bytes=0-9", (0, 9)),
+    ("bytes=90-", (90, 99)),
+    ("bytes=-10", (90, 99)),
+    ("bytes=-500", (0, 99)),
+    ("bytes=95-500", (95, 99)),
+    (" bytes=5-5 ", (5, 5)),
+])
+def test_byte_range(header, span):
+    assert _byte_range(header, 100) == span
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=100-200", "bytes=-0"])
+def test_unsatisfiable_byte_range(header):
+    assert _byte_range(header, 100) is None
+
+@pytest.mark.parametrize("header", ["bytes=10-5", "bytes=-", "items=0-5", "bytes=abc", "bytes=0-1,5-6", ""])
+def test_malformed_byte_range(header):
+    assert _byte_range(header, 100) == MALFORMED
+
+def test_not_modified():
+    etag = etag_for("abc")
+    assert etag == '"abc"'
+    assert not_modified({"if-none-match": '"x", "abc"'}, etag)
+    assert not_modified({"if-none-match": "*"}, etag)
+    assert not not_modified({}, etag)
+    assert not not_modified({"if-none-match": '"abc.ogg"'}, etag)
+    assert etag_for("abc", "ogg") == '"abc.ogg"'
+
+def test_full_response():
+    resp = audio_response({}, DATA, '"k"')
+    assert resp.status_code == 200
+    assert resp.body == DATA
+    assert resp.headers["etag"] == '"k"'
+    assert resp.headers["accept-ranges"] == "bytes"
+
+def test_partial_response():
+    resp = audio_response({"range": "bytes=10-19"}, DATA, '"k"')
+    assert resp.status_code == 206
+    assert resp.body == DATA[10:20]
+    assert resp.headers["content-range"] == "bytes 10-19/100"
+
+def test_unsatisfiable_range_is_416():
+    resp = audio_response({"range": "bytes=200-"}, DATA, '"k"')
+    assert resp.status_code == 416
+    assert resp.headers["content-range"] == "bytes */100"
+
+@pytest.mark.parametrize("header", ["items=0-5", "bytes=abc", "bytes=9-3"])
+def test_malformed_range_is_ignored(header):
+    # rfc 9110: an invalid range header is ignored and the full representation is sent
+    resp = audio_response({"range": header}, DATA, '"k"')
+    assert resp.status_code == 200
+    assert resp.body == DATA
+    assert "content-range" not in resp.headers
+
+def test_revalidation_is_304_without_a_body():
+    resp = audio_response({"if-none-match": '"k"', "range": "bytes=0-1"}, DATA, '"k"')
+    assert resp.status_code == 304
+    assert resp.body == b""
+
+def test_stale_if_range_sends_the_whole_clip():
+    resp = audio_response({"range": "bytes=0-9", "if-range": '"other"'}, DATA, '"k"')
+    assert resp.status_code == 200
+    assert resp.body == DATA
+    resp = audio_response({"range": "bytes=0-9", "if-range": '"k"'}, DATA, '"k"')
+    assert resp.status_code == 206
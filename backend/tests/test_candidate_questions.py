@@ -0,0 +1,36 @@
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+import backend.src.main as main
+from backend.src.session.session_store import get_session_store
+
+@pytest.fixture
+def client(monkeypatch):
+    # no piper, whisper or ffmpeg: the conclusion is "streamed" and silence transcribes to nothing
+    async def transcribe(samples):
+        return "  "
+
+    monkeypatch.setattr(main, "stream_speech", lambda *segments, accent=None: ("/agent/stream-audio/x", "x"))
+    monkeypatch.setattr(main, "collect_room_audio", lambda room_id, session=None: 0)
+    monkeypatch.setattr(main, "decode_audio_bytes", lambda data: data)
+    monkeypatch.setattr(main, "transcribe_audio_async", transcribe)
+    return TestClient(main.app)
+
+def _room(state):
+    room_id = str(uuid.uuid4())
+    get_session_store().create(room_id, {"state": state, "current_question_idx": 2, "questions": [], "responses": []})
+    return room_id
+
+@pytest.mark.parametrize("body", [b"", b"silent webm"])
+def test_silence_after_any_questions_concludes(client, body):
+    room_id = _room("candidate_questions")
+    resp = client.post(f"/agent/process-audio/{room_id}", content=body)
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "conclusion"
+    assert get_session_store().get(room_id)["state"] == "done"
+
+def test_silence_during_a_question_is_a_retry(client):
+    room_id = _room("question")
+    resp = client.post(f"/agent/process-audio/{room_id}", content=b"silent webm")
+    assert resp.json() == {"status": "no_speech", "audioUrl": None}
+    assert get_session_store().get(room_id)["state"] == "question"
@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+import backend.src.jd_analysis as jd_analysis
+from backend.src.jd_cache import JDCache, jd_cache_key
+
+RESULT = {"jd_profile": {"role": "Dev"}, "questions": [{"question_id": 1, "question": "Why?"}]}
+
+@pytest.fixture
+def analysis(monkeypatch, tmp_path):
+    # a slow fake llm analysis behind a throwaway on-disk cache; calls counts the llm calls
+    calls = []
+
+    async def analyze(jd_text):
+        calls.append(jd_text)
+        await asyncio.sleep(0.1)
+        return RESULT
+
+    async def fingerprint():
+        return "test"
+
+    cache = JDCache(str(tmp_path / "jd.sqlite3"))
+    monkeypatch.setattr(jd_analysis, "analyze_job_description", analyze)
+    monkeypatch.setattr(jd_analysis, "bank_fingerprint", fingerprint)
+    monkeypatch.setattr(jd_analysis, "get_jd_cache", lambda: cache)
+    return calls
+
+def test_key_ignores_whitespace_and_unicode_form():
+    assert jd_cache_key("Senior  dev\n\nPython", "v1") == jd_cache_key(" Senior dev Python ", "v1")
+    assert jd_cache_key("Senior dev", "v1") != jd_cache_key("Senior dev", "v2")
+
+def test_concurrent_identical_postings_share_one_call(analysis):
+    async def run():
+        return await asyncio.gather(*(jd_analysis.analyze_job_description_cached("jd") for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(analysis) == 1
+    assert results == [RESULT] * 5
+    results[0]["jd_profile"]["role"] = "changed"  # every caller gets its own copy
+    assert results[1]["jd_profile"]["role"] == "Dev"
+    assert jd_analysis._inflight == {}
+
+def test_second_request_is_served_from_disk(analysis):
+    asyncio.run(jd_analysis.analyze_job_description_cached("jd"))
+    assert asyncio.run(jd_analysis.analyze_job_description_cached("jd")) == RESULT
+    assert len(analysis) == 1
+    asyncio.run(jd_analysis.analyze_job_description_cached("jd", refresh=True))
+    assert len(analysis) == 2
+
+def test_waiters_take_over_when_the_leader_is_cancelled(analysis):
+    async def run():
+        leader = asyncio.create_task(jd_analysis.analyze_job_description_cached("jd"))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(jd_analysis.analyze_job_description_cached("jd")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await asyncio.gather(leader, *waiters, return_exceptions=True)
+
+    leader, *waiters = asyncio.run(run())
+    assert isinstance(leader, asyncio.CancelledError)
+    assert waiters == [RESULT] * 3
+    assert len(analysis) == 2  # the cancelled call plus one retry shared by all waiters
+    assert jd_analysis._inflight == {}
+
+def test_leader_failure_reaches_every_waiter(analysis, monkeypatch):
+    async def fail(jd_text):
+        analysis.append(jd_text)
+        await asyncio.sleep(0.05)
+        raise ValueError("no questions generated")
+
+    monkeypatch.setattr(jd_analysis, "analyze_job_description", fail)
+
+    async def run():
+        return await asyncio.gather(*(jd_analysis.analyze_job_description_cached("jd") for _ in range(3)),
+                                    return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert len(analysis) == 1
+    assert all(isinstance(r, ValueError) for r in results)
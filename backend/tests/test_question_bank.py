@@ -0,0 +1,43 @@
+import json
+import numpy as np
+from backend.src.question_bank import QuestionBank, difficulty_quotas, query_chunks, QUERY_CHUNK_CHARS
+
+def test_difficulty_quotas_scale_the_mix():
+    assert difficulty_quotas({"Easy": 2, "Medium": 2, "Hard": 2}, 6) == {"Easy": 2, "Medium": 2, "Hard": 2}
+    assert difficulty_quotas({"Easy": 1, "Medium": 1, "Hard": 1}, 4) == {"Easy": 2, "Medium": 1, "Hard": 1}
+    assert sum(difficulty_quotas({"Easy": 1, "Medium": 3, "Hard": 1}, 7).values()) == 7
+    assert difficulty_quotas({"Hard": 1}, 3) == {"Easy": 0, "Medium": 0, "Hard": 3}
+
+def test_query_chunks_pack_sentences():
+    text = "\n".join(f"Sentence number {i} about distributed systems." for i in range(40))
+    chunks = query_chunks(text)
+    assert all(len(c) <= QUERY_CHUNK_CHARS for c in chunks)
+    assert " ".join(chunks).count("Sentence number") == 40
+    assert query_chunks("") == []
+
+def test_select_fills_quotas_with_a_topic_cap(tmp_path, monkeypatch):
+    questions = [
+        {"question": f"q{i}", "ideal_answer": "", "topic": topic, "difficulty": diff}
+        for i, (topic, diff) in enumerate([("SQL", "Easy"), ("SQL", "Easy"), ("SQL", "Medium"), ("APIs", "Hard")])
+    ]
+    source = tmp_path / "questions.json"
+    source.write_text(json.dumps(questions))
+    # every question scores the same against the posting; ties keep source order
+    monkeypatch.setattr(QuestionBank, "_embed", staticmethod(lambda texts: np.ones((len(texts), 2), np.float32) / np.sqrt(2)))
+    bank = QuestionBank(str(source), str(tmp_path / "index"))
+    assert bank.sync() == 4
+    picked, gaps = bank.select("We need SQL and API experience.", 6, min_score=0.0, max_per_topic=2,
+                               difficulty_mix={"Easy": 2, "Medium": 2, "Hard": 2})
+    assert [q["question"] for q in picked] == ["q0", "q1", "q3"]  # a third SQL question is over the cap
+    assert gaps == {"Medium": 2, "Hard": 1}
+    assert bank.add([questions[0], {"question": "new", "topic": "Go", "difficulty": "hard"}]) == 1
+    assert json.loads(source.read_text())[-1]["difficulty"] == "Hard"
+
+def test_bank_options_are_read_once(monkeypatch):
+    import backend.src.question_bank as question_bank
+    reads = []
+    monkeypatch.setattr(question_bank, "_options", None)
+    monkeypatch.setattr(question_bank, "load_config", lambda: reads.append(1) or {"question_bank": {"min_score": 0.5}})
+    assert question_bank.bank_options()["min_score"] == 0.5
+    assert question_bank.bank_options()["enabled"]
+    assert len(reads) == 1
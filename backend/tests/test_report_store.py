@@ -0,0 +1,80 @@
+import json
+import pytest
+from backend.src.report_store import ReportStore, MAX_PAGE
+
+def _report(room_id, date, role="Backend Engineer", decision="HIRE", ratings=("GOOD",), topics=None):
+    topics = topics or ["APIs"] * len(ratings)
+    return {
+        "room_id": room_id,
+        "candidate_name": f"Candidate {room_id}",
+        "jd_profile": {"role": role},
+        "decision": decision,
+        "average_score": 3.0,
+        "date": date,
+        "answered_questions": len(ratings),
+        "total_questions": len(ratings),
+        "responses": [
+            {"rating": r, "topic": t, "difficulty": "Medium"} for r, t in zip(ratings, topics)
+        ],
+    }
+
+@pytest.fixture
+def store(tmp_path):
+    store = ReportStore(str(tmp_path / "reports.sqlite3"))
+    for i in range(5):
+        store.put(_report(f"r{i}", f"2026-01-0{i + 1} 10:00:00", decision="HIRE" if i % 2 else "REJECT"))
+    return store
+
+def test_get_returns_the_stored_report(store):
+    assert store.get("r0")["candidate_name"] == "Candidate r0"
+    assert json.loads(store.get_json("r1"))["room_id"] == "r1"
+    assert store.get("missing") is None and store.get_json("missing") is None
+
+def test_list_pages_newest_first(store):
+    page = store.list(limit=2)
+    assert page["total"] == 5
+    assert [i["room_id"] for i in page["items"]] == ["r4", "r3"]
+    page = store.list(limit=2, offset=4)
+    assert [i["room_id"] for i in page["items"]] == ["r0"]
+    assert store.list(limit=10_000)["limit"] == MAX_PAGE
+    assert store.list(limit=0)["limit"] == 1
+    assert store.list(offset=-3)["offset"] == 0
+
+def test_list_filters(store):
+    store.put(_report("other", "2026-01-03 12:00:00", role="Data Scientist", decision="REJECT"))
+    assert store.list(role="data scientist")["total"] == 1  # role compares case-insensitively
+    assert store.list(decision="hire")["total"] == 2
+    assert store.list(date_from="2026-01-02", date_to="2026-01-03")["total"] == 3  # date_to covers the whole day
+
+def test_put_replaces_the_report_and_its_answers(store):
+    store.put(_report("r0", "2026-01-01 10:00:00", ratings=("POOR", "EXCELLENT")))
+    assert store.list()["total"] == 5
+    assert len(store.get("r0")["responses"]) == 2
+    stats = store.stats(role="Backend Engineer", date_to="2026-01-01")
+    assert stats["by_topic"][0]["count"] == 2
+
+def test_stats(tmp_path):
+    store = ReportStore(str(tmp_path / "reports.sqlite3"))
+    store.put(_report("a", "2026-02-01", decision="HIRE", ratings=("GOOD", "EXCELLENT"), topics=["APIs", "SQL"]))
+    store.put(_report("b", "2026-02-02", decision="REJECT", ratings=("POOR", "GOOD"), topics=["APIs", ""]))
+    stats = store.stats()
+    assert stats["reports"] == 2
+    assert stats["decisions"]["HIRE"]["count"] == 1
+    by_topic = {t["label"]: t for t in stats["by_topic"]}
+    assert by_topic["APIs"]["count"] == 2
+    assert by_topic["APIs"]["average_score"] == 2.0
+    assert by_topic["APIs"]["ratings"] == {"POOR": 1, "SATISFACTORY": 0, "GOOD": 1, "EXCELLENT": 0}
+    assert by_topic["SQL"]["average_score"] == 4.0
+    assert by_topic["Unspecified"]["count"] == 1
+    assert store.stats(decision="reject")["by_difficulty"][0]["count"] == 2
+
+def test_import_dir_skips_known_rooms_and_bad_files(tmp_path):
+    store = ReportStore(str(tmp_path / "reports.sqlite3"))
+    legacy = tmp_path / "reports"
+    legacy.mkdir()
+    (legacy / "x_report.json").write_text(json.dumps(_report("x", "2026-03-01")))
+    (legacy / "broken_report.json").write_text("{not json")
+    (legacy / "notes.txt").write_text("ignored")
+    assert store.import_dir(str(legacy)) == 1
+    assert store.import_dir(str(legacy)) == 0
+    assert store.room_ids() == ["x"]
@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+import backend.src.voice_processing.audio_artifacts as audio_artifacts
+import backend.src.voice_processing.prefetch as prefetch
+
+LEAD_IN = "Can you elaborate?"
+FALLBACK = "Could you walk me through an example?"
+
+class Cache(set):
+    def delete(self, key):
+        self.discard(key)
+
+class Store:
+    def __init__(self):
+        self.rooms = {}
+
+    def update(self, room_id, fields, ttl=None):
+        self.rooms.setdefault(room_id, {}).update(fields)
+        return True
+
+    def get(self, room_id):
+        return self.rooms.get(room_id)
+
+@pytest.fixture
+def env(monkeypatch):
+    # keys are the text itself (joined clips "J:a|b"), so no piper voice is needed
+    cache, store = Cache(), Store()
+    monkeypatch.setattr(audio_artifacts, "get_tts_cache", lambda: cache)
+    monkeypatch.setattr(prefetch, "get_tts_cache", lambda: cache)
+    monkeypatch.setattr(audio_artifacts, "get_session_store", lambda: store)
+    monkeypatch.setattr(audio_artifacts, "speech_keys",
+                        lambda segs, accent=None: list(segs) + (["J:" + "|".join(segs)] if len(segs) > 1 else []))
+    monkeypatch.setattr(audio_artifacts, "open_stream", lambda live, accent=None: "handle")
+    monkeypatch.setattr(audio_artifacts, "stream_speech", lambda *segs, accent=None: ("url", "handle"))
+    monkeypatch.setattr(audio_artifacts, "delete_encoded", lambda key: None)
+    return cache, store
+
+async def _deltas(parts):
+    for p in parts:
+        yield p
+
+def _speak(room_id, parts, *lead_in, **kwargs):
+    async def run():
+        await audio_artifacts.room_speech_stream(room_id, _deltas(parts), *lead_in, **kwargs)
+        await asyncio.gather(*audio_artifacts._pumps)
+    asyncio.run(run())
+
+def _artifacts(store, room_id):
+    return {f[len(audio_artifacts.ARTIFACT_FIELD):] for f in store.rooms.get(room_id, {})}
+
+def test_only_new_reply_sentences_belong_to_the_room(env):
+    cache, store = env
+    cache.add("A sentence some other room already said.")
+    _speak("r", ["A brand new sentence from the model. ", "A sentence some other room already said."], LEAD_IN,
+           fallback=FALLBACK)
+    assert _artifacts(store, "r") == {
+        "A brand new sentence from the model.",
+        f"J:{LEAD_IN}|A brand new sentence from the model.|A sentence some other room already said.",
+    }
+
+def test_lead_in_and_fallback_are_never_recorded(env):
+    _, store = env  # nothing cached yet, as if the prefetch were still running
+    _speak("r", [], LEAD_IN, fallback=FALLBACK)
+    assert _artifacts(store, "r") == set()
+
+def test_shared_replies_and_tail_are_never_recorded(env):
+    _, store = env
+    _speak("r", ["An answer other rooms get from the answer cache."], fallback=FALLBACK, tail=["Goodbye for now."],
+           own_reply=False)
+    assert _artifacts(store, "r") == set()
+
+def test_room_speech_skips_shared_template_segments(env):
+    cache, store = env
+    audio_artifacts.room_speech("r", "Hi Ann,", "Welcome to the interview.", shared=["Welcome to the interview."])
+    assert _artifacts(store, "r") == {"Hi Ann,", "J:Hi Ann,|Welcome to the interview."}
+    cache.add("Hi Ann,")
+    audio_artifacts.room_speech("r2", "Hi Ann,", shared=())
+    assert _artifacts(store, "r2") == set()
+
+def test_collect_room_audio_deletes_only_recorded_clips(env):
+    cache, store = env
+    cache.update({"mine", "shared"})
+    store.update("r", {audio_artifacts.ARTIFACT_FIELD + "mine": 1, "state": "done"})
+    assert audio_artifacts.collect_room_audio("r") == 1
+    assert cache == {"shared"}
+
+def test_ready_audio_needs_the_clip_to_be_cached(env):
+    cache, _ = env
+    session = {prefetch.AUDIO_FIELD + "intro": "/agent/get-audio/tts_abc.wav"}
+    assert prefetch.ready_audio(session, "intro") is None
+    cache.add("abc")
+    assert prefetch.ready_audio(session, "intro") == "/agent/get-audio/tts_abc.wav"
+    assert prefetch.ready_audio(session, "missing") is None
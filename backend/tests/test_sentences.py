@@ -0,0 +1,55 @@
+import asyncio
+import threading
+from backend.src.voice_processing.tts_stream import sentences, LiveSegments
+
+def _split(deltas, **kwargs):
+    async def gen():
+        for d in deltas:
+            yield d
+
+    async def run():
+        return [s async for s in sentences(gen(), **kwargs)]
+
+    return asyncio.run(run())
+
+def test_sentences_end_on_punctuation_and_space():
+    assert _split(["What trade-offs did", " you make there? Which one", " would you change?"]) == [
+        "What trade-offs did you make there?", "Which one would you change?",
+    ]
+
+def test_a_sentence_waits_for_the_space_after_its_punctuation():
+    # "3." could still become "3.5", so nothing is cut until whitespace arrives
+    assert _split(["We shipped version 3.", "5 last year to everyone."]) == ["We shipped version 3.5 last year to everyone."]
+
+def test_short_pieces_join_the_next_sentence():
+    assert _split(["Sure. That is a good point to dig into. Why?"]) == ["Sure. That is a good point to dig into.", "Why?"]
+
+def test_abbreviations_do_not_end_a_sentence():
+    assert _split(["Tools like Redis, Kafka etc. are listed in the posting. ",
+                   "Talk to Dr. Smith about the on-call rotation plan."]) == [
+        "Tools like Redis, Kafka etc. are listed in the posting.",
+        "Talk to Dr. Smith about the on-call rotation plan.",
+    ]
+    assert _split(["Pick one cache, e.g. Redis or Memcached, and explain it."]) == [
+        "Pick one cache, e.g. Redis or Memcached, and explain it.",
+    ]
+
+def test_newlines_and_closing_quotes():
+    assert _split(['He said "tell me about your last project." ', "Then go on\n", "with the next part"],
+                  min_chars=5) == ['He said "tell me about your last project."', "Then go on", "with the next part"]
+
+def test_leftover_text_is_flushed_at_the_end():
+    assert _split(["no punctuation at all"]) == ["no punctuation at all"]
+    assert _split([]) == []
+
+def test_live_segments_replay_to_a_late_reader():
+    live = LiveSegments(["Can you elaborate?"], wait_seconds=2)
+    first = []
+    reader = threading.Thread(target=lambda: first.extend(live))
+    reader.start()
+    live.put("One more sentence.")
+    live.put("  ")  # blank pieces are dropped
+    live.close()
+    reader.join()
+    assert first == ["Can you elaborate?", "One more sentence."]
+    assert list(live) == first
@@ -0,0 +1,90 @@
+import pytest
+import backend.src.session.session_store as session_store
+from backend.src.session.session_store import MemorySessionStore, SQLiteSessionStore
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_store, "time", clock)
+    return clock
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path, clock):
+    if request.param == "memory":
+        return MemorySessionStore(max_rooms=3, ttl_seconds=100)
+    return SQLiteSessionStore(str(tmp_path / "sessions.sqlite3"), ttl_seconds=100, sweep_interval=0)
+
+def test_fields_round_trip_and_update_only_what_changed(store):
+    store.create("r", {"state": "intro", "responses": []})
+    assert store.update("r", {"state": "question"})
+    assert store.get("r") == {"state": "question", "responses": []}
+    copy = store.get("r")
+    copy["responses"].append("x")  # callers get a fresh copy
+    assert store.get("r")["responses"] == []
+
+def test_update_of_missing_room_is_refused(store):
+    assert store.update("nope", {"state": "x"}) is False
+    assert store.get("nope") is None
+
+def test_room_expires_after_ttl(store, clock):
+    store.create("r", {"a": 1})
+    clock.now += 99
+    assert store.get("r") == {"a": 1}
+    clock.now += 2
+    assert store.get("r") is None
+    assert store.update("r", {"a": 2}) is False
+
+def test_update_with_ttl_slides_expiry(store, clock):
+    store.create("r", {"a": 1}, ttl=10)
+    clock.now += 8
+    assert store.update("r", {"a": 2}, store.ttl_seconds)
+    clock.now += 50
+    assert store.get("r") == {"a": 2}
+
+def test_update_without_ttl_keeps_expiry(store, clock):
+    store.create("r", {"a": 1}, ttl=10)
+    clock.now += 8
+    assert store.update("r", {"a": 2})
+    clock.now += 3
+    assert store.get("r") is None
+
+def test_delete(store):
+    store.create("r", {"a": 1})
+    store.delete("r")
+    assert "r" not in store
+
+def test_expired_rooms_reach_listeners(store, clock):
+    expired = []
+    store.on_expire(lambda room_id, session: expired.append((room_id, session)))
+    store.create("old", {"artifact.k": 1})
+    clock.now += 101
+    if isinstance(store, SQLiteSessionStore):
+        store.sweep()
+    else:
+        store.get("old")
+    assert expired == [("old", {"artifact.k": 1})]
+
+def test_memory_store_evicts_least_recently_used(clock):
+    store = MemorySessionStore(max_rooms=2, ttl_seconds=100)
+    evicted = []
+    store.on_expire(lambda room_id, session: evicted.append(room_id))
+    store.create("a", {})
+    store.create("b", {})
+    store.get("a")  # a is now the most recently used
+    store.create("c", {})
+    assert evicted == ["b"]
+    assert "a" in store and "c" in store
+
+def test_sqlite_store_is_shared_between_instances(tmp_path, clock):
+    path = str(tmp_path / "sessions.sqlite3")
+    SQLiteSessionStore(path, ttl_seconds=100).create("r", {"state": "intro"})
+    other = SQLiteSessionStore(path, ttl_seconds=100)
+    assert other.update("r", {"state": "question"})
+    assert SQLiteSessionStore(path).get("r") == {"state": "question"}
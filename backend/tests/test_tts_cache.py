@@ -0,0 +1,70 @@
+import threading
+import time
+from backend.src.voice_processing.tts_cache import TTSCache
+
+def test_get_or_create_renders_once_for_concurrent_callers(tmp_path):
+    cache = TTSCache(str(tmp_path))
+    calls = []
+    started = threading.Event()
+
+    def create():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return b"wav"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_create("k", create))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert results == [b"wav"] * 8
+    assert cache._inflight == {}
+
+def test_failed_create_is_not_cached_and_releases_the_key(tmp_path):
+    cache = TTSCache(str(tmp_path))
+
+    def boom():
+        raise RuntimeError("piper died")
+
+    try:
+        cache.get_or_create("k", boom)
+    except RuntimeError:
+        pass
+    assert "k" not in cache
+    assert cache._inflight == {}
+    assert cache.get_or_create("k", lambda: b"ok") == b"ok"
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    TTSCache(str(tmp_path)).put("k", b"abc")
+    fresh = TTSCache(str(tmp_path))
+    assert "k" in fresh
+    assert fresh.get("k") == b"abc"
+
+def test_memory_tier_is_bounded_but_disk_still_serves(tmp_path):
+    cache = TTSCache(str(tmp_path), max_memory_bytes=10)
+    cache.put("a", b"x" * 6)
+    cache.put("b", b"y" * 6)
+    assert list(cache._mem) == ["b"]
+    assert cache._mem_bytes == 6
+    assert cache.get("a") == b"x" * 6  # read back from disk and promoted
+    assert list(cache._mem) == ["a"]
+
+def test_disk_tier_evicts_oldest_past_the_budget(tmp_path):
+    cache = TTSCache(str(tmp_path), max_disk_bytes=10)
+    cache.put("old", b"1" * 6)
+    cache.put("new", b"2" * 6)
+    assert "old" not in cache._disk
+    assert not (tmp_path / "old.wav").exists()
+    assert cache._disk_bytes == 6
+
+def test_delete_drops_both_tiers(tmp_path):
+    cache = TTSCache(str(tmp_path))
+    cache.put("k", b"abc")
+    cache.delete("k")
+    assert "k" not in cache
+    assert cache.get("k") is None
+    assert cache._mem_bytes == 0 and cache._disk_bytes == 0
+    cache.delete("k")  # twice is harmless
@@ -0,0 +1,37 @@
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+import backend.src.main as main
+from backend.src.session.session_store import get_session_store
+
+@pytest.fixture
+def client(monkeypatch):
+    async def transcribe(samples):
+        return ""
+
+    monkeypatch.setattr(main, "decode_audio_bytes", lambda data: data)
+    monkeypatch.setattr(main, "transcribe_audio_async", transcribe)
+    return TestClient(main.app)
+
+def _room():
+    room_id = str(uuid.uuid4())
+    get_session_store().create(room_id, {"state": "question", "current_question_idx": 0, "questions": [], "responses": []})
+    return room_id
+
+def test_oversized_audio_upload_is_rejected(client):
+    body = b"\0" * (main.AUDIO_UPLOAD_MAX_BYTES + 1)
+    resp = client.post(f"/agent/process-audio/{_room()}", content=body)
+    assert resp.status_code == 413
+
+def test_oversized_chunked_audio_upload_is_rejected_while_streaming(client):
+    def chunks():
+        for _ in range(main.AUDIO_UPLOAD_MAX_BYTES // (1 << 16) + 2):
+            yield b"\0" * (1 << 16)
+
+    resp = client.post(f"/agent/process-audio/{_room()}", content=chunks())
+    assert resp.status_code == 413
+
+def test_audio_upload_under_the_cap_is_processed(client):
+    resp = client.post(f"/agent/process-audio/{_room()}", content=b"\0" * 1024)
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "no_speech"
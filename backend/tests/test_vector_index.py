@@ -0,0 +1,99 @@
+import json
+import threading
+import numpy as np
+from backend.src.nlp_evaluation.vector_index import VectorIndex, item_key
+
+VECTORS = {"a": [1, 0, 0], "b": [0, 1, 0], "c": [0, 0, 1], "ab": [0.6, 0.8, 0]}
+
+class Embedder:
+    # fixed unit vectors per text; records what it was asked to embed
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return np.array([VECTORS[t] for t in texts], dtype=np.float32)
+
+def _entries(*texts):
+    return [(item_key(t), t, {"text": t}) for t in texts]
+
+def test_sync_embeds_only_new_items(tmp_path):
+    embed = Embedder()
+    index = VectorIndex(str(tmp_path), "t")
+    assert index.sync(_entries("a", "b"), embed, "m1") == 2
+    assert index.sync(_entries("a", "b", "c"), embed, "m1") == 1
+    assert embed.calls == [["a", "b"], ["c"]]
+    assert len(index) == 3
+    assert (tmp_path / "t.f32").stat().st_size == 3 * 3 * 4
+
+def test_search_ranks_by_best_query_and_applies_min_score(tmp_path):
+    index = VectorIndex(str(tmp_path), "t")
+    index.sync(_entries("a", "b", "ab"), Embedder(), "m1")
+    hits = index.search(np.array([VECTORS["a"]], dtype=np.float32))
+    assert [p["text"] for _, p in hits] == ["a", "ab", "b"]
+    hits = index.search(np.array([VECTORS["a"], VECTORS["b"]], dtype=np.float32), min_score=0.5)
+    assert sorted(p["text"] for _, p in hits) == ["a", "ab", "b"]
+    assert [p["text"] for _, p in index.search(np.array([VECTORS["b"]]), k=1)] == ["b"]
+    assert index.search(np.array([VECTORS["c"]]), min_score=0.5) == []
+
+def test_removed_items_are_inactive_and_come_back_without_embedding(tmp_path):
+    embed = Embedder()
+    index = VectorIndex(str(tmp_path), "t")
+    index.sync(_entries("a", "b"), embed, "m1")
+    before = index.fingerprint()
+    assert index.sync(_entries("a"), embed, "m1") == 0
+    assert len(index) == 1
+    assert [p["text"] for _, p in index.search(np.array([VECTORS["b"]]))] == ["a"]
+    assert index.fingerprint() != before
+    index.sync(_entries("a", "b"), embed, "m1")
+    assert index.fingerprint() == before
+    assert embed.calls == [["a", "b"]]
+
+def test_reopened_index_is_memory_mapped(tmp_path):
+    VectorIndex(str(tmp_path), "t").sync(_entries("a", "b"), Embedder(), "m1")
+    index = VectorIndex(str(tmp_path), "t")
+    assert isinstance(index._matrix, np.memmap)
+    assert len(index) == 2
+    assert index.search(np.array([VECTORS["b"]]), k=1)[0][1] == {"text": "b"}
+
+def test_changing_the_embedder_starts_over(tmp_path):
+    embed = Embedder()
+    index = VectorIndex(str(tmp_path), "t")
+    index.sync(_entries("a", "b"), embed, "m1")
+    assert index.sync(_entries("a", "b"), embed, "m2") == 2
+    assert (tmp_path / "t.f32").stat().st_size == 2 * 3 * 4
+
+def test_rows_past_the_metadata_are_dropped_on_append(tmp_path):
+    index = VectorIndex(str(tmp_path), "t")
+    index.sync(_entries("a"), Embedder(), "m1")
+    with open(tmp_path / "t.f32", "ab") as f:
+        f.write(b"\x00" * 12)  # a crashed append: data written, metadata never updated
+    index.sync(_entries("a", "b"), Embedder(), "m1")
+    assert (tmp_path / "t.f32").stat().st_size == 2 * 3 * 4
+    assert index.search(np.array([VECTORS["b"]]), k=1)[0][1] == {"text": "b"}
+
+def test_truncated_data_file_is_treated_as_empty(tmp_path):
+    VectorIndex(str(tmp_path), "t").sync(_entries("a", "b"), Embedder(), "m1")
+    with open(tmp_path / "t.f32", "r+b") as f:
+        f.truncate(4)
+    index = VectorIndex(str(tmp_path), "t")
+    assert len(index) == 0
+    assert index.sync(_entries("a", "b"), Embedder(), "m1") == 2
+
+def test_concurrent_syncs_embed_each_item_once(tmp_path):
+    embed = Embedder()
+    barrier = threading.Barrier(4)
+
+    def worker():
+        index = VectorIndex(str(tmp_path), "t")  # like one uvicorn worker each
+        barrier.wait()
+        index.sync(_entries("a", "b", "c"), embed, "m1")
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(len(c) for c in embed.calls) == 3
+    meta = json.loads((tmp_path / "t.json").read_text())
+    assert len(meta["items"]) == 3
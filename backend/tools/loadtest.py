@@ -0,0 +1,387 @@
+# load test: N concurrent simulated interviews through the real api, against the stub llm server
+# run: python -m backend.tools.loadtest --concurrency 8 --interviews 32 [--stub-stt] [--stub-tts] [--stub-embed]
+#      [--out loadtest.json] [--baseline loadtest.json]
+# the api runs in its own process (so peak rss is the server's) with data written to a throwaway dir
+import argparse
+import asyncio
+import json
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+JOB_DESCRIPTION = (
+    "We are hiring a Backend Engineer to build and operate Python services. You will design REST APIs with FastAPI, "
+    "model data in SQL databases, ship with Docker and own performance and reliability in production."
+)
+# canned answers: alternating strong and weak so some turns take the follow-up path
+ANSWERS = [
+    "An index is a data structure such as a b-tree that speeds up lookups at the cost of extra storage and slower writes.",
+    "I am not sure.",
+    "Async endpoints run on the event loop while sync endpoints run in a threadpool so blocking calls do not stall it.",
+    "Something with containers I think.",
+    "A transaction is a unit of work that is atomic, consistent, isolated and durable, committed or rolled back as a whole.",
+    "I would look at it.",
+]
+MAX_TURNS = 40
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+def _peak_rss_mb(pid: int) -> float:
+    # VmHWM: high-water mark of the server's resident set
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+# ---- server side (python -m backend.tools.loadtest serve ...) ----
+
+def _stub_answer_index(n_bytes: int) -> int:
+    return n_bytes % len(ANSWERS)
+
+def install_stubs(data_dir: str, stub_stt: bool, stub_tts: bool, stub_embed: bool, stt_ms: float, tts_ms_per_char: float):
+    import types
+    import wave
+    import numpy as np
+    import backend.src.main as main
+    from backend.src import jd_cache, report_store, question_bank, company_knowledge
+    from backend.src.utils.models import register, _models
+    from backend.src.session import session_store
+    from backend.src.voice_processing import tts_cache, tts_engine, tts_stream, audio_encoding
+
+    # keep every file the run writes out of backend/data
+    tts_cache._cache = tts_cache.TTSCache(os.path.join(data_dir, "tts_cache"))
+    audio_encoding.OGG_DIR = os.path.join(data_dir, "tts_cache", "ogg")
+    jd_cache._cache = jd_cache.JDCache(os.path.join(data_dir, "jd_cache.sqlite3"))
+    report_store._store = report_store.ReportStore(os.path.join(data_dir, "reports.sqlite3"))
+    if isinstance(session_store.get_session_store(), session_store.SQLiteSessionStore):
+        session_store._store = session_store.SQLiteSessionStore(os.path.join(data_dir, "sessions.sqlite3"))
+
+    def load_question_bank():
+        bank = question_bank.QuestionBank(question_bank.bank_options()["source"], os.path.join(data_dir, "question_bank"))
+        bank.sync()
+        return bank
+    register("question_bank", load_question_bank)
+
+    def load_company_knowledge():
+        opts = company_knowledge.knowledge_options()
+        kb = company_knowledge.CompanyKnowledge(opts["corpus_dir"], os.path.join(data_dir, "company_index"))
+        kb.sync()
+        return kb
+    register("company_knowledge", load_company_knowledge)
+
+    if stub_stt:
+        # the client sends payloads whose length selects a canned transcript
+        def decode_audio_bytes(data, sr=16000):
+            return np.zeros(len(data), dtype=np.float32)
+
+        async def transcribe_audio_async(samples):
+            await asyncio.sleep(stt_ms / 1000.0)
+            return ANSWERS[_stub_answer_index(len(samples))]
+
+        main.decode_audio_bytes = decode_audio_bytes
+        main.transcribe_audio_async = transcribe_audio_async
+
+    if stub_tts:
+        def syn_config():
+            return types.SimpleNamespace(volume=1.0, length_scale=1.3, noise_scale=0.667, noise_w_scale=0.8)
+
+        class StubVoice:
+            # silence at roughly piper's speaking rate, produced at a configurable cost per character
+            sample_rate = 22050
+
+            def synthesize(self, text, syn_config=None):
+                for sentence in re.split(r"(?<=[.!?])\s+", text.strip()):
+                    if not sentence:
+                        continue
+                    time.sleep(len(sentence) * tts_ms_per_char / 1000.0)
+                    frames = int(self.sample_rate * 0.065 * len(sentence))
+                    yield types.SimpleNamespace(sample_rate=self.sample_rate, audio_int16_bytes=b"\x00\x00" * frames)
+
+            def synthesize_wav(self, text, wav_file, syn_config=None):
+                wav_file.setnchannels(1)
+                wav_file.setsampwidth(2)
+                wav_file.setframerate(self.sample_rate)
+                for chunk in self.synthesize(text, syn_config):
+                    wav_file.writeframes(chunk.audio_int16_bytes)
+
+        for module in (tts_engine, tts_cache, tts_stream):
+            module.default_syn_config = syn_config
+        tts_engine.VoicePool._load = lambda self: StubVoice()
+        # nothing to encode without ffmpeg; serve wav
+        audio_encoding._options = lambda: {"format": "wav", "bitrate_kbps": 32, "memory_mb": 1, "disk_mb": 1}
+
+    if stub_embed:
+
+        class HashEmbedder:
+            # bag-of-words hashed into 384 dims; enough to make ratings vary with the answer text
+            name = "stub"
+
+            def encode(self, sentences, batch_size=64, normalize_embeddings=False, convert_to_numpy=True):
+                single = isinstance(sentences, str)
+                texts = [sentences] if single else list(sentences)
+                out = np.zeros((len(texts), 384), dtype=np.float32)
+                for i, text in enumerate(texts):
+                    for word in re.findall(r"\w+", text.lower()):
+                        out[i, hash(word) % 384] += 1.0
+                if normalize_embeddings:
+                    out /= np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-12)
+                return out[0] if single else out
+
+        register("embedder", HashEmbedder)
+        _models.pop("embedder", None)
+    return main.app
+
+def serve(args):
+    import uvicorn
+    app = install_stubs(args.data_dir, args.stub_stt, args.stub_tts, args.stub_embed, args.stt_ms, args.tts_ms_per_char)
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+# ---- client side ----
+
+class Recorder:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+
+    async def timed(self, stage: str, coro):
+        started = time.perf_counter()
+        try:
+            result = await coro
+        except Exception:
+            self.errors[stage] = self.errors.get(stage, 0) + 1
+            raise
+        self.latencies.setdefault(stage, []).append(time.perf_counter() - started)
+        return result
+
+    def summary(self) -> dict:
+        stages = {}
+        for stage in sorted(set(self.latencies) | set(self.errors)):
+            values = self.latencies.get(stage, [])
+            stages[stage] = {
+                "count": len(values),
+                "errors": self.errors.get(stage, 0),
+                "p50_ms": round(_percentile(values, 0.50) * 1000, 2),
+                "p95_ms": round(_percentile(values, 0.95) * 1000, 2),
+                "p99_ms": round(_percentile(values, 0.99) * 1000, 2),
+                "max_ms": round(max(values) * 1000, 2) if values else 0.0,
+            }
+        return stages
+
+async def _call(client, method: str, url: str, **kwargs):
+    r = await client.request(method, url, **kwargs)
+    if r.status_code >= 400:
+        raise RuntimeError(f"{method} {url} -> {r.status_code}: {r.text[:200]}")
+    return r
+
+async def _fetch_audio(client, rec: Recorder, url: str):
+    if not url:
+        return
+    stage = "stream-audio" if "/stream-audio/" in url else "get-audio"
+    await rec.timed(stage, _call(client, "GET", url))
+
+async def run_interview(client, rec: Recorder, n: int, answers, unique_jd: bool, fetch_audio: bool):
+    jd = f"{JOB_DESCRIPTION} Requisition {n}." if unique_jd else JOB_DESCRIPTION
+    r = await rec.timed("analyze-jd", _call(client, "POST", "/agent/analyze-jd", json={"jobDescription": jd}))
+    room = r.json()["roomId"]
+    r = await rec.timed("start-interview", _call(client, "POST", "/agent/start-interview",
+                                                 json={"roomId": room, "candidateName": f"Candidate {n}"}))
+    if fetch_audio:
+        await _fetch_audio(client, rec, r.json().get("audioUrl"))
+    r = await rec.timed("next-question", _call(client, "POST", "/agent/next-question", json={"roomId": room}))
+    body = r.json()
+    if fetch_audio:
+        await _fetch_audio(client, rec, body.get("audioUrl"))
+    turn = 0
+    while body.get("status") not in ("conclusion", "done") and turn < MAX_TURNS:
+        payload = answers[(n + turn) % len(answers)]
+        r = await rec.timed("process-audio", _call(client, "POST", f"/agent/process-audio/{room}", content=payload,
+                                                   headers={"Content-Type": "audio/webm"}))
+        body = r.json()
+        if fetch_audio:
+            await _fetch_audio(client, rec, body.get("audioUrl"))
+        turn += 1
+    await rec.timed("get-report", _call(client, "GET", f"/agent/get-report/{room}"))
+
+def load_answers(answers_dir: str, stub_stt: bool):
+    if answers_dir:
+        paths = sorted(os.path.join(answers_dir, n) for n in os.listdir(answers_dir) if n.endswith(".webm"))
+        if not paths:
+            raise SystemExit(f"No .webm answers in {answers_dir}")
+        out = []
+        for p in paths:
+            with open(p, "rb") as f:
+                out.append(f.read())
+        return out
+    if not stub_stt:
+        raise SystemExit("Real whisper needs recorded answers: pass --answers-dir with .webm files")
+    # webm magic plus padding; the stub transcriber maps the length to ANSWERS[i]
+    base = 4096 * len(ANSWERS)
+    return [b"\x1a\x45\xdf\xa3" + b"\x00" * (base + i - 4) for i in range(len(ANSWERS))]
+
+async def drive(base_url: str, args, answers) -> dict:
+    import httpx
+    rec = Recorder()
+    queue = asyncio.Queue()
+    for n in range(args.interviews):
+        queue.put_nowait(n)
+    failed = 0
+
+    async def worker(client):
+        nonlocal failed
+        while True:
+            try:
+                n = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                await run_interview(client, rec, n, answers, args.unique_jd, not args.no_audio)
+            except Exception as e:
+                failed += 1
+                print(f"interview {n} failed: {e}")
+
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.request_timeout, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+    requests = sum(len(v) for v in rec.latencies.values())
+    return {
+        "interviews": args.interviews,
+        "failed_interviews": failed,
+        "concurrency": args.concurrency,
+        "elapsed_seconds": round(elapsed, 3),
+        "interviews_per_second": round((args.interviews - failed) / elapsed, 3) if elapsed else 0.0,
+        "requests_per_second": round(requests / elapsed, 2) if elapsed else 0.0,
+        "stages": rec.summary(),
+    }
+
+def _wait_ready(url: str, proc, timeout: float = 120.0):
+    import httpx
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"process exited with {proc.returncode} before {url} was ready")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"{url} not ready after {timeout:.0f}s")
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    problems = []
+    for stage, old in (baseline.get("stages") or {}).items():
+        new = result["stages"].get(stage)
+        if new is None:
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            if old.get(key) and new[key] > old[key] * (1 + tolerance):
+                problems.append(f"{stage} {key}: {new[key]:.1f} > {old[key]:.1f} (+{tolerance:.0%})")
+        if new["errors"] > old.get("errors", 0):
+            problems.append(f"{stage} errors: {new['errors']} > {old.get('errors', 0)}")
+    if baseline.get("interviews_per_second") and result["interviews_per_second"] < baseline["interviews_per_second"] * (1 - tolerance):
+        problems.append(f"interviews/s: {result['interviews_per_second']:.3f} < {baseline['interviews_per_second']:.3f} (-{tolerance:.0%})")
+    if baseline.get("peak_rss_mb") and result["peak_rss_mb"] > baseline["peak_rss_mb"] * (1 + tolerance):
+        problems.append(f"peak_rss_mb: {result['peak_rss_mb']:.0f} > {baseline['peak_rss_mb']:.0f} (+{tolerance:.0%})")
+    return problems
+
+def run(args):
+    answers = load_answers(args.answers_dir, args.stub_stt)
+    data_dir = tempfile.mkdtemp(prefix="loadtest-")
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+    llm_port, api_port = _free_port(), _free_port()
+    env["GROQ_BASE_URL"] = f"http://127.0.0.1:{llm_port}"
+    env.setdefault("GROQ_API_KEY", "stub")
+    procs = []
+    try:
+        llm = subprocess.Popen([sys.executable, "-m", "backend.tools.stub_llm_server", "--port", str(llm_port),
+                                "--delay-ms", str(args.llm_delay_ms), "--jitter-ms", str(args.llm_jitter_ms)], env=env)
+        procs.append(llm)
+        _wait_ready(f"http://127.0.0.1:{llm_port}/stats", llm)
+        cmd = [sys.executable, "-m", "backend.tools.loadtest", "serve", "--port", str(api_port), "--data-dir", data_dir,
+               "--stt-ms", str(args.stt_ms), "--tts-ms-per-char", str(args.tts_ms_per_char)]
+        cmd += [flag for flag, on in (("--stub-stt", args.stub_stt), ("--stub-tts", args.stub_tts), ("--stub-embed", args.stub_embed)) if on]
+        api = subprocess.Popen(cmd, env=env)
+        procs.append(api)
+        _wait_ready(f"http://127.0.0.1:{api_port}/check", api)
+        result = asyncio.run(drive(f"http://127.0.0.1:{api_port}", args, answers))
+        result["peak_rss_mb"] = round(_peak_rss_mb(api.pid), 1)
+        result["settings"] = {
+            "stub_stt": args.stub_stt, "stub_tts": args.stub_tts, "stub_embed": args.stub_embed,
+            "llm_delay_ms": args.llm_delay_ms, "unique_jd": args.unique_jd, "fetch_audio": not args.no_audio,
+        }
+        return result
+    finally:
+        for p in reversed(procs):
+            p.terminate()
+            try:
+                p.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                p.kill()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive concurrent simulated interviews through the api")
+    sub = parser.add_subparsers(dest="command")
+    p_serve = sub.add_parser("serve", help="internal: run the api with the selected stubs")
+    p_serve.add_argument("--port", type=int, required=True)
+    p_serve.add_argument("--data-dir", required=True)
+    for p in (parser, p_serve):
+        p.add_argument("--stub-stt", action="store_true", help="canned transcripts instead of ffmpeg + whisper")
+        p.add_argument("--stub-tts", action="store_true", help="silent audio instead of piper")
+        p.add_argument("--stub-embed", action="store_true", help="hashed bag-of-words instead of MiniLM")
+        p.add_argument("--stt-ms", type=float, default=150.0, help="stub transcription latency")
+        p.add_argument("--tts-ms-per-char", type=float, default=1.0, help="stub synthesis cost")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--interviews", type=int, default=32)
+    parser.add_argument("--answers-dir", help="recorded .webm answers (required without --stub-stt)")
+    parser.add_argument("--unique-jd", action="store_true", help="a different posting per interview (jd cache misses)")
+    parser.add_argument("--no-audio", action="store_true", help="don't download the returned audio")
+    parser.add_argument("--llm-delay-ms", type=float, default=300.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=200.0)
+    parser.add_argument("--request-timeout", type=float, default=60.0)
+    parser.add_argument("--out", help="write the result as json")
+    parser.add_argument("--baseline", help="fail if slower/larger than this result")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args)
+        return
+    result = run(args)
+    print(json.dumps(result, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(result, json.load(f), args.tolerance)
+        for p in problems:
+            print(f"REGRESSION {p}")
+        if problems:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# export MiniLM to onnx (+ int8 dynamic quantization) and check that ratings don't drift vs torch
+# run: python -m backend.tools.onnx_embeddings export [--out backend/data/models/minilm-onnx]
+#      python -m backend.tools.onnx_embeddings parity [--ratings backend/data/ratings.json] [--threads 1 2 4]
+import argparse
+import json
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RATINGS_FILE = os.path.join(BACKEND_DIR, "data", "ratings.json")
+
+def export(out_dir: str, opset: int = 14):
+    import torch
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    from backend.src.utils.models import get_model
+    st = get_model("sentence")
+    transformer = st[0].auto_model.eval()
+    tokenizer = st.tokenizer
+    os.makedirs(out_dir, exist_ok=True)
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in sample]
+    dynamic = {n: {0: "batch", 1: "sequence"} for n in names}
+    dynamic["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    fp32 = os.path.join(out_dir, "model.onnx")
+    with torch.no_grad():
+        torch.onnx.export(transformer, tuple(sample[n] for n in names), fp32, input_names=names,
+                          output_names=["last_hidden_state"], dynamic_axes=dynamic, opset_version=opset)
+    # weights to int8, activations quantized on the fly at run time
+    quantize_dynamic(fp32, os.path.join(out_dir, "model.int8.onnx"), weight_type=QuantType.QInt8)
+    tokenizer.save_pretrained(out_dir)  # tokenizer.json for the tokenizers-only runtime path
+    for name in ("model.onnx", "model.int8.onnx"):
+        print(f"{name}: {os.path.getsize(os.path.join(out_dir, name)) / 2**20:.1f} MB")
+
+def _load_items(path: str):
+    with open(path) as f:
+        items = json.load(f)
+    return [i.get("candidate_answer", "") for i in items], [i.get("ideal_answer", "") for i in items]
+
+def _time_scores(score_fn, responses, ideals, repeats: int):
+    score_fn(responses[:1], ideals[:1])  # first call pays for lazy init
+    started = time.perf_counter()
+    for _ in range(repeats):
+        scores = score_fn(responses, ideals)
+    elapsed = (time.perf_counter() - started) / repeats
+    return scores, elapsed
+
+def parity(ratings_path: str, model_dir: str, quantized: bool, threads, repeats: int, max_delta: float) -> bool:
+    import numpy as np
+    from backend.src.nlp_evaluation.answer_evaluator import score_answers_batch, rate
+    from backend.src.nlp_evaluation.embeddings import TorchEmbedder, OnnxEmbedder
+    responses, ideals = _load_items(ratings_path)
+    if not responses:
+        print(f"No items in {ratings_path}")
+        return True
+
+    torch_model = TorchEmbedder()
+    ref, ref_s = _time_scores(lambda r, i: score_answers_batch(r, i, model=torch_model), responses, ideals, repeats)
+    ref_labels = [rate(float(s)) for s in ref]
+    print(f"torch fp32: {len(responses) / ref_s:.1f} answers/s")
+
+    ok = True
+    for n in threads:
+        onnx_model = OnnxEmbedder(model_dir, quantized=quantized, intra_op_threads=n)
+        got, got_s = _time_scores(lambda r, i: score_answers_batch(r, i, model=onnx_model), responses, ideals, repeats)
+        labels = [rate(float(s)) for s in got]
+        drift = [(j, a, b) for j, (a, b) in enumerate(zip(ref_labels, labels)) if a != b]
+        delta = float(np.max(np.abs(ref - got)))
+        print(f"onnx {'int8' if quantized else 'fp32'} threads={n}: {len(responses) / got_s:.1f} answers/s "
+              f"({ref_s / got_s:.2f}x), max |score delta| {delta:.4f}, rating drift {len(drift)}/{len(labels)}")
+        for j, a, b in drift:
+            print(f"  item {j}: torch {a} ({ref[j]:.3f}) -> onnx {b} ({got[j]:.3f})")
+        ok = ok and not drift and delta <= max_delta
+    return ok
+
+def main():
+    from backend.src.nlp_evaluation.embeddings import ONNX_DIR
+    parser = argparse.ArgumentParser(description="ONNX embedding backend: export and accuracy parity")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_export = sub.add_parser("export")
+    p_export.add_argument("--out", default=ONNX_DIR)
+    p_export.add_argument("--opset", type=int, default=14)
+    p_parity = sub.add_parser("parity")
+    p_parity.add_argument("--ratings", default=RATINGS_FILE)
+    p_parity.add_argument("--model-dir", default=ONNX_DIR)
+    p_parity.add_argument("--fp32", action="store_true", help="compare the unquantized export instead")
+    p_parity.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4], help="intra-op thread counts to try")
+    p_parity.add_argument("--repeats", type=int, default=5)
+    p_parity.add_argument("--max-delta", type=float, default=0.05, help="largest allowed score difference")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export(args.out, args.opset)
+    elif not parity(args.ratings, args.model_dir, not args.fp32, args.threads, args.repeats, args.max_delta):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# build / extend / inspect the question-bank index (backend/data/question_bank)
+# run: python -m backend.tools.question_bank build [--rebuild]
+#      python -m backend.tools.question_bank add new_questions.json
+#      python -m backend.tools.question_bank query jd.txt [--count 6]
+import argparse
+import json
+import os
+import shutil
+import time
+
+def _bank():
+    from backend.src.question_bank import QuestionBank, bank_options
+    opts = bank_options()
+    return QuestionBank(opts["source"], opts["index_dir"]), opts
+
+def build(rebuild: bool = False):
+    bank, opts = _bank()
+    if rebuild and os.path.isdir(opts["index_dir"]):
+        shutil.rmtree(opts["index_dir"])
+        bank, opts = _bank()
+    started = time.perf_counter()
+    added = bank.sync()
+    print(f"{added} embedded, {len(bank.index)} active in {opts['index_dir']} "
+          f"({time.perf_counter() - started:.2f}s, fingerprint {bank.fingerprint()})")
+
+def add(path: str):
+    # a json list of {question, ideal_answer, topic, difficulty}; appended to the source file
+    with open(path) as f:
+        questions = json.load(f)
+    bank, _ = _bank()
+    bank.sync()
+    added = bank.add(questions)
+    print(f"{added} new questions added ({len(questions) - added} already in the bank), {len(bank.index)} total")
+
+def query(path: str, count: int):
+    with open(path) as f:
+        jd_text = f.read()
+    bank, opts = _bank()
+    bank.sync()
+    started = time.perf_counter()
+    picked, gaps = bank.select(jd_text, count, opts["min_score"], opts["max_per_topic"], opts["difficulty_mix"])
+    elapsed = (time.perf_counter() - started) * 1000
+    for score, q in bank.search(jd_text, k=10):
+        mark = "*" if any(p["question"] == q["question"] for p in picked) else " "
+        print(f"{mark} {score:.3f}  [{q['difficulty']:<6}] {q['topic']}: {q['question']}")
+    print(f"{len(picked)} from the bank in {elapsed:.1f} ms; left for the llm: {gaps or 'nothing'}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Question bank index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build")
+    p_build.add_argument("--rebuild", action="store_true", help="drop the index and embed everything again")
+    p_add = sub.add_parser("add")
+    p_add.add_argument("file")
+    p_query = sub.add_parser("query")
+    p_query.add_argument("file", help="job description text file")
+    p_query.add_argument("--count", type=int, default=6)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build(args.rebuild)
+    elif args.command == "add":
+        add(args.file)
+    else:
+        query(args.file, args.count)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# re-grade stored interviews (report store) with the current scoring thresholds
+# run: python -m backend.tools.rescore [--workers 4] [--dry-run] [--ratings-out rescored_ratings.json]
+import argparse
+import json
+import multiprocessing as mp
+import os
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RATINGS_FILE = os.path.join(BACKEND_DIR, "data", "ratings.json")
+
+def _init_worker(torch_threads: int):
+    # each worker process loads the embedding model once
+    import torch
+    torch.set_num_threads(torch_threads)
+    from backend.src.nlp_evaluation.answer_evaluator import get_sentence_model
+    get_sentence_model()
+
+def rescore_reports(room_ids, dry_run: bool = False):
+    # one batch for every answer (and follow-up answer) in this chunk of reports
+    from backend.src.nlp_evaluation.answer_evaluator import evaluate_answers_batch, final_decision, RATING_SCORES
+    from backend.src.report_store import get_report_store
+    store = get_report_store()
+    reports, texts, ideals, profiles, slots = [], [], [], [], []
+    for room_id in room_ids:
+        report = store.get(room_id)
+        if report is None:
+            continue
+        reports.append((room_id, report))
+        jd_profile = report.get("jd_profile") or {}
+        for j, r in enumerate(report.get("responses") or []):
+            for field in ("answer", "followup_answer"):
+                if r.get(field):
+                    texts.append(r[field])
+                    ideals.append(r.get("ideal_answer", ""))
+                    profiles.append(jd_profile)
+                    slots.append((len(reports) - 1, j, field))
+    ratings = evaluate_answers_batch(texts, ideals, profiles)
+    new = {}
+    for (ri, j, field), rating in zip(slots, ratings):
+        new.setdefault((ri, j), {})[field] = rating
+    changed = 0
+    for ri, (room_id, report) in enumerate(reports):
+        responses = report.get("responses") or []
+        for j, r in enumerate(responses):
+            got = new.get((ri, j))
+            if not got:
+                continue
+            # a follow-up can only raise the rating, same as during the interview
+            rating = max(got.values(), key=lambda x: RATING_SCORES.get(x, 0))
+            if rating != r.get("rating"):
+                changed += 1
+            r["rating"] = rating
+        if responses:
+            avg_score, decision = final_decision([r["rating"] for r in responses])
+            report["average_score"] = round(avg_score, 2)
+            report["decision"] = decision
+        if not dry_run:
+            store.put(report)
+    return len(texts), changed
+
+def rescore_ratings(items):
+    from backend.src.nlp_evaluation.answer_evaluator import evaluate_answers_batch
+    ratings = evaluate_answers_batch([i.get("candidate_answer", "") for i in items], [i.get("ideal_answer", "") for i in items])
+    changed = sum(1 for i, r in zip(items, ratings) if i.get("rating") != r)
+    for item, rating in zip(items, ratings):
+        item["rating"] = rating
+    return items, changed
+
+def _chunks(seq, size):
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+def main():
+    from backend.src.report_store import get_report_store
+    parser = argparse.ArgumentParser(description="Re-grade stored reports and ratings.json")
+    parser.add_argument("--ratings", default=RATINGS_FILE, help="labelled answers to re-grade (read only)")
+    parser.add_argument("--ratings-out", help="write the re-graded ratings here; without it they are only counted")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--chunk", type=int, default=32, help="reports per batch")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    if args.ratings_out and args.ratings and os.path.abspath(args.ratings_out) == os.path.abspath(args.ratings):
+        parser.error("--ratings-out must not overwrite --ratings")
+
+    torch_threads = max(1, (os.cpu_count() or 1) // args.workers)
+    ctx = mp.get_context("spawn")
+    started = time.perf_counter()
+    answers = changed = 0
+    with ctx.Pool(args.workers, initializer=_init_worker, initargs=(torch_threads,)) as pool:
+        store = get_report_store()
+        store.import_dir()
+        room_ids = store.room_ids()
+        jobs = pool.imap_unordered(_rescore_chunk, ((c, args.dry_run) for c in _chunks(room_ids, args.chunk)))
+        for n, c in jobs:
+            answers += n
+            changed += c
+        if args.ratings and os.path.exists(args.ratings):
+            with open(args.ratings) as f:
+                items = json.load(f)
+            rescored = []
+            for part, c in pool.imap(rescore_ratings, _chunks(items, args.chunk * 8)):
+                rescored.extend(part)
+                answers += len(part)
+                changed += c
+            if args.ratings_out and not args.dry_run:
+                with open(args.ratings_out, "w") as f:
+                    json.dump(rescored, f, indent=2)
+    elapsed = time.perf_counter() - started
+    rate = answers / elapsed if elapsed else 0.0
+    print(f"rescored {answers} answers ({changed} changed) in {elapsed:.2f}s -> {rate:.1f} answers/s")
+
+def _rescore_chunk(job):
+    room_ids, dry_run = job
+    return rescore_reports(room_ids, dry_run)
+
+if __name__ == "__main__":
+    main()
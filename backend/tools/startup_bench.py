@@ -0,0 +1,111 @@
+# import-time / time-to-ready / memory benchmark for the api process
+# run: python -m backend.tools.startup_bench [--models sentence whisper piper] [--out bench.json] [--baseline bench.json]
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+HEAVY_MODULES = ("torch", "whisper", "piper", "sentence_transformers", "sklearn", "onnxruntime")
+
+# runs in a fresh interpreter so import caches don't hide regressions
+PROBE = r"""
+import json, resource, sys, time
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+out = {}
+t0 = time.perf_counter()
+import backend.src.main as main
+out["import_seconds"] = time.perf_counter() - t0
+out["import_rss_mb"] = rss_mb()
+out["heavy_modules_at_import"] = [m for m in HEAVY if m in sys.modules]
+
+# background warm-up would keep loading (and printing) after the probe is done, and its memory would be
+# counted depending on how far it got: models are only loaded here, explicitly, through MODELS
+main.config["warm_up_models"] = []
+main.config["warm_up_blocking"] = False
+
+from fastapi.testclient import TestClient
+t1 = time.perf_counter()
+with TestClient(main.app) as client:
+    client.get("/check")
+    out["time_to_ready_seconds"] = time.perf_counter() - t0
+    out["startup_seconds"] = time.perf_counter() - t1
+    from backend.src.utils.models import get_model
+    out["models"] = {}
+    for name in MODELS:
+        t = time.perf_counter()
+        get_model(name)
+        out["models"][name] = {"load_seconds": time.perf_counter() - t, "rss_mb": rss_mb()}
+out["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+with open(RESULT_PATH, "w") as f:
+    json.dump(out, f)
+"""
+
+def run_probe(models) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+    # the result goes to its own file: the app is free to print whatever it likes on stdout
+    fd, result_path = tempfile.mkstemp(prefix="startup_bench_", suffix=".json")
+    os.close(fd)
+    try:
+        code = f"HEAVY = {HEAVY_MODULES!r}\nMODELS = {list(models)!r}\nRESULT_PATH = {result_path!r}\n" + PROBE
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+        try:
+            with open(result_path) as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            result = None
+    finally:
+        os.unlink(result_path)
+    if out.returncode != 0 or result is None:
+        raise SystemExit(f"startup probe failed (exit code {out.returncode}):\n{out.stderr.strip()[-4000:]}")
+    return result
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    problems = []
+    for key in ("import_seconds", "time_to_ready_seconds", "import_rss_mb", "peak_rss_mb"):
+        if key in baseline and result.get(key, 0) > baseline[key] * (1 + tolerance):
+            problems.append(f"{key}: {result[key]:.3f} > {baseline[key]:.3f} (+{tolerance:.0%})")
+    new_heavy = set(result.get("heavy_modules_at_import", [])) - set(baseline.get("heavy_modules_at_import", []))
+    if new_heavy:
+        problems.append(f"now imported eagerly: {sorted(new_heavy)}")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure api import time, time-to-ready and memory")
+    parser.add_argument("--models", nargs="*", default=[], help="also time loading these registry models")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--out", help="write the result as json")
+    parser.add_argument("--baseline", help="fail if slower/larger than this result")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    runs = [run_probe(args.models) for _ in range(max(1, args.runs))]
+    # best-of-n for timings, worst-of-n for memory
+    result = dict(runs[0])
+    for key in ("import_seconds", "time_to_ready_seconds", "startup_seconds"):
+        result[key] = min(r[key] for r in runs)
+    for key in ("import_rss_mb", "peak_rss_mb"):
+        result[key] = max(r[key] for r in runs)
+    print(json.dumps(result, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(result, json.load(f), args.tolerance)
+        for p in problems:
+            print(f"REGRESSION {p}")
+        if problems:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# local stand-in for the groq (openai-compatible) chat completions api
+# run: python -m backend.tools.stub_llm_server --port 8081
+# then: GROQ_BASE_URL=http://127.0.0.1:8081 GROQ_API_KEY=stub uvicorn backend.src.main:app
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+JD_RESPONSE = {
+    "role": "Backend Engineer",
+    "skills": "python, fastapi, sql, docker, system design",
+    "experience": "3+ years",
+    "jd_summary": "Build and operate backend services. Design APIs and data models. Own reliability and performance.",
+    "questions": [
+        {
+            "question_id": i + 1,
+            "question": q,
+            "ideal_answer": a,
+            "topic": t,
+            "difficulty": d,
+        }
+        for i, (q, a, t, d) in enumerate([
+            ("What is an index in a database?", "A data structure that speeds up lookups at the cost of extra writes and storage.", "Databases", "Easy"),
+            ("How does FastAPI handle async requests?", "It runs async endpoints on the event loop and sync ones in a threadpool.", "Python", "Medium"),
+            ("What is a Docker image?", "A layered, immutable filesystem snapshot plus metadata used to start containers.", "DevOps", "Easy"),
+            ("How would you design a rate limiter?", "Token or leaky bucket per key, stored in shared fast storage, with clear limits and headers.", "System Design", "Hard"),
+            ("Explain database transactions.", "A unit of work that is atomic, consistent, isolated and durable.", "Databases", "Medium"),
+            ("How do you debug a slow API endpoint?", "Measure, profile, check queries and external calls, then fix the dominant cost.", "Performance", "Medium"),
+        ])
+    ],
+}
+FOLLOWUP_RESPONSE = "What trade-offs did you consider in that approach?"
+
+async def _sse_chunks(content: str, model: str, token_ms: float):
+    # openai-style "data: {chunk}" server-sent events, one word per chunk, then [DONE]
+    chunk_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+    words = content.split(" ")
+    for i, word in enumerate(words):
+        if token_ms:
+            await asyncio.sleep(token_ms / 1000.0)
+        delta = {"role": "assistant", "content": word} if i == 0 else {"content": " " + word}
+        yield "data: " + json.dumps({
+            "id": chunk_id, "object": "chat.completion.chunk", "created": created, "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+        }) + "\n\n"
+    yield "data: " + json.dumps({
+        "id": chunk_id, "object": "chat.completion.chunk", "created": created, "model": model,
+        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+    }) + "\n\n"
+    yield "data: [DONE]\n\n"
+
+def create_app(delay_ms: float = 50.0, jitter_ms: float = 0.0, fail_rate: float = 0.0, token_ms: float = 20.0) -> FastAPI:
+    app = FastAPI()
+    app.state.calls = 0
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.calls += 1
+        await asyncio.sleep((delay_ms + random.uniform(0, jitter_ms)) / 1000.0)
+        if fail_rate and random.random() < fail_rate:
+            raise HTTPException(status_code=503, detail="stub overloaded")
+        prompt = " ".join(m.get("content", "") for m in body.get("messages", []))
+        content = json.dumps(JD_RESPONSE) if '"questions"' in prompt else FOLLOWUP_RESPONSE
+        if body.get("stream"):
+            # delay_ms is the time to first token, token_ms the gap between tokens
+            return StreamingResponse(_sse_chunks(content, body.get("model", "stub"), token_ms), media_type="text/event-stream")
+        return JSONResponse({
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(prompt.split()), "completion_tokens": len(content.split()), "total_tokens": 0},
+        })
+
+    @app.get("/stats")
+    def stats():
+        return {"calls": app.state.calls}
+
+    return app
+
+if __name__ == "__main__":
+    import uvicorn
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--delay-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--token-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.delay_ms, args.jitter_ms, args.fail_rate, args.token_ms), host=args.host, port=args.port, log_level="warning")
@@ -2,13 +2,9 @@ import React, { useEffect, useRef, useState } from "react";
 import { useLocation, useNavigate } from "react-router-dom";
 import { API, fetchJson } from "../api";
 
-function toBase64(blob) {
-    return new Promise((resolve, reject) => {
-        const r = new FileReader();
-        r.onloadend = () => resolve(String(r.result).split(",")[1]);
-        r.onerror = reject;
-        r.readAsDataURL(blob);
-    });
+function canPlayOpus() {
+    const probe = document.createElement("audio");
+    return probe.canPlayType('audio/ogg; codecs="opus"') !== "";
 }
 
 export default function Interview() {
@@ -41,7 +37,11 @@ export default function Interview() {
 
     async function playUrl(path) {
         if (!path) return;
-        const audioUrl = path.startsWith("http") ? path : `${API}${path}`;
+        let audioUrl = path.startsWith("http") ? path : `${API}${path}`;
+        // cached clips are available as opus/ogg, a fraction of the wav size
+        if (audioUrl.includes("/agent/get-audio/") && canPlayOpus()) {
+            audioUrl += `${audioUrl.includes("?") ? "&" : "?"}format=ogg`;
+        }
         
         return new Promise((resolve, reject) => {
             const audio = document.createElement("audio");
@@ -144,11 +144,10 @@ export default function Interview() {
     }
 
     async function postAudio(blob) {
-        const b64 = await toBase64(blob);
-        return fetchJson(`${API}/agent/process-audio`, {
+        return fetchJson(`${API}/agent/process-audio/${roomIdRef.current}`, {
             method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({ roomId: roomIdRef.current, audioData: b64 }),
+            headers: { "Content-Type": blob.type || "audio/webm" },
+            body: blob,
         });
     }
 
@@ -246,6 +245,7 @@ export default function Interview() {
                 if (data.audioUrl) {
                     if (data.status === "conclusion") setStatus("Closing…");
                     else if (data.status === "followup") setStatus("Follow-up…");
+                    else if (data.status === "candidate_questions") setStatus("Your questions…");
                     else setStatus("Question…");
                     try {
                         await playUrl(data.audioUrl);